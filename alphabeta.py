@@ -0,0 +1,297 @@
+from math import inf
+from time import perf_counter
+
+from ultimate_tic_tac_toe import GlobalBoard, decode_move, line_indexes
+from transposition import (
+    TranspositionTable,
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND
+)
+from evaluation import Evaluator
+from mcts import revert_move, other_sign
+from symmetry import INVERSE_SYMMETRIES, canonical_hash, transform_move
+
+
+WIN_SCORE = 1000000
+
+
+class SearchTimeout(Exception):
+    def __init__(self):
+        super().__init__('Search deadline exceeded')
+
+
+def evaluate(global_board: GlobalBoard, sign):
+    """
+    Returns static score of the position from the sign player's perspective.
+    Counts won local boards and rewards global lines
+    which are still open for only one of the players
+    """
+    size = global_board._SIZE
+    win_counts = global_board.win_counts()
+    own_counts, opponent_counts = win_counts[sign], win_counts[other_sign(sign)]
+
+    # every local board belongs to exactly one row
+    score = 10 * (sum(own_counts[:size]) - sum(opponent_counts[:size]))
+    for own_count, opponent_count in zip(own_counts, opponent_counts):
+        if not opponent_count:
+            score += own_count * own_count
+        elif not own_count:
+            score -= opponent_count * opponent_count
+    return score
+
+
+def result_score(result, sign):
+    """Returns score of the finished game from the sign player's perspective"""
+    if result == sign:
+        return WIN_SCORE
+    if result == 'draw':
+        return 0
+    return -WIN_SCORE
+
+
+class AlphaBetaBot:
+    """
+    Class AlphaBetaBot. Bot choosing moves with negamax search
+    with alpha-beta pruning, iterative deepening, transposition table
+    and move ordering. Called with a sign like bots of UltimateTicTacToe.
+    :param  _time_ms:   Hard time limit of search per move in milliseconds
+    :type   _time_ms:   float/None
+    :param  _max_depth: Maximal depth of iterative deepening
+    :type   _max_depth: int/None
+    :param  _table:     Transposition table, can be shared between bots
+        using the same kind of keys
+    :type   _table:     TranspositionTable
+    :param  _symmetric: Symmetric positions share table entries,
+        keys are canonical_hash() instead of zobrist_hash()
+    :type   _symmetric: bool
+    :param  _batch_leaves:  Positions after moves of depth 1 nodes are
+        scored in one Evaluator.score_states() call
+    :type   _batch_leaves:  bool
+    """
+
+    # part of the time limit kept for making the move
+    TIME_MARGIN = 0.05
+
+    def __init__(self, game, time_ms=1000, max_depth=None, table=None,
+                 evaluate=evaluate, symmetric=False, batch_leaves=False):
+        if time_ms is None and max_depth is None:
+            raise ValueError("Time limit or maximal depth must be given")
+        if time_ms is not None and time_ms <= 0:
+            raise ValueError("Time limit must be positive")
+        if max_depth is not None and max_depth <= 0:
+            raise ValueError("Maximal depth must be positive")
+        if batch_leaves and not isinstance(evaluate, Evaluator):
+            raise ValueError("Batched leaves need an Evaluator")
+
+        self._game = game
+        self._time_ms = time_ms
+        self._max_depth = max_depth
+        self._table = table if table is not None else TranspositionTable()
+        self._evaluate = evaluate
+        self._symmetric = symmetric
+        self._batch_leaves = batch_leaves
+        self._deadline = None
+
+        # statistics of the last search
+        self.nodes = 0
+        self.depth = 0
+        self.search_time = 0.0
+
+    def order_moves(self, global_board: GlobalBoard, moves, sign, best_move):
+        """
+        Sorts moves: the best move from the transposition table first,
+        then moves winning or saving a local board. Moves on dead local
+        boards and moves giving the opponent a free board choice
+        are tried last
+        """
+        size = global_board._SIZE
+        lock_after_win = global_board._LOCK_AFTER_WIN
+        opponent = other_sign(sign)
+        spot_lines = line_indexes(size)
+        dead_boards = set(global_board.dead_boards())
+
+        def move_priority(move):
+            if move == best_move:
+                return -inf
+            board_index, spot_index = decode_move(move, size)
+            board = global_board.local_board(board_index)
+            priority = 0
+            if not board.win():
+                line_counts = board.line_counts()
+                for line in spot_lines[spot_index - 1]:
+                    if line_counts[sign][line] == size - 1:
+                        priority -= 100
+                    elif line_counts[opponent][line] == size - 1:
+                        priority -= 50
+            if board_index in dead_boards:
+                priority += 10
+            if not global_board.local_board(spot_index).if_move_possible(
+                    lock_after_win):
+                priority += 20
+            return priority
+
+        return sorted(moves, key=move_priority)
+
+    def table_key(self, global_board: GlobalBoard):
+        """Returns transposition table key and symmetry of the position"""
+        if self._symmetric:
+            return canonical_hash(global_board)
+        return global_board.zobrist_hash(), 0
+
+    def leaf_scores(self, global_board: GlobalBoard, moves, sign):
+        """
+        Returns scores of the moves from the sign player's perspective.
+        Positions after the moves are evaluated in one batch
+        """
+        scores = {}
+        leaves, states = [], []
+        for move in moves:
+            result = global_board.play_unchecked(move, sign)
+            if result:
+                scores[move] = result_score(result, sign)
+            else:
+                leaves.append(move)
+                states.append(global_board.to_bytes())
+            revert_move(global_board)
+
+        if leaves:
+            self.nodes += len(leaves)
+            values = self._evaluate.score_states(
+                b''.join(states), global_board._SIZE, other_sign(sign))
+            for move, value in zip(leaves, values):
+                scores[move] = -float(value)
+        return scores
+
+    def negamax(self, global_board: GlobalBoard, sign, depth, alpha, beta):
+        """Returns score of the position from the sign player's perspective"""
+        self.nodes += 1
+        if self._deadline is not None and perf_counter() >= self._deadline:
+            raise SearchTimeout()
+
+        if depth == 0:
+            return self._evaluate(global_board, sign)
+
+        key, symmetry = self.table_key(global_board)
+        entry = self._table.lookup(key)
+        best_move = None
+        if entry is not None:
+            best_move = entry.move
+            if symmetry and best_move is not None:
+                # moves are stored for the canonical position
+                best_move = transform_move(
+                    best_move, INVERSE_SYMMETRIES[symmetry],
+                    global_board._SIZE)
+            if entry.depth >= depth:
+                if entry.flag == EXACT:
+                    return entry.value
+                if entry.flag == LOWER_BOUND:
+                    alpha = max(alpha, entry.value)
+                elif entry.flag == UPPER_BOUND:
+                    beta = min(beta, entry.value)
+                if alpha >= beta:
+                    return entry.value
+
+        original_alpha = alpha
+        best_score = -inf
+        moves = self.order_moves(
+            global_board, global_board.legal_moves(), sign, best_move)
+        leaf_scores = None
+        if depth == 1 and self._batch_leaves:
+            leaf_scores = self.leaf_scores(global_board, moves, sign)
+        for move in moves:
+            if leaf_scores is not None:
+                score = leaf_scores[move]
+            else:
+                result = global_board.play_unchecked(move, sign)
+                try:
+                    if result:
+                        score = result_score(result, sign)
+                    else:
+                        score = -self.negamax(
+                            global_board, other_sign(sign),
+                            depth - 1, -beta, -alpha)
+                finally:
+                    revert_move(global_board)
+
+            if score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        if symmetry and best_move is not None:
+            best_move = transform_move(
+                best_move, symmetry, global_board._SIZE)
+        self._table.store(key, depth, best_score, flag, best_move)
+        return best_score
+
+    def search_root(self, global_board: GlobalBoard, sign, depth, moves):
+        """
+        Searches all root moves to given depth. Returns the best move,
+        its score and moves ordered from the best one
+        """
+        scores = {}
+        alpha = -inf
+        for move in moves:
+            result = global_board.play_unchecked(move, sign)
+            try:
+                if result:
+                    score = result_score(result, sign)
+                else:
+                    score = -self.negamax(global_board, other_sign(sign),
+                                          depth - 1, -inf, -alpha)
+            finally:
+                revert_move(global_board)
+            scores[move] = score
+            alpha = max(alpha, score)
+            if score >= WIN_SCORE:
+                break
+        ordered_moves = sorted(scores, key=lambda move: -scores[move])
+        best_move = ordered_moves[0]
+        return best_move, scores[best_move], ordered_moves + \
+            [move for move in moves if move not in scores]
+
+    def search(self, global_board: GlobalBoard, sign):
+        """Runs iterative deepening search. Returns the best move found"""
+        start = perf_counter()
+        self._deadline = None
+        if self._time_ms is not None:
+            self._deadline = start + \
+                (1 - self.TIME_MARGIN) * self._time_ms / 1000
+        self._table.new_search()
+        self.nodes = 0
+        self.depth = 0
+
+        moves = self.order_moves(
+            global_board, global_board.legal_moves(), sign, None)
+        best_move = moves[0]
+        spots_left = sum(
+            len(board.possible_moves(False))
+            for board in global_board._local_boards)
+        depth = 1
+        while self._max_depth is None or depth <= self._max_depth:
+            try:
+                best_move, best_score, moves = self.search_root(
+                    global_board, sign, depth, moves)
+            except SearchTimeout:
+                break
+            self.depth = depth
+
+            # result of the game is already known
+            if abs(best_score) >= WIN_SCORE or depth >= spots_left:
+                break
+            depth += 1
+
+        self.search_time = perf_counter() - start
+        return best_move
+
+    def __call__(self, sign):
+        global_board = self._game.global_board()
+        return global_board.play(self.search(global_board, sign), sign)
@@ -0,0 +1,170 @@
+import numpy as np
+
+
+# values of spots, local wins and game results
+EMPTY = 0
+X = 1
+O = 2
+DRAW = 3
+
+SIGNS = {X: 'x', O: 'o'}
+
+
+def line_spots(size):
+    """
+    Returns array of shape (2 * size + 2, size) with 0-based indexes
+    of spots of every line: rows, columns and both diagonals
+    """
+    indexes = np.arange(size ** 2).reshape(size, size)
+    return np.concatenate([
+        indexes,
+        indexes.T,
+        np.diagonal(indexes)[np.newaxis],
+        np.diagonal(np.fliplr(indexes))[np.newaxis]
+    ])
+
+
+class BatchGames:
+    """
+    Class BatchGames. Plays many ultimate tic-tac-toe games in lockstep
+    with the same rules as GlobalBoard. Boards and spots are 0-based.
+    :param  spots:          Signs in every spot of every local board
+    :type   spots:          int8 array of shape (games, size ** 2, size ** 2)
+    :param  local_wins:     Winner of every local board
+    :type   local_wins:     int8 array of shape (games, size ** 2)
+    :param  local_full:     Indicates if local board is full
+    :type   local_full:     bool array of shape (games, size ** 2)
+    :param  previous_spot:  Spot of the last move, -1 before the first move
+    :type   previous_spot:  int64 array of shape (games,)
+    :param  last_won:       Indicates if the last move won a local board
+    :type   last_won:       bool array of shape (games,)
+    :param  to_move:        Sign of the player to move
+    :type   to_move:        int8 array of shape (games,)
+    :param  results:        Game result, EMPTY if the game is not finished
+    :type   results:        int8 array of shape (games,)
+    """
+
+    def __init__(self, games, size, lock_after_win, choice_after_win):
+        if games <= 0:
+            raise ValueError("Number of games must be positive")
+        if size <= 1:
+            raise ValueError("Size must equal at lest 2")
+
+        cells = size ** 2
+        self.spots = np.zeros((games, cells, cells), dtype=np.int8)
+        self.local_wins = np.zeros((games, cells), dtype=np.int8)
+        self.local_full = np.zeros((games, cells), dtype=bool)
+        self.previous_spot = np.full(games, -1, dtype=np.int64)
+        self.last_won = np.zeros(games, dtype=bool)
+        self.to_move = np.full(games, X, dtype=np.int8)
+        self.results = np.zeros(games, dtype=np.int8)
+
+        self._SIZE = size
+        self._LOCK_AFTER_WIN = lock_after_win
+        self._CHOICE_AFTER_WIN = choice_after_win
+        self._lines = line_spots(size)
+
+    def open_boards(self):
+        """Returns bool array of local boards on which a move is possible"""
+        open_boards = ~self.local_full
+        if self._LOCK_AFTER_WIN:
+            open_boards &= self.local_wins == EMPTY
+        return open_boards
+
+    def possible_boards(self):
+        """
+        Returns bool array of shape (games, size ** 2) of local boards
+        on which the player to move can play, following current_board()
+        """
+        open_boards = self.open_boards()
+        games = np.arange(len(self.results))
+        previous_spot = np.maximum(self.previous_spot, 0)
+
+        forced = (self.previous_spot >= 0) & open_boards[games, previous_spot]
+        if self._CHOICE_AFTER_WIN:
+            forced &= ~self.last_won
+
+        boards = np.where(
+            forced[:, np.newaxis],
+            np.arange(open_boards.shape[1]) == previous_spot[:, np.newaxis],
+            open_boards
+        )
+        boards[self.results != EMPTY] = False
+        return boards
+
+    def legal_moves(self):
+        """
+        Returns bool array of shape (games, size ** 2, size ** 2)
+        of legal (board, spot) moves
+        """
+        return self.possible_boards()[:, :, np.newaxis] & \
+            (self.spots == EMPTY)
+
+    def make_moves(self, games, boards, spots):
+        """
+        Makes moves of the players to move in given games.
+        Moves are assumed to be legal. Updates results
+        """
+        signs = self.to_move[games]
+        self.spots[games, boards, spots] = signs
+
+        # local boards
+        local_spots = self.spots[games, boards]
+        won = (local_spots[:, self._lines] == signs[:, np.newaxis, np.newaxis]
+               ).all(axis=2).any(axis=1)
+        won &= self.local_wins[games, boards] == EMPTY
+        self.local_wins[games[won], boards[won]] = signs[won]
+        self.local_full[games, boards] = (local_spots != EMPTY).all(axis=1)
+        self.last_won[games] = won
+        self.previous_spot[games] = spots
+        self.to_move[games] = np.where(signs == X, O, X)
+
+        # global win, possible only after winning a local board
+        won_games = games[won]
+        global_won = (
+            self.local_wins[won_games][:, self._lines] ==
+            signs[won][:, np.newaxis, np.newaxis]
+        ).all(axis=2).any(axis=1)
+        self.results[won_games[global_won]] = signs[won][global_won]
+
+        # draw when no board is possible to make move
+        ongoing = games[self.results[games] == EMPTY]
+        no_boards = ~self.open_boards()[ongoing].any(axis=1)
+        self.results[ongoing[no_boards]] = DRAW
+
+    def random_moves(self, rng: np.random.Generator):
+        """
+        Makes random moves in all ongoing games like random_bot: the board
+        is chosen uniformly among possible boards, then the spot uniformly
+        among empty spots of that board
+        """
+        games = np.flatnonzero(self.results == EMPTY)
+        if not len(games):
+            return
+
+        boards_mask = self.possible_boards()[games]
+        boards = random_true_index(rng, boards_mask)
+        spots_mask = self.spots[games, boards] == EMPTY
+        spots = random_true_index(rng, spots_mask)
+        self.make_moves(games, boards, spots)
+
+    def play_random(self, rng: np.random.Generator):
+        """Plays all games to the end with random moves. Returns results"""
+        while (self.results == EMPTY).any():
+            self.random_moves(rng)
+        return self.results
+
+    def result_counts(self):
+        """Returns numbers of games won by 'x', won by 'o' and drawn"""
+        return tuple(int(np.count_nonzero(self.results == result))
+                     for result in (X, O, DRAW))
+
+
+def random_true_index(rng: np.random.Generator, mask):
+    """
+    Returns index of a uniformly chosen True element of every row
+    of a 2D bool array. Every row must contain a True element
+    """
+    keys = rng.random(mask.shape)
+    keys[~mask] = -1
+    return keys.argmax(axis=1)
@@ -0,0 +1,298 @@
+import json
+import random
+import sys
+from argparse import ArgumentParser
+from itertools import cycle, product
+from timeit import Timer, timeit
+
+from ultimate_tic_tac_toe import LocalBoard, GlobalBoard, UltimateTicTacToe
+
+
+BASELINE_FILE = 'benchmark_baseline.json'
+
+
+class ScanLocalBoard(LocalBoard):
+    """
+    LocalBoard rescanning the whole board after every move
+    """
+
+    __slots__ = ()
+
+    _USE_STATE_TABLE = False
+
+    def make_move_unchecked(self, spot_index, sign):
+        super().make_move_unchecked(spot_index, sign)
+        self.full_check()
+        return self.local_win_check()
+
+    def move_win_check(self, spot_index, sign):
+        # win is checked by local_win_check() in make_move
+        return None
+
+
+class ScanGlobalBoard(GlobalBoard):
+    """
+    GlobalBoard rescanning the whole board after every move
+    """
+
+    __slots__ = ()
+
+    _LOCAL_BOARD_CLASS = ScanLocalBoard
+
+    def move_win_check(self, board_index):
+        return self.global_win_check()
+
+
+def random_game(size, lock_after_win, choice_after_win, seed=None):
+    """
+    Plays a random game and returns its moves as a list of
+    (board choice or None, spot index, sign) tuples
+    """
+    rng = random.Random(seed)
+    global_board = GlobalBoard(size, lock_after_win, choice_after_win)
+    moves = []
+    for sign in cycle('xo'):
+        board_choice = None
+        board_index = global_board.current_board()
+        if board_index is None:
+            board_choice = rng.choice(global_board.possible_boards())
+            global_board.choose_board(board_choice)
+            board_index = board_choice
+
+        spot_index = rng.choice(global_board.local_board(
+            board_index).possible_moves(lock_after_win))
+        moves.append((board_choice, spot_index, sign))
+        if global_board.make_move(sign, spot_index):
+            return moves
+
+
+def replay(board_class, size, lock_after_win, choice_after_win, moves):
+    """Replays moves on a new board and returns the final result"""
+    global_board = board_class(size, lock_after_win, choice_after_win)
+    result = None
+    for board_choice, spot_index, sign in moves:
+        if board_choice is not None:
+            global_board.choose_board(board_choice)
+        result = global_board.make_move(sign, spot_index)
+    return result
+
+
+def compare_win_checks(sizes=range(3, 11), games=5, number=3):
+    """
+    Compares replaying random games with full board scans
+    and with incremental win checks.
+    Returns a list of (size, moves, scan time, incremental time) tuples
+    """
+    results = []
+    for size in sizes:
+        games_moves = [random_game(size, False, False, seed)
+                       for seed in range(games)]
+
+        def run(board_class):
+            for moves in games_moves:
+                replay(board_class, size, False, False, moves)
+
+        scan_time = timeit(lambda: run(ScanGlobalBoard), number=number)
+        incremental_time = timeit(lambda: run(GlobalBoard), number=number)
+        moves_count = sum(len(moves) for moves in games_moves)
+        results.append((size, moves_count, scan_time, incremental_time))
+    return results
+
+
+def midgame_board(size, lock_after_win, choice_after_win, seed=0):
+    """Returns board after the first half of moves of a random game"""
+    moves = random_game(size, lock_after_win, choice_after_win, seed)
+    moves = moves[:len(moves) // 2]
+    global_board = GlobalBoard(size, lock_after_win, choice_after_win)
+    for board_choice, spot_index, sign in moves:
+        if board_choice is not None:
+            global_board.choose_board(board_choice)
+        global_board.make_move(sign, spot_index)
+    return global_board
+
+
+def bench_local_make_move(size, lock_after_win, choice_after_win):
+    rng = random.Random(size)
+    spots = list(range(1, size ** 2 + 1))
+    rng.shuffle(spots)
+
+    def run():
+        local_board = LocalBoard(size)
+        for spot_index, sign in zip(spots, cycle('xo')):
+            local_board.make_move(spot_index, sign)
+    return run, len(spots)
+
+
+def bench_local_win_check(size, lock_after_win, choice_after_win):
+    # half filled board without a win, signs alternate between rows
+    local_board = LocalBoard(size)
+    for row, clmn in product(range(size), repeat=2):
+        if (row + clmn) % 2 == 0:
+            local_board.set_spot(row * size + clmn + 1, 'xo'[row % 2])
+    return local_board.local_win_check, 1
+
+
+def bench_global_win_check(size, lock_after_win, choice_after_win):
+    global_board = midgame_board(size, lock_after_win, choice_after_win)
+    return global_board.global_win_check, 1
+
+
+def bench_possible_boards(size, lock_after_win, choice_after_win):
+    global_board = midgame_board(size, lock_after_win, choice_after_win)
+    return global_board.possible_boards, 1
+
+
+def bench_str(size, lock_after_win, choice_after_win):
+    global_board = midgame_board(size, lock_after_win, choice_after_win)
+    return global_board.__str__, 1
+
+
+def bench_random_game(size, lock_after_win, choice_after_win):
+    def run():
+        random.seed(size)
+        game = UltimateTicTacToe(size, lock_after_win, choice_after_win)
+        game.play(game.random_bot, game.random_bot, verbose=False)
+    return run, 1
+
+
+# benchmark name: (function creating timed callable, depends on rule flags)
+BENCHMARKS = {
+    'LocalBoard.make_move': (bench_local_make_move, False),
+    'LocalBoard.local_win_check': (bench_local_win_check, False),
+    'GlobalBoard.global_win_check': (bench_global_win_check, True),
+    'GlobalBoard.possible_boards': (bench_possible_boards, True),
+    'GlobalBoard.__str__': (bench_str, True),
+    'random_bot game': (bench_random_game, True),
+}
+
+
+def benchmark_key(name, size, lock_after_win, choice_after_win):
+    return f'{name}|{size}|{int(lock_after_win)}|{int(choice_after_win)}'
+
+
+def time_benchmark(name, size, lock_after_win, choice_after_win, repeat=5,
+                   min_time=0.05):
+    """Returns best time per operation of the benchmark in seconds"""
+    function, operations = BENCHMARKS[name][0](
+        size, lock_after_win, choice_after_win)
+    timer = Timer(function)
+
+    # number of calls taking at least min_time
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    best_time = min(timer.repeat(repeat, number))
+    return best_time / number / operations
+
+
+def run_suite(sizes=range(2, 9), names=None, repeat=5, min_time=0.05):
+    """
+    Times benchmarks for every size and rule flags combination
+    (benchmarks independent of rule flags run only with both disabled).
+    Returns dict of benchmark keys and best times per operation in seconds
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        uses_flags = BENCHMARKS[name][1]
+        flags = product([False, True], repeat=2) if uses_flags \
+            else [(False, False)]
+        for (lock_after_win, choice_after_win), size in product(flags, sizes):
+            key = benchmark_key(name, size, lock_after_win, choice_after_win)
+            results[key] = time_benchmark(
+                name, size, lock_after_win, choice_after_win, repeat,
+                min_time)
+    return results
+
+
+def compare_to_baseline(results, baseline, threshold=1.25):
+    """
+    Returns list of (key, baseline time, time) tuples of benchmarks
+    slower than threshold times their baseline
+    """
+    regressions = []
+    for key, time in results.items():
+        if key in baseline and time > threshold * baseline[key]:
+            regressions.append((key, baseline[key], time))
+    return regressions
+
+
+def confirm_regressions(results, baseline, threshold=1.25, reruns=3,
+                        repeat=5, min_time=0.05):
+    """
+    Returns compare_to_baseline() after timing regressed benchmarks
+    again up to reruns times, so that a slow moment of a busy machine
+    is not reported. Best times of the reruns are kept in results
+    """
+    regressions = compare_to_baseline(results, baseline, threshold)
+    for _ in range(reruns):
+        if not regressions:
+            break
+        for key, _, _ in regressions:
+            name, size, lock_after_win, choice_after_win = key.split('|')
+            results[key] = min(results[key], time_benchmark(
+                name, int(size), lock_after_win == '1',
+                choice_after_win == '1', repeat, min_time))
+        regressions = compare_to_baseline(results, baseline, threshold)
+    return regressions
+
+
+def load_baseline(path=BASELINE_FILE):
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(results, path=BASELINE_FILE):
+    with open(path, 'w') as baseline_file:
+        json.dump(results, baseline_file, indent=2, sort_keys=True)
+
+
+def print_win_checks():
+    print(f'{"size":>4} {"moves":>7} {"scan [s]":>9} '
+          f'{"incr. [s]":>9} {"speedup":>7}')
+    for size, moves, scan_time, incremental_time in compare_win_checks():
+        print(f'{size:>4} {moves:>7} {scan_time:>9.3f} '
+              f'{incremental_time:>9.3f} {scan_time / incremental_time:>7.1f}')
+
+
+def main():
+    parser = ArgumentParser(description='Benchmarks of the game engine')
+    parser.add_argument('--win-checks', action='store_true',
+                        help='compare scanning and incremental win checks')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=list(range(2, 9)))
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS))
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=1.25)
+    parser.add_argument('--reruns', type=int, default=3,
+                        help='times regressed benchmarks are timed again')
+    args = parser.parse_args()
+
+    if args.win_checks:
+        print_win_checks()
+        return 0
+
+    results = run_suite(args.sizes, args.benchmarks)
+    for key, time in results.items():
+        print(f'{key:<45} {time * 1e6:>12.2f} us')
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        return 0
+
+    try:
+        baseline = load_baseline(args.baseline)
+    except FileNotFoundError:
+        print(f'No baseline in {args.baseline}')
+        return 0
+
+    regressions = confirm_regressions(
+        results, baseline, args.threshold, args.reruns)
+    for key, baseline_time, time in regressions:
+        print(f'Regression: {key} {baseline_time * 1e6:.2f} us -> '
+              f'{time * 1e6:.2f} us')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+from functools import lru_cache
+
+from ultimate_tic_tac_toe import (
+    LocalBoard,
+    GlobalBoard,
+    line_indexes
+)
+
+
+@lru_cache(maxsize=None)
+def line_masks(size):
+    """
+    Returns precomputed masks for a board of a given size:
+    a tuple of all winning line masks, a tuple of line masks passing
+    through each spot (0-based) and the mask of all spots
+    """
+    lines = []
+    for i in range(size):
+        # horizonally
+        lines.append(sum(1 << (i * size + j) for j in range(size)))
+        # vertically
+        lines.append(sum(1 << (j * size + i) for j in range(size)))
+    # diagonally left (\)
+    lines.append(sum(1 << (i * (size + 1)) for i in range(size)))
+    # diagonally right (/)
+    lines.append(sum(1 << ((i + 1) * (size - 1)) for i in range(size)))
+
+    spot_lines = tuple(
+        tuple(line for line in lines if line >> spot & 1)
+        for spot in range(size ** 2)
+    )
+    return tuple(lines), spot_lines, (1 << size ** 2) - 1
+
+
+def mask_indexes(mask):
+    """Returns 1-based indexes of the set bits of the mask"""
+    indexes = []
+    while mask:
+        lowest = mask & -mask
+        indexes.append(lowest.bit_length())
+        mask ^= lowest
+    return indexes
+
+
+class BitLocalBoard(LocalBoard):
+    """
+    Class BitLocalBoard. LocalBoard storing its spots as bitboards
+    :param  _masks: Bitboard of occupied spots for each sign
+    :type   _masks: dict of ints
+    :param  _spots: List view of the bitboards, kept for compatibility.
+        Assigning a new list rebuilds the masks,
+        but changing the list in place has no effect.
+        The view and _line_counts are rebuilt after every change
+        of the masks.
+    :type   _spots: list of strings
+    """
+
+    __slots__ = ('_masks', '_spot_count', '_spots_view')
+
+    @property
+    def _spots(self):
+        # the view is cached until the masks change
+        if self._spots_view is None:
+            masks = self._masks
+            self._spots_view = [
+                'x' if masks['x'] >> i & 1 else
+                'o' if masks['o'] >> i & 1 else ''
+                for i in range(self._spot_count)
+            ]
+        return self._spots_view
+
+    @_spots.setter
+    def _spots(self, spots):
+        self._spot_count = len(spots)
+        self._masks = {'x': 0, 'o': 0}
+        for index, spot in enumerate(spots):
+            if spot:
+                self._masks[spot] |= 1 << index
+        self._spots_view = None
+        self._line_counts = None
+
+    def spot_unchecked(self, spot_index):
+        bit = 1 << (spot_index - 1)
+        if self._masks['x'] & bit:
+            return 'x'
+        if self._masks['o'] & bit:
+            return 'o'
+        return ''
+
+    def set_spot_unchecked(self, spot_index, spot_value):
+        bit = 1 << (spot_index - 1)
+        self._masks['x'] &= ~bit
+        self._masks['o'] &= ~bit
+        self._masks[spot_value] |= bit
+        self._spots_view = None
+        self._line_counts = None
+
+    def clear_spot_unchecked(self, spot_index):
+        bit = 1 << (spot_index - 1)
+        self._masks['x'] &= ~bit
+        self._masks['o'] &= ~bit
+        self._spots_view = None
+        self._line_counts = None
+
+    def empty_mask(self):
+        """Returns bitboard of empty spots"""
+        full_mask = line_masks(self._layout.size)[2]
+        return full_mask & ~(self._masks['x'] | self._masks['o'])
+
+    def possible_moves(self, lock_after_win):
+        if self._win and lock_after_win or self._full:
+            return []
+        return mask_indexes(self.empty_mask())
+
+    def make_move_unchecked(self, spot_index, sign):
+        """Makes move on a valid empty spot. Returns local win status"""
+        self._masks[sign] |= 1 << (spot_index - 1)
+        self._spots_view = None
+        self._line_counts = None
+
+        self.full_check()
+        return self.move_win_check(spot_index, sign)
+
+    def move_win_check(self, spot_index, sign):
+        """Checks for a win only in lines passing through the given spot
+        and sets _win attribute if needed"""
+        if self._win:
+            return None
+
+        mask = self._masks[sign]
+        for line in line_masks(self._layout.size)[1][spot_index - 1]:
+            if mask & line == line:
+                self._win = sign
+                break
+        return self.win()
+
+    def local_win_check(self):
+        """Checks for a win and sets _win attribute if needed.
+        Returns the player who won in the last turn, otherwise False"""
+        if self._win:
+            return None
+
+        for line in line_masks(self._layout.size)[0]:
+            for sign in ('x', 'o'):
+                if self._masks[sign] & line == line:
+                    self._win = sign
+        return self.win()
+
+    def full_check(self):
+        self._full = not self.empty_mask()
+        return self._full
+
+
+class BitGlobalBoard(GlobalBoard):
+    """
+    Class BitGlobalBoard. GlobalBoard made of BitLocalBoards
+    which also keeps bitboards of the local boards states
+    :param  _won_masks:     Bitboard of local boards won by each sign
+    :type   _won_masks:     dict of ints
+    :param  _full_mask:     Bitboard of full local boards
+    :type   _full_mask:     int
+    """
+
+    __slots__ = ('_won_masks', '_full_mask')
+
+    _LOCAL_BOARD_CLASS = BitLocalBoard
+
+    def __init__(self, size, lock_after_win, choice_after_win,
+                 early_draw=False):
+        super().__init__(size, lock_after_win, choice_after_win, early_draw)
+        self._won_masks = {'x': 0, 'o': 0}
+        self._full_mask = 0
+
+    def update_masks(self, board_index):
+        """Copies the state of given local board into global bitboards"""
+        board = self.local_board(board_index)
+        bit = 1 << (board_index - 1)
+        if board.win():
+            self._won_masks[board.win()] |= bit
+        if board._full:
+            self._full_mask |= bit
+
+    def rebuild_state(self):
+        super().rebuild_state()
+        self._won_masks = {'x': 0, 'o': 0}
+        self._full_mask = 0
+        for board_index in range(1, self._SIZE ** 2 + 1):
+            self.update_masks(board_index)
+
+    def unmake_move(self):
+        board_index, spot_index = super().unmake_move()
+
+        # local board could have been won or filled by the reverted move
+        bit = 1 << (board_index - 1)
+        self._won_masks['x'] &= ~bit
+        self._won_masks['o'] &= ~bit
+        self._full_mask &= ~bit
+        self.update_masks(board_index)
+        return board_index, spot_index
+
+    def open_mask(self):
+        """Returns bitboard of local boards on which a move is possible"""
+        closed_mask = self._full_mask
+        if self._LOCK_AFTER_WIN:
+            closed_mask |= self._won_masks['x'] | self._won_masks['o']
+        return line_masks(self._SIZE)[2] & ~closed_mask
+
+    def possible_boards(self):
+        """
+        Returns a list of local boards indexes
+        on which making a move is still possible
+        """
+        if self._stats is not None:
+            self._stats.count('possible_boards')
+        return mask_indexes(self.open_mask())
+
+    def global_win_check(self):
+        """Checks for win in global board.
+        Returns a sign of the winnin player, draw or None"""
+        if self._stats is not None:
+            self._stats.count('global_win_check')
+        for line in line_masks(self._SIZE)[0]:
+            for sign in ('x', 'o'):
+                if self._won_masks[sign] & line == line:
+                    return sign
+
+        if self._EARLY_DRAW and self.dead_position():
+            return 'draw'
+
+        if self.open_mask():
+            return None
+
+        # no win and no boards possible to make move
+        return 'draw'
+
+    def move_win_check(self, board_index):
+        """Checks for win in global board after a move on given local board.
+        Returns a sign of the winnin player, draw or None"""
+        if self._stats is not None:
+            self._stats.count('move_win_check')
+        self.update_masks(board_index)
+        if self._last_won:
+            # counts are reverted by GlobalBoard.unmake_move()
+            line_counts = self._win_counts[self._last_won]
+            for line in line_indexes(self._SIZE)[board_index - 1]:
+                line_counts[line] += 1
+            won_mask = self._won_masks[self._last_won]
+            for line in line_masks(self._SIZE)[1][board_index - 1]:
+                if won_mask & line == line:
+                    return self._last_won
+
+        if self.open_mask():
+            return None
+        return 'draw'
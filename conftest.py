@@ -0,0 +1,36 @@
+import random
+from itertools import cycle
+
+import pytest
+
+from ultimate_tic_tac_toe import GlobalBoard
+
+
+def random_game_boards(size, lock_after_win, choice_after_win, seed=0,
+                       board_choices=False):
+    """
+    Returns copies of board before the first move and after every move
+    of a random game. With board_choices also after every board choice
+    """
+    rng = random.Random(seed)
+    global_board = GlobalBoard(size, lock_after_win, choice_after_win)
+    boards = [GlobalBoard.from_bytes(global_board.to_bytes())]
+    for sign in cycle('xo'):
+        if global_board.current_board() is None:
+            global_board.choose_board(
+                rng.choice(global_board.possible_boards()))
+            if board_choices:
+                boards.append(GlobalBoard.from_bytes(global_board.to_bytes()))
+        spot_index = rng.choice(global_board.local_board(
+            global_board._board_choice or global_board.current_board()
+        ).possible_moves(lock_after_win))
+        result = global_board.make_move(sign, spot_index)
+        boards.append(GlobalBoard.from_bytes(global_board.to_bytes()))
+        if result:
+            return boards
+
+
+@pytest.fixture
+def game_boards():
+    """Returns random_game_boards()"""
+    return random_game_boards
@@ -0,0 +1,166 @@
+from abc import ABC, abstractmethod
+
+from mcts import other_sign
+from serialization import decode_states, encode_states
+from ultimate_tic_tac_toe import GlobalBoard
+
+try:
+    import numpy as np
+    from batch_engine import O, X, line_spots
+except ImportError:
+    np = None
+
+
+# features of a position from a player's perspective, in order:
+# local boards won by the player minus won by the opponent,
+# lines of undecided local boards one sign short of a win for the player
+# minus for the opponent, squared numbers of won local boards
+# in global lines still open for the player minus for the opponent
+FEATURES = ('won_boards', 'near_wins', 'line_potential')
+
+# weights of HeuristicEvaluator
+HEURISTIC_WEIGHTS = (10.0, 2.0, 1.0)
+
+
+def evaluation_features(global_board: GlobalBoard, sign):
+    """Returns list of FEATURES of the position from sign's perspective"""
+    size = global_board._SIZE
+    opponent = other_sign(sign)
+    win_counts = global_board.win_counts()
+    own_counts, opponent_counts = win_counts[sign], win_counts[opponent]
+
+    # every local board belongs to exactly one row
+    won_boards = sum(own_counts[:size]) - sum(opponent_counts[:size])
+
+    near_wins = 0
+    for board in global_board._local_boards:
+        if board.win():
+            continue
+        line_counts = board.line_counts()
+        for own, other in zip(line_counts[sign], line_counts[opponent]):
+            if own == size - 1 and not other:
+                near_wins += 1
+            elif other == size - 1 and not own:
+                near_wins -= 1
+
+    line_potential = 0
+    for own_count, opponent_count in zip(own_counts, opponent_counts):
+        if not opponent_count:
+            line_potential += own_count * own_count
+        elif not own_count:
+            line_potential -= opponent_count * opponent_count
+    return [won_boards, near_wins, line_potential]
+
+
+def batch_evaluation_features(decoded, size, sign):
+    """
+    Returns float array of shape (states, len(FEATURES)) of states
+    returned by serialization.decode_states(), from sign's perspective
+    """
+    own, opponent = (X, O) if sign == 'x' else (O, X)
+    lines = line_spots(size)
+    wins = decoded.local_wins
+    features = np.empty((len(wins), len(FEATURES)))
+
+    features[:, 0] = (wins == own).sum(axis=1) - \
+        (wins == opponent).sum(axis=1)
+
+    # axes: state, local board, line, spot of the line
+    line_signs = decoded.spots[:, :, lines]
+    own_counts = (line_signs == own).sum(axis=3)
+    opponent_counts = (line_signs == opponent).sum(axis=3)
+    near_wins = ((own_counts == size - 1) & (opponent_counts == 0)).sum(
+        axis=2) - ((opponent_counts == size - 1) & (own_counts == 0)).sum(
+        axis=2)
+    features[:, 1] = (near_wins * (wins == 0)).sum(axis=1)
+
+    line_wins = wins[:, lines]
+    own_counts = (line_wins == own).sum(axis=2)
+    opponent_counts = (line_wins == opponent).sum(axis=2)
+    features[:, 2] = \
+        (own_counts ** 2 * (opponent_counts == 0)).sum(axis=1) - \
+        (opponent_counts ** 2 * (own_counts == 0)).sum(axis=1)
+    return features
+
+
+class Evaluator(ABC):
+    """
+    Class Evaluator. Static evaluation of positions. Called with a board
+    and a sign returns score of one position from the sign player's
+    perspective, like alphabeta.evaluate(). score_states() and
+    score_boards() score many positions in one call and require NumPy
+    """
+
+    @abstractmethod
+    def __call__(self, global_board: GlobalBoard, sign):
+        pass
+
+    @abstractmethod
+    def score_decoded(self, decoded, size, sign):
+        """Returns scores of states returned by decode_states()"""
+
+    def score_states(self, buffer, size, sign):
+        """
+        Returns float array of scores of states concatenated in buffer,
+        see serialization.encode_states()
+        """
+        return self.score_decoded(decode_states(buffer, size), size, sign)
+
+    def score_boards(self, global_boards, sign):
+        """Returns float array of scores of boards of one size"""
+        global_boards = list(global_boards)
+        if not global_boards:
+            return np.zeros(0)
+        return self.score_states(encode_states(global_boards),
+                                 global_boards[0]._SIZE, sign)
+
+
+class LinearEvaluator(Evaluator):
+    """
+    Class LinearEvaluator. Scores positions with weighted sum of FEATURES
+    :param  weights:    Weight of every feature
+    :type   weights:    tuple of floats
+    :param  bias:       Score added to every position
+    :type   bias:       float
+    """
+
+    def __init__(self, weights, bias=0.0):
+        if len(weights) != len(FEATURES):
+            raise ValueError(f"Weights of {len(FEATURES)} features needed")
+        self.weights = tuple(float(weight) for weight in weights)
+        self.bias = float(bias)
+
+    @staticmethod
+    def fit(buffer, size, sign, targets):
+        """
+        Returns evaluator with weights fitted with least squares
+        to target scores of states in buffer
+        """
+        features = batch_evaluation_features(
+            decode_states(buffer, size), size, sign)
+        if len(features) != len(targets):
+            raise ValueError("Number of targets differs from states")
+        design = np.hstack([features, np.ones((len(features), 1))])
+        solution = np.linalg.lstsq(
+            design, np.asarray(targets, dtype=float), rcond=None)[0]
+        return LinearEvaluator(solution[:-1], solution[-1])
+
+    def __call__(self, global_board: GlobalBoard, sign):
+        return self.bias + sum(
+            weight * feature for weight, feature in zip(
+                self.weights, evaluation_features(global_board, sign)))
+
+    def score_decoded(self, decoded, size, sign):
+        return batch_evaluation_features(decoded, size, sign) @ \
+            np.array(self.weights) + self.bias
+
+
+class HeuristicEvaluator(LinearEvaluator):
+    """
+    Class HeuristicEvaluator. LinearEvaluator with hand-tuned weights:
+    a won local board is worth 10 points, a near win in an undecided
+    local board 2 and global lines are scored like alphabeta.evaluate()
+    """
+
+    def __init__(self):
+        super().__init__(HEURISTIC_WEIGHTS)
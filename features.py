@@ -0,0 +1,110 @@
+import numpy as np
+
+from batch_engine import O, X
+from serialization import decode_states, encode_states
+from ultimate_tic_tac_toe import state_size
+
+
+# feature planes of a position, in order
+PLANES = ('x', 'o', 'local_x_wins', 'local_o_wins', 'local_full',
+          'legal_boards', 'x_to_move')
+
+
+def planes_shape(states, size):
+    """
+    Returns shape of feature planes of given number of states.
+    Every plane is the grid of size ** 2 x size ** 2 spots laid out
+    like on the printed board, local board features fill the whole board
+    """
+    return states, len(PLANES), size ** 2, size ** 2
+
+
+def legal_boards(decoded):
+    """
+    Returns bool array of shape (states, size ** 2) of local boards
+    on which the player to move can play, like GlobalBoard.legal_moves()
+    """
+    states, cells = decoded.local_wins.shape
+    open_boards = ~decoded.local_full & (
+        ~decoded.lock_after_win[:, np.newaxis] | (decoded.local_wins == 0))
+
+    # board of the next move is given by the previous spot
+    previous = decoded.previous_spot - 1
+    rows = np.arange(states)
+    forced = (previous >= 0) & \
+        open_boards[rows, np.maximum(previous, 0)] & \
+        ~((decoded.last_won != 0) & decoded.choice_after_win)
+    chosen = decoded.board_choice > 0
+    board = np.where(chosen, decoded.board_choice - 1, previous)
+    single = np.arange(cells) == board[:, np.newaxis]
+    return np.where((chosen | forced)[:, np.newaxis], single, open_boards)
+
+
+def decoded_features(decoded, size, out):
+    """Writes feature planes of states returned by decode_states() to out"""
+    states = len(decoded.spots)
+    if out.shape != planes_shape(states, size):
+        raise ValueError("Wrong shape of the output array")
+    if not out.flags.c_contiguous:
+        raise ValueError("Output array must be C-contiguous")
+
+    # axes: state, plane, board row, spot row, board column, spot column
+    grid = out.reshape(states, len(PLANES), size, size, size, size)
+    spots = decoded.spots.reshape(states, size, size, size, size).transpose(
+        0, 1, 3, 2, 4)
+    grid[:, 0] = spots == X
+    grid[:, 1] = spots == O
+
+    def board_plane(plane, values):
+        grid[:, plane] = values.reshape(states, size, 1, size, 1)
+
+    board_plane(2, decoded.local_wins == X)
+    board_plane(3, decoded.local_wins == O)
+    board_plane(4, decoded.local_full)
+    board_plane(5, legal_boards(decoded))
+
+    # x starts, so x is to move if it has no more signs than o
+    counts = decoded.spots.reshape(states, -1)
+    x_to_move = (counts == X).sum(axis=1) <= (counts == O).sum(axis=1)
+    out[:, 6] = x_to_move[:, np.newaxis, np.newaxis]
+    return out
+
+
+def state_features(buffer, size, out=None, dtype=np.float32):
+    """
+    Returns feature planes (see PLANES and planes_shape()) of states
+    concatenated in buffer, see serialization.encode_states().
+    Planes are written to out if given
+    """
+    decoded = decode_states(buffer, size)
+    if out is None:
+        out = np.empty(planes_shape(len(decoded.spots), size), dtype=dtype)
+    return decoded_features(decoded, size, out)
+
+
+def board_features(global_boards, out=None, dtype=np.float32):
+    """Returns feature planes of boards of one size, see state_features()"""
+    global_boards = list(global_boards)
+    if not global_boards:
+        raise ValueError("No boards given")
+    return state_features(encode_states(global_boards),
+                          global_boards[0]._SIZE, out, dtype)
+
+
+def feature_batches(buffer, size, batch_size, dtype=np.float32):
+    """
+    Yields feature planes of consecutive batches of states from buffer.
+    All batches are written to the same array, so a batch is valid until
+    the next one is requested
+    """
+    if batch_size <= 0:
+        raise ValueError("Batch size must be positive")
+    record_size = state_size(size)
+    view = memoryview(buffer)
+    if len(view) % record_size:
+        raise ValueError("Buffer length is not a multiple of state size")
+
+    out = np.empty(planes_shape(batch_size, size), dtype=dtype)
+    for start in range(0, len(view), batch_size * record_size):
+        batch = view[start:start + batch_size * record_size]
+        yield state_features(batch, size, out[:len(batch) // record_size])
@@ -0,0 +1,174 @@
+import mmap
+import os
+import struct
+from itertools import cycle
+
+from ultimate_tic_tac_toe import GlobalBoard
+
+
+# file starts with magic bytes and format version
+FILE_HEADER = b'UTTTLOG\x01'
+
+# record header: size, rule flags, result, number of moves
+RECORD_HEADER = struct.Struct('<BBBH')
+
+RESULT_CODES = {'x': 1, 'o': 2, 'draw': 3}
+RESULTS_BY_CODE = {code: result for result, code in RESULT_CODES.items()}
+
+# board index and spot index of every move are stored in one byte each
+MAX_RECORDED_SIZE = 15
+
+
+class GameRecord:
+    """
+    Class GameRecord. Game read from a log. Moves are decoded on demand
+    :param  size:               Size of the game
+    :type   size:               int
+    :param  lock_after_win:     Rule flag of the game
+    :type   lock_after_win:     bool
+    :param  choice_after_win:   Rule flag of the game
+    :type   choice_after_win:   bool
+    :param  result:             'x', 'o' or 'draw'
+    :type   result:             str
+    :param  moves_count:        Number of moves of the game
+    :type   moves_count:        int
+    :param  offset:             Position of the record in the log
+    :type   offset:             int
+    :param  _data:              Log containing the record
+    :type   _data:              mmap/bytes
+    :param  early_draw:         Rule flag of the game
+    :type   early_draw:         bool
+    """
+
+    def __init__(self, size, lock_after_win, choice_after_win, result,
+                 moves_count, offset, data, early_draw=False):
+        self.size = size
+        self.lock_after_win = lock_after_win
+        self.choice_after_win = choice_after_win
+        self.early_draw = early_draw
+        self.result = result
+        self.moves_count = moves_count
+        self.offset = offset
+        self._data = data
+
+    def moves(self):
+        """Returns list of (board index, spot index) of all moves"""
+        start = self.offset + RECORD_HEADER.size
+        moves = self._data[start:start + 2 * self.moves_count]
+        return list(zip(moves[::2], moves[1::2]))
+
+    def replay(self, board_class=GlobalBoard):
+        """Replays the game on a new board and returns it"""
+        global_board = board_class(
+            self.size, self.lock_after_win, self.choice_after_win,
+            self.early_draw)
+        for (board_index, spot_index), sign in zip(self.moves(), cycle('xo')):
+            if global_board.current_board() is None:
+                global_board.choose_board(board_index)
+            global_board.make_move(sign, spot_index)
+        return global_board
+
+
+class GameRecordWriter:
+    """
+    Class GameRecordWriter. Appends finished games to a binary log.
+    Every game is written with a single write, so a log of an interrupted
+    run ends at most with one incomplete record, which readers skip
+    :param  _file:  Log opened for appending
+    :type   _file:  file
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER)
+
+    def write_game(self, global_board: GlobalBoard, result):
+        """Appends game played on the board with its result"""
+        size = global_board._SIZE
+        if size > MAX_RECORDED_SIZE:
+            raise ValueError("Board too big to record")
+        moves = global_board.moves()
+        flags = global_board._LOCK_AFTER_WIN | \
+            global_board._CHOICE_AFTER_WIN << 1 | \
+            global_board._EARLY_DRAW << 2
+        record = bytearray(RECORD_HEADER.pack(
+            size, flags, RESULT_CODES[result], len(moves)))
+        for board_index, spot_index in moves:
+            record.append(board_index)
+            record.append(spot_index)
+        self._file.write(record)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class GameRecordReader:
+    """
+    Class GameRecordReader. Reads games from a log mapped into memory,
+    so only the records actually visited are loaded from disk
+    :param  _map:   Memory map of the log, None if the log has no games
+    :type   _map:   mmap/None
+    """
+
+    def __init__(self, path):
+        self._map = None
+        with open(path, 'rb') as log_file:
+            if os.fstat(log_file.fileno()).st_size > len(FILE_HEADER):
+                self._map = mmap.mmap(
+                    log_file.fileno(), 0, access=mmap.ACCESS_READ)
+            elif log_file.read() not in (b'', FILE_HEADER):
+                raise ValueError("Not a game log")
+        if self._map is not None and \
+                self._map[:len(FILE_HEADER)] != FILE_HEADER:
+            self.close()
+            raise ValueError("Not a game log")
+
+    def __iter__(self):
+        """Yields GameRecord of every complete game in the log"""
+        data = self._map
+        if data is None:
+            return
+        offset = len(FILE_HEADER)
+        while offset + RECORD_HEADER.size <= len(data):
+            size, flags, result, moves_count = \
+                RECORD_HEADER.unpack_from(data, offset)
+            end = offset + RECORD_HEADER.size + 2 * moves_count
+            if end > len(data):
+                break
+            yield GameRecord(
+                size, bool(flags & 1), bool(flags & 2),
+                RESULTS_BY_CODE[result], moves_count, offset, data,
+                bool(flags & 4))
+            offset = end
+
+    def games(self, where=None):
+        """Yields records of games for which where(record) is true"""
+        for record in self:
+            if where is None or where(record):
+                yield record
+
+    def boards(self, where=None, board_class=GlobalBoard):
+        """Yields final boards of games for which where(record) is true"""
+        for record in self.games(where):
+            yield record.replay(board_class)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,242 @@
+from collections import namedtuple
+from functools import lru_cache
+
+from ultimate_tic_tac_toe import (
+    GlobalBoard,
+    BoardChoiceError,
+    BoardLockedError,
+    SpotOccupiedError,
+    line_indexes,
+    zobrist_keys
+)
+
+
+class LocalState(namedtuple('LocalState', ['spots', 'win', 'full'])):
+    """
+    Immutable local board: tuple of spots ('', 'x' or 'o'), winner or None
+    and fullness. Shared by all game states in which the board didn't change
+    """
+
+    __slots__ = ()
+
+    def if_move_possible(self, lock_after_win):
+        return not (self.full or self.win and lock_after_win)
+
+    def possible_moves(self, lock_after_win):
+        if not self.if_move_possible(lock_after_win):
+            return []
+        return [index + 1 for index, spot in enumerate(self.spots)
+                if not spot]
+
+
+class GameState(namedtuple('GameState', [
+        'zobrist', 'size', 'lock_after_win', 'choice_after_win', 'boards',
+        'previous_spot', 'previous_board', 'last_won', 'to_move',
+        'result', 'early_draw'], defaults=(False,))):
+    """
+    Immutable game position with the same rules as GlobalBoard.
+    play() returns a new state sharing all unchanged LocalStates with
+    the current one, so a move costs two tuples of size ** 2 references
+    instead of a copy of the whole board. Indexes are 1-based.
+    zobrist is the Zobrist hash of GlobalBoard in the same position,
+    it is used as the hash of the state and compared first for equality
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def initial(cls, size, lock_after_win, choice_after_win,
+                early_draw=False):
+        """Returns state before the first move"""
+        keys = zobrist_keys(size)
+        zobrist = keys.previous_spot[0]
+        if lock_after_win:
+            zobrist ^= keys.lock_after_win
+        if choice_after_win:
+            zobrist ^= keys.choice_after_win
+        if early_draw:
+            zobrist ^= keys.early_draw
+        empty_board = LocalState(size ** 2 * ('',), None, False)
+        return cls(zobrist, size, lock_after_win, choice_after_win,
+                   size ** 2 * (empty_board,), None, None, False, 'x', None,
+                   early_draw)
+
+    @classmethod
+    def from_global_board(cls, global_board: GlobalBoard, result=None):
+        """
+        Returns state of the board. Board choice in progress is ignored.
+        The player to move is the one with fewer signs on the board
+        """
+        boards = tuple(
+            LocalState(tuple(board._spots), board.win(), board._full)
+            for board in global_board._local_boards)
+        x_count = sum(board.spots.count('x') for board in boards)
+        o_count = sum(board.spots.count('o') for board in boards)
+
+        zobrist = global_board.zobrist_hash()
+        if global_board._board_choice:
+            zobrist ^= zobrist_keys(global_board._SIZE).board_choice[
+                global_board._board_choice]
+        return cls(
+            zobrist, global_board._SIZE, global_board._LOCK_AFTER_WIN,
+            global_board._CHOICE_AFTER_WIN, boards,
+            global_board._previous_spot_idx, global_board._previous_board_idx,
+            global_board._last_won, 'x' if x_count <= o_count else 'o', result,
+            global_board._EARLY_DRAW)
+
+    def to_global_board(self, board_class=GlobalBoard):
+        """Returns new board in the position of the state without history"""
+        global_board = board_class(
+            self.size, self.lock_after_win, self.choice_after_win,
+            self.early_draw)
+        for board, state in zip(global_board._local_boards, self.boards):
+            board._spots = list(state.spots)
+            board._win = state.win
+            board._full = state.full
+        global_board._previous_spot_idx = self.previous_spot
+        global_board._previous_board_idx = self.previous_board
+        global_board._last_won = self.last_won
+        global_board.rebuild_state()
+        return global_board
+
+    def local_board(self, board_index) -> LocalState:
+        if not 1 <= board_index <= self.size ** 2:
+            raise IndexError("Wrong board index")
+        return self.boards[board_index - 1]
+
+    def current_board(self):
+        """
+        Returns index of the local board of the next move,
+        None if the player to move chooses the board
+        """
+        if self.previous_spot is None:
+            return None
+        if not self.boards[self.previous_spot - 1].if_move_possible(
+                self.lock_after_win):
+            return None
+        if self.last_won and self.choice_after_win:
+            return None
+        return self.previous_spot
+
+    def possible_boards(self):
+        return [index + 1 for index, board in enumerate(self.boards)
+                if board.if_move_possible(self.lock_after_win)]
+
+    def legal_moves(self):
+        """Returns list of (board index, spot index) of legal moves"""
+        if self.result:
+            return []
+        current_board = self.current_board()
+        boards = [current_board] if current_board is not None \
+            else self.possible_boards()
+        return [(board_index, spot_index) for board_index in boards
+                for spot_index in self.boards[board_index - 1].possible_moves(
+                    self.lock_after_win)]
+
+    def play(self, board_index, spot_index):
+        """
+        Returns state after the move of the player to move. Raises errors
+        of GlobalBoard.choose_board() and make_move() for illegal moves
+        """
+        size = self.size
+        if self.result:
+            raise ValueError("Game is finished")
+        if not 1 <= board_index <= size ** 2:
+            raise IndexError("Invalid board index")
+        if not 1 <= spot_index <= size ** 2:
+            raise IndexError("Invalid spot index")
+        current_board = self.current_board()
+        if current_board is None:
+            if not self.boards[board_index - 1].if_move_possible(
+                    self.lock_after_win):
+                raise BoardLockedError(board_index)
+        elif board_index != current_board:
+            raise BoardChoiceError('Player not permitted to choose the board')
+
+        board = self.boards[board_index - 1]
+        if board.spots[spot_index - 1]:
+            raise SpotOccupiedError(spot_index)
+
+        # local board
+        sign = self.to_move
+        spots = board.spots[:spot_index - 1] + (sign,) + \
+            board.spots[spot_index:]
+        won = not board.win and any(
+            all(spots[spot] == sign for spot in line)
+            for line in local_lines(size)[spot_index - 1])
+        new_board = LocalState(spots, sign if won else board.win,
+                               '' not in spots)
+        boards = self.boards[:board_index - 1] + (new_board,) + \
+            self.boards[board_index:]
+        last_won = sign if won else None
+
+        # hash like GlobalBoard.make_move()
+        keys = zobrist_keys(size)
+        zobrist = self.zobrist ^ \
+            keys.spots[sign][(board_index - 1) * size ** 2 + spot_index - 1] ^ \
+            keys.previous_spot[self.previous_spot or 0] ^ \
+            keys.previous_spot[spot_index]
+        if bool(self.last_won) != bool(last_won):
+            zobrist ^= keys.last_won
+
+        # result like GlobalBoard.move_win_check()
+        result = None
+        if won and any(all(boards[index].win == sign for index in line)
+                       for line in local_lines(size)[board_index - 1]):
+            result = sign
+        elif not new_board.if_move_possible(self.lock_after_win) and not any(
+                state.if_move_possible(self.lock_after_win)
+                for state in boards):
+            result = 'draw'
+        elif self.early_draw and dead_position(boards, size):
+            result = 'draw'
+
+        return GameState(
+            zobrist, size, self.lock_after_win, self.choice_after_win, boards,
+            spot_index, board_index, last_won,
+            'o' if sign == 'x' else 'x', result, self.early_draw)
+
+    def __hash__(self):
+        return self.zobrist
+
+
+@lru_cache(maxsize=None)
+def local_lines(size):
+    """
+    For each 0-based spot index returns tuples of 0-based spot indexes
+    of the lines passing through it
+    """
+    lines = board_lines(size)
+    return tuple(tuple(lines[line] for line in spot_lines)
+                 for spot_lines in line_indexes(size))
+
+
+@lru_cache(maxsize=None)
+def board_lines(size):
+    """
+    Returns tuples of 0-based spot indexes of every line of a board,
+    numbered like in line_indexes()
+    """
+    lines = [[] for _ in range(2 * size + 2)]
+    for spot, spot_lines in enumerate(line_indexes(size)):
+        for line in spot_lines:
+            lines[line].append(spot)
+    return tuple(tuple(line) for line in lines)
+
+
+def dead_position(boards, size):
+    """
+    Checks if neither player can win a game of the LocalStates any more,
+    like GlobalBoard.dead_position()
+    """
+    lines = board_lines(size)
+    for sign, opponent in (('x', 'o'), ('o', 'x')):
+        # like LocalBoard.open_for()
+        open_boards = [
+            board.win == sign if board.win else any(
+                all(board.spots[spot] != opponent for spot in line)
+                for line in lines)
+            for board in boards]
+        if any(all(open_boards[index] for index in line) for line in lines):
+            return False
+    return True
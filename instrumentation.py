@@ -0,0 +1,111 @@
+import json
+import sys
+from collections import Counter
+from time import perf_counter
+
+
+class PlayerStats:
+    """
+    Class PlayerStats. Move statistics of one player
+    :param  moves:      Number of moves made
+    :type   moves:      int
+    :param  total_time: Time of all moves in seconds
+    :type   total_time: float
+    :param  max_time:   Time of the longest move in seconds
+    :type   max_time:   float
+    :param  nodes:      Number of nodes searched, if the player reports them
+    :type   nodes:      int
+    """
+
+    def __init__(self):
+        self.moves = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.nodes = 0
+
+    def mean_time(self):
+        if not self.moves:
+            return 0.0
+        return self.total_time / self.moves
+
+    def as_dict(self):
+        return {
+            'moves': self.moves,
+            'total_time': self.total_time,
+            'mean_time': self.mean_time(),
+            'max_time': self.max_time,
+            'nodes': self.nodes
+        }
+
+
+class GameStats:
+    """
+    Class GameStats. Statistics collected by UltimateTicTacToe.play
+    and GlobalBoard when passed to them
+    :param  players:    Statistics of every player, keyed with sign and name
+    :type   players:    dict of PlayerStats
+    :param  calls:      Number of calls of instrumented engine methods
+    :type   calls:      Counter
+    :param  _dump_interval: Minimal time between dumps in seconds,
+        None disables dumping
+    :type   _dump_interval: float/None
+    """
+
+    def __init__(self, dump_interval=None, dump_file=None):
+        self.players = {}
+        self.calls = Counter()
+        self._dump_interval = dump_interval
+        self._dump_file = dump_file
+        self._last_dump = perf_counter()
+
+    def count(self, name):
+        self.calls[name] += 1
+
+    def record_move(self, player, sign, move_time):
+        """Records a move of the player. Nodes searched are read from
+        'nodes' or 'playouts' attribute of the player if it has one"""
+        name = player_name(player, sign)
+        player_stats = self.players.get(name)
+        if player_stats is None:
+            player_stats = self.players[name] = PlayerStats()
+        player_stats.moves += 1
+        player_stats.total_time += move_time
+        player_stats.max_time = max(player_stats.max_time, move_time)
+        nodes = reported_nodes(player)
+        if nodes:
+            player_stats.nodes += nodes
+
+    def as_dict(self):
+        return {
+            'players': {name: player_stats.as_dict()
+                        for name, player_stats in self.players.items()},
+            'calls': dict(self.calls)
+        }
+
+    def dump(self):
+        """Writes statistics as one JSON line"""
+        dump_file = self._dump_file or sys.stderr
+        dump_file.write(json.dumps(self.as_dict()) + '\n')
+        dump_file.flush()
+        self._last_dump = perf_counter()
+
+    def maybe_dump(self):
+        """Dumps statistics if dump interval has passed since the last dump"""
+        if self._dump_interval is not None and \
+                perf_counter() - self._last_dump >= self._dump_interval:
+            self.dump()
+
+
+def player_name(player, sign):
+    """Returns name identifying the player in GameStats"""
+    name = getattr(player, '__name__', None) or type(player).__name__
+    return f'{sign}:{name}'
+
+
+def reported_nodes(player):
+    """Returns nodes searched in the last move if the player reports them"""
+    for attribute in ('nodes', 'playouts'):
+        nodes = getattr(player, attribute, None)
+        if isinstance(nodes, int):
+            return nodes
+    return None
@@ -0,0 +1,222 @@
+import random
+from math import log, sqrt
+from time import perf_counter
+
+from ultimate_tic_tac_toe import GlobalBoard
+
+
+def other_sign(sign):
+    return 'o' if sign == 'x' else 'x'
+
+
+def revert_move(global_board: GlobalBoard):
+    """Reverts move made with GlobalBoard.play() or play_unchecked()"""
+    global_board.unmake_move()
+    global_board.cancel_board_choice()
+
+
+def random_playout(global_board: GlobalBoard, sign, result, rng):
+    """
+    Plays random moves after the move of the sign player until the end
+    of the game and reverts them. Returns the result
+    """
+    depth = 0
+    while result is None:
+        sign = other_sign(sign)
+        move = rng.choice(global_board.legal_moves())
+        result = global_board.play_unchecked(move, sign)
+        depth += 1
+
+    for _ in range(depth):
+        revert_move(global_board)
+    return result
+
+
+def backpropagate(node, result):
+    """Adds the result to the statistics of the node and its ancestors"""
+    while node is not None:
+        node.visits += 1
+        if result == node.sign:
+            node.wins += 1
+        elif result == 'draw':
+            node.wins += 0.5
+        node = node.parent
+
+
+class Node:
+    """
+    Class Node. Node of the Monte Carlo search tree
+    :param  move:       Move leading to the node, see encode_move()
+    :type   move:       int/None
+    :param  sign:       Sign of the player who made the move
+    :type   sign:       string
+    :param  result:     Game result after the move
+    :type   result:     string/None
+    :param  position_hash:  Zobrist hash of the position after the move
+    :type   position_hash:  int
+    :param  untried_moves:  Moves not expanded yet, None before first visit
+    :type   untried_moves:  list/None
+    :param  wins:       Sum of results from the sign player's perspective
+    :type   wins:       float
+    """
+
+    def __init__(self, move, sign, result, position_hash, parent=None):
+        self.move = move
+        self.sign = sign
+        self.result = result
+        self.position_hash = position_hash
+        self.parent = parent
+        self.children = {}
+        self.untried_moves = None
+        self.visits = 0
+        self.wins = 0.0
+
+    def uct_child(self, exploration):
+        """Returns the child with the highest upper confidence bound"""
+        log_visits = log(self.visits)
+        return max(
+            self.children.values(),
+            key=lambda child: child.wins / child.visits +
+            exploration * sqrt(log_visits / child.visits)
+        )
+
+    def most_visited_child(self):
+        return max(self.children.values(), key=lambda child: child.visits)
+
+
+class MonteCarloBot:
+    """
+    Class MonteCarloBot. Bot choosing moves with Monte Carlo Tree Search.
+    Called with a sign like bots of UltimateTicTacToe. Searches on the
+    game's board with make/unmake and keeps the subtree of its move
+    for the next call.
+    :param  _iterations:    Number of playouts per move
+    :type   _iterations:    int/None
+    :param  _time_ms:       Time limit of search per move in milliseconds
+    :type   _time_ms:       float/None
+    :param  _root:          Node of the last position reached by the bot
+    :type   _root:          Node/None
+    """
+
+    def __init__(self, game, iterations=None, time_ms=None,
+                 exploration=sqrt(2), seed=None):
+        if iterations is None and time_ms is None:
+            iterations = 1000
+        if iterations is not None and iterations <= 0:
+            raise ValueError("Number of iterations must be positive")
+        if time_ms is not None and time_ms <= 0:
+            raise ValueError("Time limit must be positive")
+
+        self._game = game
+        self._iterations = iterations
+        self._time_ms = time_ms
+        self._exploration = exploration
+        self._random = random.Random(seed)
+        self._root = None
+
+        # statistics of the last search
+        self.playouts = 0
+        self.search_time = 0.0
+        self.reused_visits = 0
+
+    def playouts_per_second(self):
+        """Returns playouts per second of the last search"""
+        if not self.search_time:
+            return 0.0
+        return self.playouts / self.search_time
+
+    def reuse_root(self, global_board: GlobalBoard, sign):
+        """
+        Returns the node of the current position if it was reached
+        from the previous root by one opponent's move, otherwise a new node
+        """
+        position_hash = global_board.zobrist_hash()
+        if self._root is not None and self._root.sign == sign:
+            for child in self._root.children.values():
+                if child.position_hash == position_hash:
+                    child.parent = None
+                    return child
+        return Node(None, other_sign(sign), None, position_hash)
+
+    def search(self, global_board: GlobalBoard, sign):
+        """Runs the search from the current position. Returns the root"""
+        root = self.reuse_root(global_board, sign)
+        self.reused_visits = root.visits
+
+        start = perf_counter()
+        deadline = None
+        if self._time_ms is not None:
+            deadline = start + self._time_ms / 1000
+
+        playouts = 0
+        while True:
+            if self._iterations is not None and \
+                    playouts >= self._iterations:
+                break
+            # at least one playout is needed to choose a move
+            if deadline is not None and playouts and \
+                    perf_counter() >= deadline:
+                break
+            self.iteration(global_board, root)
+            playouts += 1
+
+        self.playouts = playouts
+        self.search_time = perf_counter() - start
+        return root
+
+    def iteration(self, global_board: GlobalBoard, root: Node):
+        """Runs selection, expansion, playout and backpropagation"""
+        node, depth = self.select(global_board, root)
+        result = self.playout(global_board, node)
+        for _ in range(depth):
+            revert_move(global_board)
+        backpropagate(node, result)
+
+    def select(self, global_board: GlobalBoard, root: Node):
+        """
+        Runs selection and expansion making their moves on the board.
+        Returns the reached node and the number of moves made
+        """
+        node = root
+        depth = 0
+
+        # selection
+        while node.result is None and node.untried_moves is not None and \
+                not node.untried_moves and node.children:
+            node = node.uct_child(self._exploration)
+            global_board.play_unchecked(node.move, node.sign)
+            depth += 1
+
+        # expansion
+        if node.result is None:
+            if node.untried_moves is None:
+                node.untried_moves = global_board.legal_moves()
+                self._random.shuffle(node.untried_moves)
+            if node.untried_moves:
+                move = node.untried_moves.pop()
+                sign = other_sign(node.sign)
+                result = global_board.play_unchecked(move, sign)
+                depth += 1
+                child = Node(move, sign, result,
+                             global_board.zobrist_hash(), node)
+                node.children[move] = child
+                node = child
+        return node, depth
+
+    def playout(self, global_board: GlobalBoard, node: Node):
+        """
+        Plays random moves from the position of the node until the end
+        of the game and reverts them. Returns the result
+        """
+        return random_playout(global_board, node.sign, node.result,
+                              self._random)
+
+    def __call__(self, sign):
+        global_board = self._game.global_board()
+        root = self.search(global_board, sign)
+        best_child = root.most_visited_child()
+
+        # keep the subtree for the next move
+        self._root = best_child
+        best_child.parent = None
+        return global_board.play(best_child.move, sign)
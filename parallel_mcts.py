@@ -0,0 +1,269 @@
+import os
+import random
+from math import sqrt
+from multiprocessing import Pool
+from time import perf_counter, time
+
+from mcts import (
+    MonteCarloBot,
+    Node,
+    backpropagate,
+    other_sign,
+    random_playout,
+    revert_move
+)
+from ultimate_tic_tac_toe import GlobalBoard
+
+
+# parallelization modes of ParallelMonteCarloBot
+MODES = ('root', 'leaf')
+
+
+def search_tree(task):
+    """
+    Runs MonteCarloBot search from a serialized position in a worker
+    process. Returns (visits, wins) of every root move and number
+    of playouts
+    """
+    board_class, data, sign, iterations, deadline, exploration, seed = task
+    global_board = board_class.from_bytes(data)
+    time_ms = None
+    if deadline is not None:
+        # deadline is wall-clock time, the search makes at least one playout
+        time_ms = max((deadline - time()) * 1000, 0.001)
+    bot = MonteCarloBot(None, iterations, time_ms, exploration, seed)
+    root = bot.search(global_board, sign)
+    return {move: (child.visits, child.wins)
+            for move, child in root.children.items()}, bot.playouts
+
+
+def run_playouts(task):
+    """
+    Runs random playouts from serialized positions in a worker process.
+    Returns list of results of the first positions, after the wall-clock
+    deadline (if not None) only the first playout is made
+    """
+    board_class, positions, seed, deadline = task
+    rng = random.Random(seed)
+    results = []
+    for data, sign in positions:
+        if results and deadline is not None and time() >= deadline:
+            break
+        results.append(random_playout(
+            board_class.from_bytes(data), sign, None, rng))
+    return results
+
+
+def add_virtual_loss(node: Node, visits):
+    """Adds visits without wins to the node and its ancestors"""
+    while node is not None:
+        node.visits += visits
+        node = node.parent
+
+
+class ParallelMonteCarloBot:
+    """
+    Class ParallelMonteCarloBot. Monte Carlo Tree Search bot using
+    worker processes. Called with a sign like bots of UltimateTicTacToe.
+    In 'root' mode every worker searches its own tree and visits of root
+    moves are summed. In 'leaf' mode the tree is kept in this process
+    and playouts of batches of leaves run in the workers, leaves waiting
+    for results count as lost visits so the batch spreads over the tree.
+    Positions are sent to workers with GlobalBoard.to_bytes().
+    Bots running in daemon processes (e.g. Tournament workers) can only
+    use a single worker, which searches in this process.
+    :param  _workers:       Number of worker processes
+    :type   _workers:       int
+    :param  _iterations:    Number of playouts per move of all workers
+    :type   _iterations:    int/None
+    :param  _time_ms:       Time limit of search per move in milliseconds
+    :type   _time_ms:       float/None
+    :param  _leaf_batch:    Number of leaves in one task of 'leaf' mode
+    :type   _leaf_batch:    int
+    :param  _pool:          Pool of workers. Unless given, it is created
+        before the first search and kept until close() or deletion
+        of the bot
+    :type   _pool:          multiprocessing.Pool/None
+    """
+
+    def __init__(self, game, workers=None, mode='root', iterations=None,
+                 time_ms=None, exploration=sqrt(2), seed=None, leaf_batch=8,
+                 pool=None):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 0:
+            raise ValueError("Number of workers must be positive")
+        if mode not in MODES:
+            raise ValueError(f"Mode must be one of {', '.join(MODES)}")
+        if iterations is None and time_ms is None:
+            iterations = 1000 * workers
+        if iterations is not None and iterations <= 0:
+            raise ValueError("Number of iterations must be positive")
+        if time_ms is not None and time_ms <= 0:
+            raise ValueError("Time limit must be positive")
+        if leaf_batch <= 0:
+            raise ValueError("Leaf batch must be positive")
+
+        self._game = game
+        self._workers = workers
+        self._mode = mode
+        self._iterations = iterations
+        self._time_ms = time_ms
+        self._exploration = exploration
+        self._leaf_batch = leaf_batch
+        self._random = random.Random(seed)
+        self._pool = pool
+        self._own_pool = pool is None
+
+        # statistics of the last search
+        self.playouts = 0
+        self.search_time = 0.0
+        self.root_visits = {}
+
+    def playouts_per_second(self):
+        """Returns playouts per second of the last search"""
+        if not self.search_time:
+            return 0.0
+        return self.playouts / self.search_time
+
+    def worker_pool(self):
+        """
+        Returns pool of workers, created if needed.
+        Returns None if the only worker is this process
+        """
+        if self._pool is None and self._workers > 1:
+            self._pool = Pool(self._workers)
+            self._own_pool = True
+        return self._pool
+
+    def map(self, function, tasks):
+        """Runs tasks in the workers, in this process if there is one"""
+        pool = self.worker_pool()
+        if pool is None:
+            return list(map(function, tasks))
+        return pool.map(function, tasks)
+
+    def close(self):
+        """Closes the pool unless it was given to the bot"""
+        if self._own_pool and self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        # bots made by simulation.make_bot() are never closed
+        if getattr(self, '_own_pool', False) and self._pool is not None:
+            self._pool.terminate()
+
+    def search(self, global_board: GlobalBoard, sign):
+        """Runs the search from the current position. Returns the best move"""
+        # starting workers doesn't count into the time limit
+        self.worker_pool()
+        start = perf_counter()
+        deadline = None
+        if self._time_ms is not None:
+            deadline = time() + self._time_ms / 1000
+
+        if self._mode == 'root':
+            self.root_visits, self.playouts = self.search_roots(
+                global_board, sign, deadline)
+        else:
+            self.root_visits, self.playouts = self.search_leaves(
+                global_board, sign, deadline)
+
+        self.search_time = perf_counter() - start
+        return max(self.root_visits, key=self.root_visits.get)
+
+    def search_roots(self, global_board: GlobalBoard, sign, deadline):
+        """
+        Searches independent trees in the workers.
+        Returns summed visits of root moves and number of playouts
+        """
+        counts = self._workers * [None]
+        if self._iterations is not None:
+            # at least one playout is made by every worker
+            counts = [max(1, (self._iterations + worker) // self._workers)
+                      for worker in range(self._workers)]
+
+        data = global_board.to_bytes()
+        tasks = [(type(global_board), data, sign, count, deadline,
+                  self._exploration, self._random.getrandbits(32))
+                 for count in counts]
+
+        visits = {}
+        playouts = 0
+        for moves, tree_playouts in self.map(search_tree, tasks):
+            for move, (move_visits, _) in moves.items():
+                visits[move] = visits.get(move, 0) + move_visits
+            playouts += tree_playouts
+        return visits, playouts
+
+    def search_leaves(self, global_board: GlobalBoard, sign, deadline):
+        """
+        Searches one tree running playouts of its leaves in the workers.
+        Returns visits of root moves and number of playouts
+        """
+        tree = MonteCarloBot(None, exploration=self._exploration,
+                             seed=self._random.getrandbits(32))
+        root = Node(None, other_sign(sign), None, global_board.zobrist_hash())
+        board_class = type(global_board)
+        batch_size = self._workers * self._leaf_batch
+
+        playouts = 0
+        while True:
+            if self._iterations is not None and \
+                    playouts >= self._iterations:
+                break
+            # at least one batch is needed to choose a move
+            if deadline is not None and playouts and time() >= deadline:
+                break
+            count = batch_size
+            if self._iterations is not None:
+                count = min(count, self._iterations - playouts)
+            # workers stop their batches at the deadline, except the first
+            batch_deadline = deadline if playouts else None
+
+            leaves, positions = [], []
+            for _ in range(count):
+                if batch_deadline is not None and positions and \
+                        time() >= batch_deadline:
+                    break
+                node, depth = tree.select(global_board, root)
+                if node.result is None:
+                    leaves.append(node)
+                    positions.append((global_board.to_bytes(), node.sign))
+                    add_virtual_loss(node, 1)
+                else:
+                    backpropagate(node, node.result)
+                    playouts += 1
+                for _ in range(depth):
+                    revert_move(global_board)
+
+            tasks = [(board_class, positions[first:first + self._leaf_batch],
+                      self._random.getrandbits(32), batch_deadline)
+                     for first in range(0, len(positions), self._leaf_batch)]
+            results = {}
+            for first, task_results in zip(
+                    range(0, len(positions), self._leaf_batch),
+                    self.map(run_playouts, tasks)):
+                for index, result in enumerate(task_results, first):
+                    results[index] = result
+            for index, node in enumerate(leaves):
+                # leaves without playouts lose only their virtual loss
+                add_virtual_loss(node, -1)
+                if index in results:
+                    backpropagate(node, results[index])
+            playouts += len(results)
+
+        return {move: child.visits
+                for move, child in root.children.items()}, playouts
+
+    def __call__(self, sign):
+        global_board = self._game.global_board()
+        return global_board.play(self.search(global_board, sign), sign)
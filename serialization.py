@@ -0,0 +1,80 @@
+from collections import namedtuple
+
+from ultimate_tic_tac_toe import (
+    GlobalBoard,
+    STATE_HEADER_SIZE,
+    state_size
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DecodedStates = namedtuple('DecodedStates', [
+    'lock_after_win', 'choice_after_win', 'last_won', 'previous_spot',
+    'previous_board', 'board_choice', 'spots', 'local_wins', 'local_full'
+])
+
+
+def encode_states(global_boards) -> bytes:
+    """Returns concatenated GlobalBoard.to_bytes() of all boards"""
+    return b''.join(global_board.to_bytes() for global_board in global_boards)
+
+
+def iter_boards(buffer, size, board_class=GlobalBoard):
+    """Yields boards decoded from buffer of concatenated states"""
+    record_size = state_size(size)
+    view = memoryview(buffer)
+    if len(view) % record_size:
+        raise ValueError("Buffer length is not a multiple of state size")
+    for start in range(0, len(view), record_size):
+        yield board_class.from_bytes(view[start:start + record_size])
+
+
+def decode_states(buffer, size) -> DecodedStates:
+    """
+    Decodes buffer of concatenated states of given size into NumPy arrays
+    with one row per state. Indexes are 1-based with 0 standing for None,
+    spots and wins use codes of batch_engine (0 empty, 1 'x', 2 'o').
+    last_won holds the sign which won a local board with the last move.
+    Requires NumPy.
+    """
+    if np is None:
+        raise ImportError("decode_states requires NumPy")
+
+    record_size = state_size(size)
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if len(data) % record_size:
+        raise ValueError("Buffer length is not a multiple of state size")
+    data = data.reshape(-1, record_size)
+    if (data[:, 0] != size).any():
+        raise ValueError("States of different size in buffer")
+
+    states = len(data)
+    cells = size ** 2
+    spots_end = STATE_HEADER_SIZE + (size ** 4 + 3) // 4
+
+    # 4 spots in every byte, 2 boards in every byte
+    spots = data[:, STATE_HEADER_SIZE:spots_end, np.newaxis] >> \
+        np.array([0, 2, 4, 6], dtype=np.uint8) & 3
+    spots = spots.reshape(states, -1)[:, :cells ** 2].reshape(
+        states, cells, cells).astype(np.int8)
+    boards = data[:, spots_end:, np.newaxis] >> \
+        np.array([0, 4], dtype=np.uint8) & 15
+    boards = boards.reshape(states, -1)[:, :cells]
+
+    flags = data[:, 1]
+    last_won = flags >> 2 & 3
+    return DecodedStates(
+        lock_after_win=(flags & 1).astype(bool),
+        choice_after_win=(flags & 2).astype(bool),
+        last_won=np.where(last_won >= 2, last_won - 1, 0).astype(np.int8),
+        previous_spot=data[:, 2].astype(np.int64),
+        previous_board=data[:, 3].astype(np.int64),
+        board_choice=data[:, 4].astype(np.int64),
+        spots=spots,
+        local_wins=(boards & 3).astype(np.int8),
+        local_full=(boards & 4).astype(bool)
+    )
@@ -0,0 +1,459 @@
+import asyncio
+import random
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import cycle
+from time import perf_counter
+
+from alphabeta import AlphaBetaBot
+from mcts import MonteCarloBot
+from simulation import make_bot
+from ultimate_tic_tac_toe import (
+    UltimateTicTacToe,
+    GlobalBoard,
+    BoardChoiceError,
+    BoardLockedError,
+    SpotOccupiedError
+)
+
+
+# bot name: UltimateTicTacToe method name or factory, see make_bot()
+BOTS = {
+    'random': 'random_bot',
+    'mcts': partial(MonteCarloBot, iterations=200),
+    'alphabeta': partial(AlphaBetaBot, time_ms=100),
+}
+
+# errors of game methods reported to the client
+MOVE_ERRORS = (ValueError, IndexError, BoardChoiceError, BoardLockedError,
+               SpotOccupiedError)
+
+# command: minimal and maximal number of arguments
+ARGUMENTS_COUNTS = {
+    'NEW': (0, 5),
+    'CHOOSE': (1, 1),
+    'MOVE': (1, 1),
+    'STATE': (0, 0),
+    'STATS': (0, 0),
+    'HELP': (0, 0),
+}
+
+HELP = 'Commands: NEW [size] [lock 0/1] [choice 0/1] [x/o] [bot], ' \
+    'CHOOSE board, MOVE spot, STATE, STATS, QUIT'
+
+
+class ProtocolError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class LatencyStats:
+    """
+    Class LatencyStats. Latencies of the most recent moves
+    :param  moves:      Number of all moves measured
+    :type   moves:      int
+    :param  _latencies: Latencies of the most recent moves in seconds
+    :type   _latencies: deque of floats
+    """
+
+    def __init__(self, max_samples=100000):
+        self.moves = 0
+        self._latencies = deque(maxlen=max_samples)
+
+    def record(self, latency):
+        self.moves += 1
+        self._latencies.append(latency)
+
+    def percentile(self, percentile):
+        """Returns latency below which given percent of samples lie"""
+        if not self._latencies:
+            return 0.0
+        latencies = sorted(self._latencies)
+        index = round(percentile / 100 * (len(latencies) - 1))
+        return latencies[index]
+
+    def summary(self):
+        return f'moves={self.moves} ' \
+            f'p50={self.percentile(50) * 1000:.3f}ms ' \
+            f'p99={self.percentile(99) * 1000:.3f}ms'
+
+
+class GameSession:
+    """
+    Class GameSession. Game played by one connection against a bot.
+    Client sends one command per line and gets one or more lines back:
+        NEW [size] [lock] [choice] [sign] [bot]     GAME sign, then moves
+        CHOOSE board                                OK
+        MOVE spot                                   moves
+    where moves are 'BOT board spot' for the bot's move followed
+    by 'TURN board' (0 if the board is to be chosen) or 'RESULT result'.
+    STATE returns 'STATE' and GlobalBoard.to_bytes() in hex.
+    Errors are reported as 'ERROR message'
+    :param  _game:  Current game, None before NEW
+    :type   _game:  UltimateTicTacToe/None
+    :param  _sign:  Sign of the client
+    :type   _sign:  str
+    :param  _bot:   Bot playing with the client's opponent sign
+    :type   _bot:   callable
+    """
+
+    def __init__(self, server):
+        self._server = server
+        self._game = None
+        self._sign = None
+        self._bot = None
+        self._result = None
+
+    def global_board(self) -> GlobalBoard:
+        if self._game is None:
+            raise ProtocolError('No game, start one with NEW')
+        return self._game.global_board()
+
+    def turn_line(self):
+        if self._result:
+            return f'RESULT {self._result}'
+        return f'TURN {self.global_board().current_board() or 0}'
+
+    async def handle(self, line):
+        """Returns response lines to the command line"""
+        command, *args = line.split() or ['']
+        command = command.upper()
+        try:
+            if command not in ARGUMENTS_COUNTS:
+                raise ProtocolError(f'Unknown command {command!r}')
+            min_count, max_count = ARGUMENTS_COUNTS[command]
+            if not min_count <= len(args) <= max_count:
+                raise ProtocolError(f'Wrong number of arguments of {command}')
+
+            if command == 'NEW':
+                return await self.new_game(*args)
+            if command == 'CHOOSE':
+                return self.choose_board(*args)
+            if command == 'MOVE':
+                return await self.make_move(*args)
+            if command == 'STATE':
+                return ['STATE ' + self.global_board().to_bytes().hex()]
+            if command == 'STATS':
+                return ['STATS ' + self._server.summary()]
+            return [HELP]
+        except (ProtocolError, *MOVE_ERRORS) as error:
+            return [f'ERROR {error}']
+
+    async def new_game(self, size='3', lock_after_win='0',
+                       choice_after_win='0', sign='x', bot='random'):
+        if sign not in ('x', 'o'):
+            raise ProtocolError('Sign must be x or o')
+        if bot not in self._server.bots:
+            raise ProtocolError(f'Unknown bot {bot!r}')
+        try:
+            size = int(size)
+            lock_after_win = bool(int(lock_after_win))
+            choice_after_win = bool(int(choice_after_win))
+        except ValueError:
+            raise ProtocolError('Size and rule flags must be numbers')
+        if not 2 <= size <= self._server.max_size:
+            raise ProtocolError(
+                f'Size must be between 2 and {self._server.max_size}')
+
+        self._game = UltimateTicTacToe(size, lock_after_win, choice_after_win)
+        self._sign = sign
+        self._bot = make_bot(self._game, self._server.bots[bot])
+        self._result = None
+
+        lines = [f'GAME {sign}']
+        if sign == 'o':
+            lines.append(await self.bot_move())
+        lines.append(self.turn_line())
+        return lines
+
+    def choose_board(self, board_index):
+        if self._result:
+            raise ProtocolError('Game finished')
+        self.global_board().choose_board(parse_index(board_index))
+        return ['OK']
+
+    async def make_move(self, spot_index):
+        global_board = self.global_board()
+        if self._result:
+            raise ProtocolError('Game finished')
+        self._result = global_board.make_move(
+            self._sign, parse_index(spot_index))
+        if self._result:
+            return [self.turn_line()]
+        return [await self.bot_move(), self.turn_line()]
+
+    async def bot_move(self):
+        """Runs the bot in the executor. Returns line with its move"""
+        global_board = self.global_board()
+        bot_sign = 'o' if self._sign == 'x' else 'x'
+        loop = asyncio.get_running_loop()
+        self._result = await loop.run_in_executor(
+            self._server.executor, self._bot, bot_sign)
+        board_index, spot_index = global_board.moves()[-1]
+        return f'BOT {board_index} {spot_index}'
+
+
+def parse_index(index):
+    try:
+        return int(index)
+    except ValueError:
+        raise ProtocolError(f'Index must be a number, not {index!r}')
+
+
+class GameServer:
+    """
+    Class GameServer. Asyncio TCP server hosting games of many connections.
+    Bots run in a thread pool, so the event loop keeps serving other
+    connections during their search
+    :param  bots:           Bots available to clients, by name
+    :type   bots:           dict
+    :param  latencies:      Time from receiving MOVE or NEW to the response,
+        including the bot's move
+    :type   latencies:      LatencyStats
+    :param  _idle_timeout:  Seconds after which idle connections are closed,
+        None keeps them open
+    :type   _idle_timeout:  float/None
+    """
+
+    def __init__(self, bots=None, workers=None, idle_timeout=None,
+                 max_size=5):
+        self.bots = bots if bots is not None else BOTS
+        self.executor = ThreadPoolExecutor(workers)
+        self.latencies = LatencyStats()
+        self.max_size = max_size
+        self.connections = 0
+        self.games = 0
+        self._idle_timeout = idle_timeout
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=0):
+        """Starts listening. Port 0 picks a free port, see port()"""
+        self._server = await asyncio.start_server(
+            self.handle_connection, host, port)
+        return self._server
+
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    def summary(self):
+        return f'connections={self.connections} games={self.games} ' + \
+            self.latencies.summary()
+
+    async def handle_connection(self, reader, writer):
+        self.connections += 1
+        session = GameSession(self)
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(
+                        reader.readline(), self._idle_timeout)
+                except asyncio.TimeoutError:
+                    break
+                if not line:
+                    break
+
+                start = perf_counter()
+                try:
+                    line = line.decode().strip()
+                except UnicodeDecodeError:
+                    line = ''
+                if line.upper() == 'QUIT':
+                    writer.write(b'BYE\n')
+                    break
+                response = await session.handle(line)
+                writer.write(''.join(
+                    response_line + '\n' for response_line in response
+                ).encode())
+                await writer.drain()
+
+                command = line.split(maxsplit=1)[0].upper() if line else ''
+                if command in ('NEW', 'MOVE') and \
+                        not response[0].startswith('ERROR'):
+                    self.latencies.record(perf_counter() - start)
+                    if command == 'NEW':
+                        self.games += 1
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+class GameClient:
+    """
+    Class GameClient. Client of GameServer mirroring the game
+    on its own GlobalBoard
+    :param  global_board:   Mirror of the server's board
+    :type   global_board:   GlobalBoard
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self.global_board = None
+        self.result = None
+        self._sign = None
+
+    @classmethod
+    async def connect(cls, host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, line, responses=1):
+        self._writer.write(line.encode() + b'\n')
+        await self._writer.drain()
+        lines = []
+        for _ in range(responses):
+            response = (await self._reader.readline()).decode().strip()
+            if response.startswith('ERROR'):
+                raise ProtocolError(response[len('ERROR '):])
+            lines.append(response)
+        return lines
+
+    async def read_moves(self):
+        """Reads bot moves until TURN or RESULT line"""
+        while True:
+            command, *args = (await self._reader.readline()).decode().split()
+            if command == 'ERROR':
+                raise ProtocolError(' '.join(args))
+            if command == 'BOT':
+                board_index, spot_index = map(int, args)
+                if self.global_board.current_board() is None:
+                    self.global_board.choose_board(board_index)
+                self.global_board.make_move(
+                    'o' if self._sign == 'x' else 'x', spot_index)
+            elif command == 'RESULT':
+                self.result = args[0]
+                return
+            elif command == 'TURN':
+                return
+
+    async def new_game(self, size=3, lock_after_win=False,
+                       choice_after_win=False, sign='x', bot='random'):
+        await self.request(
+            f'NEW {size} {int(lock_after_win)} {int(choice_after_win)} '
+            f'{sign} {bot}')
+        self.global_board = GlobalBoard(
+            size, lock_after_win, choice_after_win)
+        self.result = None
+        self._sign = sign
+        await self.read_moves()
+
+    async def move(self, board_index, spot_index):
+        """Chooses the board if needed and makes the move"""
+        if self.global_board.current_board() is None:
+            await self.request(f'CHOOSE {board_index}')
+            self.global_board.choose_board(board_index)
+        self._writer.write(f'MOVE {spot_index}\n'.encode())
+        await self._writer.drain()
+        self.result = self.global_board.make_move(self._sign, spot_index)
+        await self.read_moves()
+
+    async def random_move(self, rng=random):
+        board_index = self.global_board.current_board() or \
+            rng.choice(self.global_board.possible_boards())
+        spot_index = rng.choice(self.global_board.local_board(
+            board_index).possible_moves(self.global_board._LOCK_AFTER_WIN))
+        await self.move(board_index, spot_index)
+
+    async def close(self):
+        self._writer.write(b'QUIT\n')
+        await self._writer.drain()
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def load_test(host, port, connections, games, size=3, bot='random',
+                    seed=0):
+    """
+    Plays games from many concurrent connections making random moves.
+    Returns list of game results
+    """
+    async def play(client_number):
+        rng = random.Random(seed + client_number)
+        client = await GameClient.connect(host, port)
+        results = []
+        try:
+            for _, sign in zip(range(games), cycle('xo')):
+                await client.new_game(size, sign=sign, bot=bot)
+                while not client.result:
+                    await client.random_move(rng)
+                results.append(client.result)
+        finally:
+            await client.close()
+        return results
+
+    results = await asyncio.gather(*map(play, range(connections)))
+    return [result for client_results in results for result in client_results]
+
+
+async def serve(args):
+    server = GameServer(workers=args.workers, idle_timeout=args.idle_timeout)
+    await server.start(args.host, args.port)
+    print(f'Listening on {args.host}:{server.port()}')
+
+    async def report():
+        while True:
+            await asyncio.sleep(args.report_interval)
+            print(server.summary(), flush=True)
+
+    reporter = asyncio.create_task(report())
+    try:
+        await server.serve_forever()
+    finally:
+        reporter.cancel()
+        await server.close()
+
+
+async def run_load_test(args):
+    server = GameServer(workers=args.workers)
+    await server.start(args.host, 0)
+    start = perf_counter()
+    try:
+        results = await load_test(args.host, server.port(), args.connections,
+                                  args.games, args.size, args.bot)
+    finally:
+        await server.close()
+    print(f'{len(results)} games in {perf_counter() - start:.2f} s')
+    print(server.summary())
+
+
+def main():
+    parser = ArgumentParser(description='Ultimate tic-tac-toe game server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--idle-timeout', type=float)
+    parser.add_argument('--report-interval', type=float, default=10)
+    parser.add_argument('--load-test', action='store_true',
+                        help='play random games against a local server')
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--bot', default='random', choices=list(BOTS))
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_load_test(args) if args.load_test else serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import os
+import random
+from argparse import ArgumentParser
+from collections import namedtuple
+from inspect import signature
+from multiprocessing import Pool
+from time import perf_counter
+
+from ultimate_tic_tac_toe import UltimateTicTacToe
+
+
+class SimulationResult(namedtuple(
+        'SimulationResult', ['wins', 'draws', 'losses', 'time'])):
+    """
+    Outcomes of simulated games from the first player's perspective
+    and time of the simulation in seconds
+    """
+
+    def games(self):
+        return self.wins + self.draws + self.losses
+
+    def games_per_second(self):
+        if not self.time:
+            return 0.0
+        return self.games() / self.time
+
+
+def make_bot(game: UltimateTicTacToe, bot, seed=None):
+    """
+    Returns bot playing the game. Bot can be given as a name
+    of UltimateTicTacToe method (e.g. 'random_bot') or a picklable
+    callable creating bot for the game, e.g. functools.partial(
+    MonteCarloBot, iterations=100). Seed is passed to factories
+    with a seed argument which is None by default
+    """
+    if isinstance(bot, str):
+        return getattr(game, bot)
+    if seed is not None:
+        try:
+            parameter = signature(bot).parameters.get('seed')
+        except (TypeError, ValueError):
+            parameter = None
+        if parameter is not None and parameter.default is None:
+            return bot(game, seed=seed)
+    return bot(game)
+
+
+def play_batch(batch):
+    """
+    Plays a batch of games in a worker process. Bots of every game
+    get seeds drawn from the batch seed, see make_bot().
+    Returns numbers of games won by 'x', won by 'o' and drawn
+    """
+    games, seed, size, lock_after_win, choice_after_win, bot_1, bot_2 = batch
+    # random_bot and always_winning_bot use the random module
+    random.seed(seed)
+    seeds = random.Random(seed)
+
+    x_wins = o_wins = draws = 0
+    for _ in range(games):
+        game = UltimateTicTacToe(size, lock_after_win, choice_after_win)
+        result = game.play(
+            make_bot(game, bot_1, seeds.getrandbits(32)),
+            make_bot(game, bot_2, seeds.getrandbits(32)), verbose=False)
+        if result == 'x':
+            x_wins += 1
+        elif result == 'o':
+            o_wins += 1
+        else:
+            draws += 1
+    return x_wins, o_wins, draws
+
+
+def simulate(games, bot_1='random_bot', bot_2='random_bot', size=3,
+             lock_after_win=False, choice_after_win=False,
+             workers=None, batch_size=100, seed=0):
+    """
+    Plays games between bot_1 (playing 'x') and bot_2 in worker processes.
+    Every batch of games gets its own seed, so results for given seed
+    don't depend on the number of workers.
+    Returns SimulationResult from bot_1's perspective
+    """
+    if games < 0:
+        raise ValueError("Number of games must not be negative")
+    if batch_size <= 0:
+        raise ValueError("Batch size must be positive")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    batches = []
+    for batch_number, first_game in enumerate(range(0, games, batch_size)):
+        batches.append((
+            min(batch_size, games - first_game), seed + batch_number,
+            size, lock_after_win, choice_after_win, bot_1, bot_2
+        ))
+
+    def sum_results(results):
+        wins = losses = draws = 0
+        for x_wins, o_wins, batch_draws in results:
+            wins += x_wins
+            losses += o_wins
+            draws += batch_draws
+        return SimulationResult(wins, draws, losses, perf_counter() - start)
+
+    start = perf_counter()
+    if workers == 1:
+        return sum_results(map(play_batch, batches))
+    with Pool(workers) as pool:
+        return sum_results(pool.imap_unordered(play_batch, batches))
+
+
+def main():
+    parser = ArgumentParser(description='Simulates games between two bots')
+    parser.add_argument('games', type=int)
+    parser.add_argument('--bot-1', default='random_bot')
+    parser.add_argument('--bot-2', default='random_bot')
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--lock-after-win', action='store_true')
+    parser.add_argument('--choice-after-win', action='store_true')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    result = simulate(
+        args.games, args.bot_1, args.bot_2, args.size, args.lock_after_win,
+        args.choice_after_win, args.workers, args.batch_size, args.seed)
+    print(f'wins: {result.wins} draws: {result.draws} '
+          f'losses: {result.losses}')
+    print(f'{result.games_per_second():.1f} games per second')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+from collections import namedtuple
+from functools import lru_cache, reduce
+from operator import xor
+
+from ultimate_tic_tac_toe import GlobalBoard, ZobristKeys, zobrist_keys
+
+
+# rotations and reflections of the square, as functions of
+# (row, column, last index) returning the image of the square
+SYMMETRIES = (
+    lambda row, column, last: (row, column),                # identity
+    lambda row, column, last: (column, last - row),         # rotation 90
+    lambda row, column, last: (last - row, last - column),  # rotation 180
+    lambda row, column, last: (last - column, row),         # rotation 270
+    lambda row, column, last: (row, last - column),         # vertical axis
+    lambda row, column, last: (last - row, column),         # horizontal axis
+    lambda row, column, last: (column, row),                # main diagonal
+    lambda row, column, last: (last - column, last - row),  # anti-diagonal
+)
+SYMMETRIES_COUNT = len(SYMMETRIES)
+
+# symmetry reverting every symmetry
+INVERSE_SYMMETRIES = (0, 3, 2, 1, 4, 5, 6, 7)
+
+
+SymmetryTables = namedtuple('SymmetryTables', ['indexes', 'moves'])
+
+
+@lru_cache(maxsize=None)
+def symmetry_tables(size):
+    """
+    Returns permutations of every symmetry for boards of given size:
+    indexes[symmetry][index] is the image of 0-based index of a spot
+    in a local board (or of a local board in the global board),
+    moves[symmetry][move] is the image of a move encoded with encode_move()
+    """
+    last = size - 1
+    indexes = tuple(
+        tuple(row * size + column for row, column in (
+            symmetry(index // size, index % size, last)
+            for index in range(size ** 2)))
+        for symmetry in SYMMETRIES)
+
+    spots_count = size ** 2
+    moves = tuple(
+        tuple(permutation[move // spots_count] * spots_count +
+              permutation[move % spots_count]
+              for move in range(spots_count ** 2))
+        for permutation in indexes)
+    return SymmetryTables(indexes, moves)
+
+
+@lru_cache(maxsize=None)
+def symmetric_zobrist_keys(size):
+    """
+    Returns zobrist_keys(size) permuted for every symmetry, so hashing
+    a position with keys of a symmetry gives the hash of its image
+    """
+    keys = zobrist_keys(size)
+    tables = symmetry_tables(size)
+    symmetric_keys = []
+    for permutation, moves in zip(tables.indexes, tables.moves):
+        # 0 stands for None
+        index_keys = [0] + [index + 1 for index in permutation]
+        symmetric_keys.append(ZobristKeys(
+            spots={sign: [sign_keys[move] for move in moves]
+                   for sign, sign_keys in keys.spots.items()},
+            previous_spot=[keys.previous_spot[index] for index in index_keys],
+            board_choice=[keys.board_choice[index] for index in index_keys],
+            lock_after_win=keys.lock_after_win,
+            choice_after_win=keys.choice_after_win,
+            last_won=keys.last_won,
+            early_draw=keys.early_draw
+        ))
+    return tuple(symmetric_keys)
+
+
+def transform_index(index, symmetry, size):
+    """Returns image of 1-based index of a spot or a board, None for None"""
+    if index is None:
+        return None
+    return symmetry_tables(size).indexes[symmetry][index - 1] + 1
+
+
+def transform_move(move, symmetry, size):
+    """Returns image of move encoded with encode_move()"""
+    return symmetry_tables(size).moves[symmetry][move]
+
+
+def transform_board(global_board: GlobalBoard, symmetry):
+    """
+    Returns new board of the same class with the position transformed
+    by the symmetry. Local boards and spots in them are moved together,
+    previous spot, previous board and board choice are remapped.
+    History of moves is not copied
+    """
+    size = global_board._SIZE
+    permutation = symmetry_tables(size).indexes[symmetry]
+    transformed = type(global_board)(
+        size, global_board._LOCK_AFTER_WIN, global_board._CHOICE_AFTER_WIN,
+        global_board._EARLY_DRAW)
+    for board, board_image in zip(global_board._local_boards, permutation):
+        spots = size ** 2 * ['']
+        for spot, spot_image in zip(board._spots, permutation):
+            spots[spot_image] = spot
+        image = transformed._local_boards[board_image]
+        image._spots = spots
+        image._win = board._win
+        image._full = board._full
+
+    transformed._previous_spot_idx = transform_index(
+        global_board._previous_spot_idx, symmetry, size)
+    transformed._previous_board_idx = transform_index(
+        global_board._previous_board_idx, symmetry, size)
+    transformed._board_choice = transform_index(
+        global_board._board_choice, symmetry, size)
+    transformed._last_won = global_board._last_won
+    transformed.rebuild_state()
+    return transformed
+
+
+def canonical_hash(global_board: GlobalBoard):
+    """
+    Returns (hash, symmetry): the lowest Zobrist hash of the 8 images
+    of the position and the symmetry giving it. All symmetric positions
+    have the same hash, so it can be used as a transposition table key
+    """
+    size = global_board._SIZE
+    spots_count = size ** 2
+    occupied = {'x': [], 'o': []}
+    for board_number, board in enumerate(global_board._local_boards):
+        for spot_number, spot in enumerate(board._spots,
+                                           board_number * spots_count):
+            if spot:
+                occupied[spot].append(spot_number)
+
+    # rule flags and last move win don't depend on the symmetry
+    keys = zobrist_keys(size)
+    common_hash = 0
+    if global_board._LOCK_AFTER_WIN:
+        common_hash ^= keys.lock_after_win
+    if global_board._CHOICE_AFTER_WIN:
+        common_hash ^= keys.choice_after_win
+    if global_board._EARLY_DRAW:
+        common_hash ^= keys.early_draw
+    if global_board._last_won:
+        common_hash ^= keys.last_won
+
+    previous_spot = global_board._previous_spot_idx or 0
+    board_choice = global_board._board_choice or 0
+    hashes = []
+    for symmetry_keys in symmetric_zobrist_keys(size):
+        position_hash = common_hash ^ \
+            symmetry_keys.previous_spot[previous_spot] ^ \
+            symmetry_keys.board_choice[board_choice]
+        for sign, spots in occupied.items():
+            position_hash = reduce(
+                xor, map(symmetry_keys.spots[sign].__getitem__, spots),
+                position_hash)
+        hashes.append(position_hash)
+    position_hash = min(hashes)
+    return position_hash, hashes.index(position_hash)
+
+
+def canonical_form(global_board: GlobalBoard):
+    """
+    Returns (board, symmetry): the image of the position with the lowest
+    Zobrist hash, the same for all symmetric positions, and the symmetry
+    transforming the position into it
+    """
+    symmetry = canonical_hash(global_board)[1]
+    return transform_board(global_board, symmetry), symmetry
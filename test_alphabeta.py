@@ -0,0 +1,115 @@
+from ultimate_tic_tac_toe import UltimateTicTacToe, GlobalBoard
+from transposition import TranspositionTable
+from mcts import revert_move
+from alphabeta import (
+    AlphaBetaBot,
+    evaluate,
+    result_score,
+    WIN_SCORE
+)
+from itertools import cycle
+from time import perf_counter
+import random
+import pytest
+
+
+def test_evaluate():
+    global_board_1 = GlobalBoard(3, False, False)
+    assert evaluate(global_board_1, 'x') == 0
+
+    global_board_1._win_counts['x'] = [1, 0, 0, 1, 0, 0, 1, 0]
+    assert evaluate(global_board_1, 'x') == 13
+    assert evaluate(global_board_1, 'o') == -13
+
+    global_board_1._win_counts['o'] = [1, 0, 0, 0, 1, 0, 0, 0]
+    assert evaluate(global_board_1, 'x') == 1
+
+
+def test_result_score():
+    assert result_score('x', 'x') == WIN_SCORE
+    assert result_score('o', 'x') == -WIN_SCORE
+    assert result_score('draw', 'o') == 0
+
+
+def test_alpha_beta_bot_constructor():
+    game_1 = UltimateTicTacToe(3, False, False)
+    with pytest.raises(ValueError):
+        AlphaBetaBot(game_1, time_ms=None)
+    with pytest.raises(ValueError):
+        AlphaBetaBot(game_1, time_ms=0)
+    with pytest.raises(ValueError):
+        AlphaBetaBot(game_1, max_depth=0)
+
+
+def winning_moves(global_board, sign):
+    moves = []
+    for move in global_board.legal_moves():
+        if global_board.play(move, sign) == sign:
+            moves.append(move)
+        revert_move(global_board)
+    return moves
+
+
+def test_alpha_beta_bot_finds_winning_move():
+    random.seed(3)
+    found = 0
+    for _ in range(20):
+        game_1 = UltimateTicTacToe(2, False, False)
+        global_board_1 = game_1.global_board()
+        for sign in cycle('xo'):
+            moves = winning_moves(global_board_1, sign)
+            if moves:
+                bot = AlphaBetaBot(game_1, time_ms=None, max_depth=2)
+                assert bot.search(global_board_1, sign) in moves
+                found += 1
+                break
+            if game_1.random_bot(sign):
+                break
+    assert found
+
+
+def test_alpha_beta_bot_search_leaves_board_unchanged():
+    game_1 = UltimateTicTacToe(3, True, False)
+    global_board_1 = game_1.global_board()
+    game_1.random_bot('x')
+    position_hash = global_board_1.zobrist_hash()
+
+    bot = AlphaBetaBot(game_1, time_ms=None, max_depth=3)
+    bot.search(global_board_1, 'o')
+    assert bot.depth == 3
+    assert bot.nodes > 0
+    assert global_board_1.zobrist_hash() == position_hash
+    assert len(global_board_1._history) == 1
+
+
+def test_alpha_beta_bot_is_deterministic():
+    moves = []
+    for _ in range(2):
+        game_1 = UltimateTicTacToe(3, False, False)
+        bot = AlphaBetaBot(game_1, time_ms=None, max_depth=2)
+        moves.append(bot.search(game_1.global_board(), 'x'))
+    assert moves[0] == moves[1]
+
+
+def test_alpha_beta_bot_time_limit():
+    game_1 = UltimateTicTacToe(4, False, False)
+    bot = AlphaBetaBot(game_1, time_ms=50)
+    start = perf_counter()
+    bot('x')
+    # without max_depth only the time limit stops the search, the bound
+    # is loose as timing on busy machines is noisy
+    assert bot.nodes > 0
+    assert perf_counter() - start < 10 * 0.05
+    assert bot.search_time < 10 * 0.05
+
+
+@pytest.mark.parametrize('lock_after_win', [False, True])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_alpha_beta_bot_play(lock_after_win, choice_after_win):
+    random.seed(0)
+    game_1 = UltimateTicTacToe(3, lock_after_win, choice_after_win)
+    table = TranspositionTable(2 ** 12)
+    bot_1 = AlphaBetaBot(game_1, time_ms=None, max_depth=2, table=table)
+    bot_2 = AlphaBetaBot(game_1, time_ms=None, max_depth=1, table=table)
+    assert game_1.play(bot_1, bot_2)
+    assert len(table)
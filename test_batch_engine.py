@@ -0,0 +1,120 @@
+from ultimate_tic_tac_toe import GlobalBoard
+from simulation import simulate
+import pytest
+
+np = pytest.importorskip('numpy')
+from batch_engine import (  # noqa: E402
+    BatchGames,
+    line_spots,
+    random_true_index,
+    EMPTY,
+    X,
+    O,
+    DRAW,
+    SIGNS
+)
+
+
+def test_line_spots():
+    lines = line_spots(3).tolist()
+    assert len(lines) == 8
+    assert [0, 1, 2] in lines
+    assert [1, 4, 7] in lines
+    assert [0, 4, 8] in lines
+    assert [2, 4, 6] in lines
+
+
+def test_random_true_index():
+    rng = np.random.default_rng(0)
+    mask = np.array([[False, True, False], [True, True, True]])
+    indexes = {(row, index) for _ in range(50)
+               for row, index in enumerate(random_true_index(rng, mask))}
+    assert indexes == {(0, 1), (1, 0), (1, 1), (1, 2)}
+
+
+def test_batch_games_constructor():
+    batch = BatchGames(4, 3, False, False)
+    assert batch.spots.shape == (4, 9, 9)
+    assert batch.local_wins.shape == (4, 9)
+    assert (batch.previous_spot == -1).all()
+    assert (batch.to_move == X).all()
+    assert batch.legal_moves().all()
+
+    with pytest.raises(ValueError):
+        BatchGames(0, 3, False, False)
+    with pytest.raises(ValueError):
+        BatchGames(4, 1, False, False)
+
+
+def test_batch_games_make_moves():
+    batch = BatchGames(2, 3, False, False)
+    games = np.array([0, 1])
+    batch.make_moves(games, np.array([0, 4]), np.array([4, 2]))
+    assert batch.spots[0, 0, 4] == X
+    assert batch.spots[1, 4, 2] == X
+    assert (batch.to_move == O).all()
+
+    # forced boards
+    possible_boards = batch.possible_boards()
+    assert np.flatnonzero(possible_boards[0]).tolist() == [4]
+    assert np.flatnonzero(possible_boards[1]).tolist() == [2]
+
+    # winning local board
+    batch.spots[0, 4, :2] = O
+    batch.make_moves(np.array([0]), np.array([4]), np.array([2]))
+    assert batch.local_wins[0, 4] == O
+    assert batch.last_won[0]
+    assert not batch.last_won[1]
+
+
+def replay(moves, game, size, lock_after_win, choice_after_win):
+    """Replays moves of one batch game on GlobalBoard. Returns the result"""
+    global_board = GlobalBoard(size, lock_after_win, choice_after_win)
+    result = None
+    for games, boards, spots, signs in moves:
+        position = np.flatnonzero(games == game)
+        if not len(position):
+            continue
+        board_index = int(boards[position[0]]) + 1
+        if global_board.current_board() is None:
+            global_board.choose_board(board_index)
+        assert global_board.current_board() in (None, board_index)
+        result = global_board.make_move(
+            SIGNS[signs[position[0]]], int(spots[position[0]]) + 1)
+    return result
+
+
+@pytest.mark.parametrize('size', [2, 3])
+@pytest.mark.parametrize('lock_after_win', [False, True])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_batch_games_match_global_board(
+        size, lock_after_win, choice_after_win):
+    rng = np.random.default_rng(size)
+    batch = BatchGames(20, size, lock_after_win, choice_after_win)
+    moves = []
+    while (batch.results == EMPTY).any():
+        games = np.flatnonzero(batch.results == EMPTY)
+        boards = random_true_index(rng, batch.possible_boards()[games])
+        spots = random_true_index(rng, batch.spots[games, boards] == EMPTY)
+        moves.append((games, boards, spots, batch.to_move[games].copy()))
+        batch.make_moves(games, boards, spots)
+
+    for game, result in enumerate(batch.results):
+        expected = {X: 'x', O: 'o', DRAW: 'draw'}[result]
+        assert replay(moves, game, size,
+                      lock_after_win, choice_after_win) == expected
+
+
+def test_batch_games_play_random_matches_random_bot():
+    games = 2000
+    batch = BatchGames(games, 3, False, False)
+    batch.play_random(np.random.default_rng(0))
+    assert sum(batch.result_counts()) == games
+
+    result = simulate(games, size=3, workers=1)
+    expected = (result.wins, result.losses, result.draws)
+    for count, expected_count in zip(batch.result_counts(), expected):
+        # 4 standard deviations of a binomial count
+        p = expected_count / games
+        assert abs(count - expected_count) <= \
+            4 * (2 * games * p * (1 - p)) ** 0.5
@@ -0,0 +1,72 @@
+from benchmark import (
+    BENCHMARKS,
+    ScanGlobalBoard,
+    random_game,
+    replay,
+    midgame_board,
+    bench_local_win_check,
+    run_suite,
+    compare_to_baseline,
+    confirm_regressions,
+    save_baseline,
+    load_baseline
+)
+from ultimate_tic_tac_toe import GlobalBoard
+import pytest
+
+
+@pytest.mark.parametrize('lock_after_win', [False, True])
+def test_scan_global_board_matches_global_board(lock_after_win):
+    moves = random_game(3, lock_after_win, False, seed=0)
+    assert replay(ScanGlobalBoard, 3, lock_after_win, False, moves) == \
+        replay(GlobalBoard, 3, lock_after_win, False, moves)
+
+
+def test_midgame_board():
+    moves = random_game(3, False, False, seed=0)
+    global_board_1 = midgame_board(3, False, False, seed=0)
+    assert len(global_board_1._history) == len(moves) // 2
+    assert global_board_1.global_win_check() is None
+
+
+@pytest.mark.parametrize('size', [2, 3, 4, 5])
+def test_bench_local_win_check(size):
+    function, _ = bench_local_win_check(size, False, False)
+    assert function() is None
+
+
+def test_run_suite():
+    results = run_suite([2], list(BENCHMARKS), repeat=1, min_time=0.001)
+    assert len(results) == 2 + 4 * 4
+    assert 'GlobalBoard.__str__|2|1|0' in results
+    assert 'LocalBoard.make_move|2|0|0' in results
+    assert all(time > 0 for time in results.values())
+
+
+def test_compare_to_baseline():
+    baseline = {'a|2|0|0': 1.0, 'b|2|0|0': 1.0}
+    results = {'a|2|0|0': 1.2, 'b|2|0|0': 1.5, 'c|2|0|0': 9.0}
+    assert compare_to_baseline(results, baseline) == [('b|2|0|0', 1.0, 1.5)]
+    assert compare_to_baseline(results, baseline, 1.1) == [
+        ('a|2|0|0', 1.0, 1.2), ('b|2|0|0', 1.0, 1.5)]
+
+
+def test_confirm_regressions():
+    key = 'LocalBoard.make_move|2|0|0'
+    results = {key: 1.0}
+    assert confirm_regressions(
+        results, {key: 0.0}, reruns=1, repeat=1, min_time=0.001) == \
+        [(key, 0.0, results[key])]
+    # the best time of the rerun is kept
+    assert results[key] < 1.0
+
+    results = {key: 1.0}
+    assert not confirm_regressions(
+        results, {key: 0.5}, reruns=1, repeat=1, min_time=0.001)
+    assert results[key] < 1.0
+
+
+def test_save_load_baseline(tmp_path):
+    path = tmp_path / 'baseline.json'
+    save_baseline({'a|2|0|0': 1.5}, path)
+    assert load_baseline(path) == {'a|2|0|0': 1.5}
@@ -0,0 +1,230 @@
+from ultimate_tic_tac_toe import (
+    LocalBoard,
+    GlobalBoard,
+    UltimateTicTacToe,
+    SpotOccupiedError
+)
+from bitboard import (
+    BitLocalBoard,
+    BitGlobalBoard,
+    line_masks,
+    mask_indexes
+)
+from alphabeta import evaluate
+from itertools import cycle
+from copy import deepcopy
+import random
+import pytest
+
+
+def test_line_masks():
+    lines, spot_lines, full_mask = line_masks(3)
+    assert len(lines) == 8
+    assert 0b000000111 in lines
+    assert 0b001001001 in lines
+    assert 0b100010001 in lines
+    assert 0b001010100 in lines
+    assert len(spot_lines[4]) == 4
+    assert len(spot_lines[1]) == 2
+    assert full_mask == 0b111111111
+
+
+def test_mask_indexes():
+    assert mask_indexes(0) == []
+    assert mask_indexes(0b1011) == [1, 2, 4]
+
+
+def test_bit_local_board_spots():
+    local_board_1 = BitLocalBoard(3)
+    assert local_board_1._spots == 9 * ['']
+
+    local_board_1._spots = ['x', '', 'o'] + 6 * ['']
+    assert local_board_1.spot(1) == 'x'
+    assert local_board_1.spot(3) == 'o'
+    assert local_board_1.possible_moves(False) == [2, 4, 5, 6, 7, 8, 9]
+
+    local_board_1.set_spot(1, 'o')
+    assert local_board_1._spots == ['o', '', 'o'] + 6 * ['']
+    local_board_2 = LocalBoard(3)
+    local_board_2._spots = ['o', '', 'o'] + 6 * ['']
+    assert local_board_1 == local_board_2
+    with pytest.raises(IndexError):
+        local_board_1.spot(10)
+    with pytest.raises(ValueError):
+        local_board_1.set_spot(2, 'z')
+
+
+def test_bit_local_board_make_move():
+    local_board_1 = BitLocalBoard(4)
+    assert not local_board_1.make_move(1, 'x')
+
+    local_board_1._spots = ['', 'x', 'x', 'x'] + 12 * ['']
+    assert local_board_1.make_move(1, 'x') == 'x'
+    assert local_board_1.win() == 'x'
+
+    with pytest.raises(IndexError):
+        local_board_1.make_move(0, 'x')
+    with pytest.raises(ValueError):
+        local_board_1.make_move(3, 'z')
+    with pytest.raises(SpotOccupiedError):
+        local_board_1.make_move(1, 'x')
+
+
+def test_bit_local_board_local_win_check():
+    local_board_1 = BitLocalBoard(3)
+    assert local_board_1.local_win_check() is None
+
+    local_board_1._spots = ['x', '', '', '', 'x', '', 'o', 'o', 'o']
+    assert local_board_1.local_win_check() == 'o'
+
+    local_board_2 = BitLocalBoard(5)
+    local_board_2._spots = 5 * (4 * [''] + ['x'])
+    assert local_board_2.local_win_check() == 'x'
+
+
+def test_bit_local_board_full_check():
+    local_board_1 = BitLocalBoard(3)
+    local_board_1._spots = ['x', 'x', 'o', 'o', 'o', 'x', 'x', 'o', '']
+    assert not local_board_1.full_check()
+    local_board_1._spots = ['x', 'x', 'o', 'o', 'o', 'x', 'x', 'o', 'x']
+    assert local_board_1.full_check()
+
+
+def random_move(global_board, rng):
+    board_index = global_board.current_board()
+    if board_index is None:
+        board_index = rng.choice(global_board.possible_boards())
+        global_board.choose_board(board_index)
+    spots = global_board.local_board(board_index).possible_moves(
+        global_board._LOCK_AFTER_WIN)
+    return rng.choice(spots)
+
+
+@pytest.mark.parametrize('size', [2, 3, 4])
+@pytest.mark.parametrize('lock_after_win', [False, True])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_bit_global_board_matches_global_board(
+        size, lock_after_win, choice_after_win):
+    rng = random.Random(size)
+    for _ in range(5):
+        list_board = GlobalBoard(size, lock_after_win, choice_after_win)
+        bit_board = BitGlobalBoard(size, lock_after_win, choice_after_win)
+        for sign in cycle('xo'):
+            spot_index = random_move(list_board, rng)
+            if list_board._board_choice:
+                bit_board.choose_board(list_board._board_choice)
+            assert list_board.possible_boards() == \
+                bit_board.possible_boards()
+
+            result = list_board.make_move(sign, spot_index)
+            assert bit_board.make_move(sign, spot_index) == result
+            assert list_board == bit_board
+            assert list_board.local_board(1).row_strs(':') == \
+                bit_board.local_board(1).row_strs(':')
+            assert list_board.local_board(1).line_counts() == \
+                bit_board.local_board(1).line_counts()
+            if result:
+                break
+        assert str(list_board) == str(bit_board)
+
+
+def test_bit_global_board_unmake_move():
+    rng = random.Random(0)
+    bit_board = BitGlobalBoard(3, True, False)
+    states = []
+    for sign in cycle('xo'):
+        spot_index = random_move(bit_board, rng)
+        states.append(deepcopy(bit_board))
+        if bit_board.make_move(sign, spot_index):
+            break
+
+    for state in reversed(states):
+        bit_board.unmake_move()
+        assert bit_board == state
+        assert bit_board._won_masks == state._won_masks
+        assert bit_board._full_mask == state._full_mask
+
+
+@pytest.mark.parametrize('size', [2, 3, 4])
+def test_bit_global_board_play_unchecked(size):
+    rng = random.Random(size)
+    list_board = GlobalBoard(size, True, False)
+    bit_board = BitGlobalBoard(size, True, False)
+    for sign in cycle('xo'):
+        move = rng.choice(list_board.legal_moves())
+        result = list_board.play(move, sign)
+        assert bit_board.play_unchecked(move, sign) == result
+        assert list_board == bit_board
+        assert bit_board.zobrist_hash() == bit_board.compute_hash()
+        if result:
+            break
+
+    while bit_board.moves():
+        bit_board.unmake_move()
+    assert bit_board == BitGlobalBoard(size, True, False)
+    assert bit_board._won_masks == {'x': 0, 'o': 0}
+    assert not bit_board._full_mask
+
+
+@pytest.mark.parametrize('size', [2, 3, 4])
+@pytest.mark.parametrize('lock_after_win', [False, True])
+def test_bit_global_board_win_counts(size, lock_after_win):
+    rng = random.Random(size)
+    list_board = GlobalBoard(size, lock_after_win, False)
+    bit_board = BitGlobalBoard(size, lock_after_win, False)
+
+    def assert_same_counts():
+        assert bit_board.win_counts() == list_board.win_counts()
+        for sign in 'xo':
+            assert evaluate(bit_board, sign) == evaluate(list_board, sign)
+
+    for sign in cycle('xo'):
+        move = rng.choice(list_board.legal_moves())
+        result = list_board.play(move, sign)
+        bit_board.play(move, sign)
+        assert_same_counts()
+        if result:
+            break
+
+    while bit_board.moves():
+        bit_board.unmake_move()
+        list_board.unmake_move()
+        assert_same_counts()
+    assert bit_board.win_counts() == \
+        {'x': [0] * (2 * size + 2), 'o': [0] * (2 * size + 2)}
+
+
+def test_ultimate_tic_tac_toe_bitboard():
+    game_1 = UltimateTicTacToe(3, False, False, BitGlobalBoard)
+    assert isinstance(game_1.global_board(), BitGlobalBoard)
+    assert game_1.play(game_1.always_winning_bot, game_1.random_bot) == 'x'
+
+    game_2 = UltimateTicTacToe(4, True, True, BitGlobalBoard)
+    assert game_2.play(game_2.random_bot, game_2.random_bot)
+
+
+def test_bit_global_board_early_draw():
+    rng = random.Random(0)
+    for _ in range(20):
+        game_1 = UltimateTicTacToe(3, False, False, BitGlobalBoard, True)
+        bit_board = game_1.global_board()
+        list_board = GlobalBoard(3, False, False, True)
+        for sign in cycle('xo'):
+            move = rng.choice(list_board.legal_moves())
+            result = list_board.play(move, sign)
+            assert bit_board.play(move, sign) == result
+            assert bit_board.global_win_check() == result
+            if result:
+                break
+
+
+def test_bit_boards_without_instance_dict():
+    global_board_1 = BitGlobalBoard(3, False, False)
+    assert not hasattr(global_board_1, '__dict__')
+    assert not hasattr(global_board_1.local_board(1), '__dict__')
+
+    # list view of the spots isn't counted twice
+    footprint = global_board_1.memory_footprint()
+    assert footprint['_won_masks'] > 0
+    assert footprint['total'] < GlobalBoard(3, False, False).memory_footprint(
+        )['total'] * 2
@@ -0,0 +1,94 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from alphabeta import AlphaBetaBot, evaluate  # noqa: E402
+from evaluation import (  # noqa: E402
+    FEATURES,
+    Evaluator,
+    HeuristicEvaluator,
+    LinearEvaluator,
+    batch_evaluation_features,
+    evaluation_features
+)
+from serialization import decode_states, encode_states  # noqa: E402
+from ultimate_tic_tac_toe import GlobalBoard, UltimateTicTacToe  # noqa: E402
+
+
+def test_evaluation_features():
+    global_board = GlobalBoard(3, False, False)
+    assert evaluation_features(global_board, 'x') == [0, 0, 0]
+
+    global_board.local_board(1)._spots = ['x', 'x', ''] + 6 * ['']
+    global_board.local_board(2)._spots = ['o', 'o', 'o'] + 6 * ['']
+    global_board.local_board(2)._win = 'o'
+    global_board.local_board(3)._spots = ['x', '', ''] + 6 * ['']
+    global_board.rebuild_state()
+    assert evaluation_features(global_board, 'x') == [-1, 1, -2]
+    assert evaluation_features(global_board, 'o') == [1, -1, 2]
+
+
+@pytest.mark.parametrize('size', [2, 3, 4])
+@pytest.mark.parametrize('lock_after_win', [False, True])
+def test_batch_evaluation_features(size, lock_after_win, game_boards):
+    boards = game_boards(size, lock_after_win, False, size)
+    decoded = decode_states(encode_states(boards), size)
+    for sign in 'xo':
+        features = batch_evaluation_features(decoded, size, sign)
+        assert features.shape == (len(boards), len(FEATURES))
+        assert features.tolist() == [
+            evaluation_features(global_board, sign)
+            for global_board in boards]
+
+
+def test_linear_evaluator(game_boards):
+    with pytest.raises(ValueError):
+        LinearEvaluator((1, 2))
+
+    # alphabeta.evaluate() is a linear evaluator without near wins
+    evaluator = LinearEvaluator((10, 0, 1))
+    boards = game_boards(3, False, False)
+    scores = evaluator.score_boards(boards, 'o')
+    assert scores.tolist() == [evaluate(board, 'o') for board in boards]
+    assert [evaluator(board, 'o') for board in boards] == scores.tolist()
+    assert evaluator.score_boards([], 'x').tolist() == []
+
+    heuristic = HeuristicEvaluator()
+    assert isinstance(heuristic, Evaluator)
+    with pytest.raises(TypeError):
+        Evaluator()
+    assert heuristic.score_states(encode_states(boards), 3, 'x').tolist() == \
+        [heuristic(board, 'x') for board in boards]
+
+
+def test_linear_evaluator_fit(game_boards):
+    boards = [board for seed in range(5)
+              for board in game_boards(3, False, False, seed)]
+    data = encode_states(boards)
+    targets = HeuristicEvaluator().score_states(data, 3, 'x') + 0.5
+    evaluator = LinearEvaluator.fit(data, 3, 'x', targets)
+    assert np.allclose(evaluator.weights, (10, 2, 1))
+    assert evaluator.bias == pytest.approx(0.5)
+
+    with pytest.raises(ValueError):
+        LinearEvaluator.fit(data, 3, 'x', targets[1:])
+
+
+def test_alpha_beta_bot_batch_leaves(game_boards):
+    game = UltimateTicTacToe(3, False, False)
+    with pytest.raises(ValueError):
+        AlphaBetaBot(game, batch_leaves=True)
+
+    # x is to move after 20 moves
+    global_board = game_boards(3, False, False, 1)[20]
+    sign = 'x'
+    scalar_bot = AlphaBetaBot(game, time_ms=None, max_depth=3,
+                              evaluate=HeuristicEvaluator())
+    batch_bot = AlphaBetaBot(game, time_ms=None, max_depth=3,
+                             evaluate=HeuristicEvaluator(),
+                             batch_leaves=True)
+    position_hash = global_board.zobrist_hash()
+    assert batch_bot.search(global_board, sign) == \
+        scalar_bot.search(global_board, sign)
+    assert global_board.zobrist_hash() == position_hash
+    assert batch_bot.nodes > 0
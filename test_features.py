@@ -0,0 +1,85 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from features import (  # noqa: E402
+    PLANES,
+    board_features,
+    feature_batches,
+    planes_shape,
+    state_features
+)
+from serialization import encode_states  # noqa: E402
+from ultimate_tic_tac_toe import GlobalBoard  # noqa: E402
+
+
+def expected_planes(global_board: GlobalBoard):
+    """Returns feature planes built one spot at a time"""
+    size = global_board._SIZE
+    planes = np.zeros(planes_shape(1, size)[1:])
+    board_index = global_board._board_choice or global_board.current_board()
+    legal = [board_index] if board_index else global_board.possible_boards()
+    signs = ''.join(board._spots[spot] for board in global_board._local_boards
+                    for spot in range(size ** 2))
+    for board_index in range(1, size ** 2 + 1):
+        board = global_board.local_board(board_index)
+        board_row, board_column = divmod(board_index - 1, size)
+        for spot_index in range(1, size ** 2 + 1):
+            spot_row, spot_column = divmod(spot_index - 1, size)
+            cell = (board_row * size + spot_row,
+                    board_column * size + spot_column)
+            planes[(0, *cell)] = board.spot(spot_index) == 'x'
+            planes[(1, *cell)] = board.spot(spot_index) == 'o'
+            planes[(2, *cell)] = board.win() == 'x'
+            planes[(3, *cell)] = board.win() == 'o'
+            planes[(4, *cell)] = board._full
+            planes[(5, *cell)] = board_index in legal
+            planes[(6, *cell)] = signs.count('x') <= signs.count('o')
+    return planes
+
+
+def test_planes_shape():
+    assert planes_shape(10, 3) == (10, len(PLANES), 9, 9)
+
+
+@pytest.mark.parametrize('size', [2, 3])
+@pytest.mark.parametrize('lock_after_win', [False, True])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_board_features(size, lock_after_win, choice_after_win, game_boards):
+    boards = game_boards(size, lock_after_win, choice_after_win, size,
+                         board_choices=True)
+    planes = board_features(boards)
+    assert planes.shape == planes_shape(len(boards), size)
+    assert planes.dtype == np.float32
+    for global_board, board_planes in zip(boards, planes):
+        assert (board_planes == expected_planes(global_board)).all()
+
+
+def test_state_features_out(game_boards):
+    boards = game_boards(3, True, False, board_choices=True)
+    out = np.zeros(planes_shape(len(boards), 3), dtype=np.uint8)
+    assert state_features(encode_states(boards), 3, out) is out
+    assert (out == board_features(boards)).all()
+
+    with pytest.raises(ValueError):
+        state_features(encode_states(boards), 3, out[1:])
+    with pytest.raises(ValueError):
+        state_features(encode_states(boards[:2]), 3,
+                       np.zeros((2, 7, 9, 18))[..., ::2])
+    with pytest.raises(ValueError):
+        board_features([])
+
+
+def test_feature_batches(game_boards):
+    boards = game_boards(3, False, True, 1, board_choices=True)
+    data = encode_states(boards)
+    batches = [batch.copy() for batch in feature_batches(data, 3, 16)]
+    assert [len(batch) for batch in batches] == \
+        [16] * (len(boards) // 16) + [len(boards) % 16] * bool(
+            len(boards) % 16)
+    assert (np.concatenate(batches) == state_features(data, 3)).all()
+
+    with pytest.raises(ValueError):
+        list(feature_batches(data, 3, 0))
+    with pytest.raises(ValueError):
+        list(feature_batches(data[1:], 3, 16))
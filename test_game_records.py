@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from bitboard import BitGlobalBoard
+from game_records import (
+    FILE_HEADER,
+    GameRecordReader,
+    GameRecordWriter
+)
+from ultimate_tic_tac_toe import UltimateTicTacToe
+
+
+def play_games(path, games, size=3, lock_after_win=False,
+               choice_after_win=False, early_draw=False):
+    """Plays random games writing them to the log. Returns final boards"""
+    random.seed(games)
+    boards = []
+    with GameRecordWriter(path) as writer:
+        for _ in range(games):
+            game = UltimateTicTacToe(size, lock_after_win, choice_after_win,
+                                     early_draw=early_draw)
+            result = game.play(game.random_bot, game.random_bot,
+                               verbose=False, recorder=writer)
+            boards.append((game.global_board(), result))
+    return boards
+
+
+def test_empty_log(tmp_path):
+    path = tmp_path / 'games.log'
+    GameRecordWriter(path).close()
+    assert path.read_bytes() == FILE_HEADER
+    with GameRecordReader(path) as reader:
+        assert list(reader) == []
+
+
+def test_not_a_log(tmp_path):
+    path = tmp_path / 'games.log'
+    path.write_bytes(b'not a game log at all')
+    with pytest.raises(ValueError):
+        GameRecordReader(path)
+
+
+@pytest.mark.parametrize('size', [2, 3])
+@pytest.mark.parametrize('lock_after_win', [False, True])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_write_read(tmp_path, size, lock_after_win, choice_after_win):
+    path = tmp_path / 'games.log'
+    boards = play_games(path, 5, size, lock_after_win, choice_after_win)
+    with GameRecordReader(path) as reader:
+        records = list(reader)
+        assert len(records) == len(boards)
+        for record, (global_board, result) in zip(records, boards):
+            assert record.size == size
+            assert record.lock_after_win == lock_after_win
+            assert record.choice_after_win == choice_after_win
+            assert record.result == result
+            assert record.moves() == global_board.moves()
+            assert record.moves_count == len(global_board.moves())
+            assert record.replay() == global_board
+
+
+def test_write_read_early_draw(tmp_path):
+    path = tmp_path / 'games.log'
+    boards = play_games(path, 40, early_draw=True)
+    with GameRecordReader(path) as reader:
+        records = list(reader)
+        assert all(record.early_draw for record in records)
+        for record, (global_board, result) in zip(records, boards):
+            replayed = record.replay()
+            assert replayed == global_board
+            assert replayed.global_win_check() == record.result == result
+
+    # games ended early are recorded too
+    assert any(global_board.possible_boards() and result == 'draw'
+               for global_board, result in boards)
+
+
+def test_append(tmp_path):
+    path = tmp_path / 'games.log'
+    boards = play_games(path, 3) + play_games(path, 4)
+    with GameRecordReader(path) as reader:
+        assert [board for board in reader.boards()] == \
+            [board for board, _ in boards]
+
+
+def test_filter_and_board_class(tmp_path):
+    path = tmp_path / 'games.log'
+    boards = play_games(path, 20)
+    x_boards = [board for board, result in boards if result == 'x']
+    with GameRecordReader(path) as reader:
+        replayed = list(reader.boards(
+            lambda record: record.result == 'x', BitGlobalBoard))
+    assert replayed == x_boards
+    assert all(isinstance(board, BitGlobalBoard) for board in replayed)
+
+
+def test_truncated_log(tmp_path):
+    path = tmp_path / 'games.log'
+    boards = play_games(path, 3)
+    path.write_bytes(path.read_bytes()[:-1])
+    with GameRecordReader(path) as reader:
+        assert [record.result for record in reader] == \
+            [result for _, result in boards[:2]]
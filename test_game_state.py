@@ -0,0 +1,152 @@
+import random
+from itertools import cycle
+
+import pytest
+
+from bitboard import BitGlobalBoard
+from game_state import GameState, LocalState, local_lines
+from ultimate_tic_tac_toe import (
+    GlobalBoard,
+    BoardChoiceError,
+    BoardLockedError,
+    SpotOccupiedError
+)
+
+
+def test_local_lines():
+    assert local_lines(3)[0] == ((0, 1, 2), (0, 3, 6), (0, 4, 8))
+    assert local_lines(3)[1] == ((0, 1, 2), (1, 4, 7))
+    assert local_lines(2)[1] == ((0, 1), (1, 3), (1, 2))
+
+
+def test_local_state():
+    local_state = LocalState(('x', '', 'o', ''), 'x', False)
+    assert local_state.possible_moves(False) == [2, 4]
+    assert local_state.possible_moves(True) == []
+    assert not LocalState(4 * ('x',), None, True).if_move_possible(False)
+
+
+def test_initial_state():
+    state = GameState.initial(3, False, False)
+    assert state.to_move == 'x'
+    assert state.result is None
+    assert state.current_board() is None
+    assert len(state.legal_moves()) == 81
+    assert state == GameState.from_global_board(GlobalBoard(3, False, False))
+    assert state.zobrist == GlobalBoard(3, False, False).zobrist_hash()
+
+    # all local boards are the same object
+    assert all(board is state.boards[0] for board in state.boards)
+
+
+def test_play_shares_boards():
+    state_1 = GameState.initial(3, False, False)
+    state_2 = state_1.play(5, 1)
+    assert state_1 == GameState.initial(3, False, False)
+    assert state_2.to_move == 'o'
+    assert state_2.local_board(5).spots[0] == 'x'
+    assert state_2.current_board() == 1
+    for index in range(9):
+        if index != 4:
+            assert state_2.boards[index] is state_1.boards[index]
+
+
+def test_play_errors():
+    state = GameState.initial(3, True, False).play(5, 1)
+    with pytest.raises(BoardChoiceError):
+        state.play(2, 1)
+    with pytest.raises(IndexError):
+        state.play(1, 10)
+    with pytest.raises(IndexError):
+        state.play(0, 1)
+    state = state.play(1, 5)
+    with pytest.raises(SpotOccupiedError):
+        state.play(5, 1)
+
+    # board won with lock_after_win
+    for board_index, spot_index in [(5, 2), (2, 5), (5, 3)]:
+        state = state.play(board_index, spot_index)
+    assert state.local_board(5).win == 'x'
+    assert state.last_won == 'x'
+    state = state.play(3, 5)
+    assert state.current_board() is None
+    with pytest.raises(BoardLockedError):
+        state.play(5, 4)
+
+
+def play_random_game(size, lock_after_win, choice_after_win, seed,
+                     early_draw=False):
+    """Plays the same random moves on GameState and GlobalBoard"""
+    rng = random.Random(seed)
+    global_board = GlobalBoard(size, lock_after_win, choice_after_win,
+                               early_draw)
+    state = GameState.initial(size, lock_after_win, choice_after_win,
+                              early_draw)
+    states = [state]
+    for sign in cycle('xo'):
+        moves = state.legal_moves()
+        board_index, spot_index = rng.choice(moves)
+        if global_board.current_board() is None:
+            global_board.choose_board(board_index)
+        else:
+            assert {move[0] for move in moves} == \
+                {global_board.current_board()}
+        result = global_board.make_move(sign, spot_index)
+        state = state.play(board_index, spot_index)
+        states.append(state)
+        assert state.result == result
+        assert state.zobrist == global_board.zobrist_hash()
+        assert state == GameState.from_global_board(global_board, result)
+        if result:
+            return global_board, states
+
+
+@pytest.mark.parametrize('size', [2, 3])
+@pytest.mark.parametrize('lock_after_win', [False, True])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_state_matches_global_board(size, lock_after_win, choice_after_win):
+    for seed in range(3):
+        global_board, states = play_random_game(
+            size, lock_after_win, choice_after_win, seed)
+        final_state = states[-1]
+        assert final_state.legal_moves() == []
+        with pytest.raises(ValueError):
+            final_state.play(1, 1)
+        assert final_state.to_global_board() == global_board
+
+        # earlier states are unchanged
+        assert states[0] == GameState.initial(
+            size, lock_after_win, choice_after_win)
+
+
+@pytest.mark.parametrize('lock_after_win', [False, True])
+def test_state_matches_global_board_early_draw(lock_after_win):
+    early_draws = 0
+    for seed in range(30):
+        global_board, states = play_random_game(
+            3, lock_after_win, False, seed, early_draw=True)
+        assert all(state.early_draw for state in states)
+        final_state = states[-1]
+        assert final_state.to_global_board() == global_board
+        assert final_state.to_global_board().global_win_check() == \
+            final_state.result
+        early_draws += bool(final_state.result == 'draw' and
+                            global_board.possible_boards())
+    assert early_draws
+
+    # the rule is a part of the position
+    assert GameState.initial(3, False, False, True) != \
+        GameState.initial(3, False, False)
+    assert hash(GameState.initial(3, False, False, True)) == \
+        hash(GlobalBoard(3, False, False, True))
+
+
+def test_to_global_board():
+    _, states = play_random_game(3, True, True, 1)
+    state = states[len(states) // 2]
+    global_board = state.to_global_board(BitGlobalBoard)
+    assert isinstance(global_board, BitGlobalBoard)
+    assert global_board.zobrist_hash() == state.zobrist
+    assert hash(global_board) == hash(state)
+    assert GameState.from_global_board(global_board) == state
+    assert {state: 1}[GameState.from_global_board(global_board)] == 1
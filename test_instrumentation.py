@@ -0,0 +1,96 @@
+from ultimate_tic_tac_toe import UltimateTicTacToe, GlobalBoard
+from bitboard import BitGlobalBoard
+from alphabeta import AlphaBetaBot
+from instrumentation import (
+    GameStats,
+    PlayerStats,
+    player_name,
+    reported_nodes
+)
+import io
+import json
+import pytest
+
+
+def test_player_stats():
+    player_stats = PlayerStats()
+    assert player_stats.mean_time() == 0.0
+    player_stats.moves = 2
+    player_stats.total_time = 3.0
+    assert player_stats.mean_time() == 1.5
+    assert player_stats.as_dict()['mean_time'] == 1.5
+
+
+def test_player_name():
+    game_1 = UltimateTicTacToe(3, False, False)
+    assert player_name(game_1.random_bot, 'x') == 'x:random_bot'
+    bot = AlphaBetaBot(game_1, max_depth=1)
+    assert player_name(bot, 'o') == 'o:AlphaBetaBot'
+
+
+def test_reported_nodes():
+    game_1 = UltimateTicTacToe(3, False, False)
+    assert reported_nodes(game_1.random_bot) is None
+    bot = AlphaBetaBot(game_1, max_depth=1)
+    bot.nodes = 12
+    assert reported_nodes(bot) == 12
+
+
+def test_game_stats_record_move():
+    game_1 = UltimateTicTacToe(3, False, False)
+    stats = GameStats()
+    stats.record_move(game_1.random_bot, 'x', 0.5)
+    stats.record_move(game_1.random_bot, 'x', 1.5)
+    player_stats = stats.players['x:random_bot']
+    assert player_stats.moves == 2
+    assert player_stats.total_time == 2.0
+    assert player_stats.max_time == 1.5
+
+
+def test_game_stats_dump():
+    dump_file = io.StringIO()
+    stats = GameStats(dump_interval=0, dump_file=dump_file)
+    stats.count('make_move')
+    stats.maybe_dump()
+    stats.maybe_dump()
+    lines = dump_file.getvalue().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0]) == {
+        'players': {}, 'calls': {'make_move': 1}}
+
+    # dumping disabled
+    dump_file = io.StringIO()
+    GameStats(dump_file=dump_file).maybe_dump()
+    assert not dump_file.getvalue()
+
+
+@pytest.mark.parametrize('board_class', [GlobalBoard, BitGlobalBoard])
+def test_ultimate_tic_tac_toe_play_stats(board_class):
+    game_1 = UltimateTicTacToe(3, False, False, board_class)
+    bot = AlphaBetaBot(game_1, time_ms=None, max_depth=1)
+    stats = GameStats()
+    game_1.play(bot, game_1.random_bot, verbose=False, stats=stats)
+
+    x_stats = stats.players['x:AlphaBetaBot']
+    o_stats = stats.players['o:random_bot']
+    assert x_stats.moves - o_stats.moves in (0, 1)
+    assert x_stats.nodes > 0
+    assert not o_stats.nodes
+    assert x_stats.total_time > 0
+
+    # moves tried by the search are counted too
+    assert stats.calls['make_move'] > x_stats.moves + o_stats.moves
+    assert stats.calls['move_win_check'] == stats.calls['make_move']
+    assert stats.calls['possible_moves'] > 0
+    assert stats.calls['possible_boards'] > 0
+
+
+def test_global_board_disable_stats():
+    global_board_1 = GlobalBoard(3, False, False)
+    stats = GameStats()
+    global_board_1.enable_stats(stats)
+    global_board_1.possible_boards()
+    global_board_1.disable_stats()
+    global_board_1.possible_boards()
+    assert stats.calls['possible_boards'] == 1
+    assert not hasattr(global_board_1.local_board(1), '_stats')
@@ -0,0 +1,89 @@
+from ultimate_tic_tac_toe import UltimateTicTacToe, GlobalBoard
+from mcts import (
+    MonteCarloBot,
+    revert_move,
+    other_sign
+)
+import random
+import pytest
+
+
+def test_other_sign():
+    assert other_sign('x') == 'o'
+    assert other_sign('o') == 'x'
+
+
+def test_revert_move():
+    global_board_1 = GlobalBoard(2, False, False)
+    global_board_1.play(2, 'x')
+    revert_move(global_board_1)
+    assert global_board_1 == GlobalBoard(2, False, False)
+    assert global_board_1.zobrist_hash() == \
+        GlobalBoard(2, False, False).zobrist_hash()
+
+
+def test_monte_carlo_bot_constructor():
+    game_1 = UltimateTicTacToe(3, False, False)
+    assert MonteCarloBot(game_1)._iterations == 1000
+
+    with pytest.raises(ValueError):
+        MonteCarloBot(game_1, iterations=0)
+    with pytest.raises(ValueError):
+        MonteCarloBot(game_1, time_ms=-1)
+
+
+@pytest.mark.parametrize('size', [2, 3])
+@pytest.mark.parametrize('lock_after_win', [False, True])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_monte_carlo_bot_play(size, lock_after_win, choice_after_win):
+    random.seed(size)
+    game_1 = UltimateTicTacToe(size, lock_after_win, choice_after_win)
+    bot = MonteCarloBot(game_1, iterations=20, seed=size)
+    assert game_1.play(bot, game_1.random_bot)
+    assert bot.playouts == 20
+    assert bot.playouts_per_second() > 0
+
+
+def test_monte_carlo_bot_search_leaves_board_unchanged():
+    game_1 = UltimateTicTacToe(3, True, True)
+    global_board_1 = game_1.global_board()
+    game_1.random_bot('x')
+    position_hash = global_board_1.zobrist_hash()
+
+    MonteCarloBot(game_1, iterations=50, seed=0).search(global_board_1, 'o')
+    assert global_board_1.zobrist_hash() == position_hash
+    assert global_board_1.zobrist_hash() == global_board_1.compute_hash()
+    assert len(global_board_1._history) == 1
+
+
+def test_monte_carlo_bot_reuses_tree():
+    random.seed(0)
+    game_1 = UltimateTicTacToe(2, False, False)
+    bot = MonteCarloBot(game_1, iterations=300, seed=0)
+    bot('x')
+    assert bot.reused_visits == 0
+    game_1.random_bot('o')
+    bot('x')
+    assert bot.reused_visits > 0
+
+
+def test_monte_carlo_bot_time_limit():
+    game_1 = UltimateTicTacToe(3, False, False)
+    bot = MonteCarloBot(game_1, time_ms=20, seed=0)
+    bot('x')
+    assert bot.playouts > 0
+    # the search runs at least until the deadline, the upper bound is
+    # loose as timing on busy machines is noisy
+    assert bot.search_time >= 0.02
+    assert bot.search_time < 50 * 0.02
+
+
+def test_monte_carlo_bot_beats_random_bot():
+    random.seed(0)
+    wins = 0
+    for seed in range(3):
+        game_1 = UltimateTicTacToe(3, False, False)
+        bot = MonteCarloBot(game_1, iterations=100, seed=seed)
+        if game_1.play(bot, game_1.random_bot) == 'x':
+            wins += 1
+    assert wins >= 2
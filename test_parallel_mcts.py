@@ -0,0 +1,123 @@
+import random
+from multiprocessing import Pool
+from time import time
+
+import pytest
+
+from bitboard import BitGlobalBoard
+from parallel_mcts import (
+    ParallelMonteCarloBot,
+    add_virtual_loss,
+    run_playouts,
+    search_tree
+)
+from mcts import Node
+from ultimate_tic_tac_toe import GlobalBoard, UltimateTicTacToe
+
+
+def test_parallel_monte_carlo_bot_constructor():
+    game_1 = UltimateTicTacToe(3, False, False)
+    assert ParallelMonteCarloBot(game_1, workers=2)._iterations == 2000
+
+    with pytest.raises(ValueError):
+        ParallelMonteCarloBot(game_1, workers=0)
+    with pytest.raises(ValueError):
+        ParallelMonteCarloBot(game_1, mode='tree')
+    with pytest.raises(ValueError):
+        ParallelMonteCarloBot(game_1, iterations=0)
+    with pytest.raises(ValueError):
+        ParallelMonteCarloBot(game_1, time_ms=0)
+    with pytest.raises(ValueError):
+        ParallelMonteCarloBot(game_1, leaf_batch=0)
+
+
+def test_search_tree():
+    global_board = BitGlobalBoard(3, False, False)
+    global_board.choose_board(5)
+    global_board.make_move('x', 5)
+    moves, playouts = search_tree(
+        (BitGlobalBoard, global_board.to_bytes(), 'o', 30, None, 1.4, 0))
+    assert playouts == 30
+    assert sorted(moves) == global_board.legal_moves()
+    assert sum(visits for visits, _ in moves.values()) == 30
+
+
+def test_run_playouts():
+    global_board = GlobalBoard(2, False, False)
+    results = run_playouts(
+        (GlobalBoard, [(global_board.to_bytes(), 'o')] * 5, 0, None))
+    assert len(results) == 5
+    assert set(results) <= {'x', 'o', 'draw'}
+
+    # only one playout after the deadline
+    results = run_playouts(
+        (GlobalBoard, [(global_board.to_bytes(), 'o')] * 5, 0, time() - 1))
+    assert len(results) == 1
+
+
+def test_add_virtual_loss():
+    root = Node(None, 'o', None, 0)
+    child = Node(1, 'x', None, 0, root)
+    add_virtual_loss(child, 1)
+    assert root.visits == child.visits == 1
+    add_virtual_loss(child, -1)
+    assert root.visits == child.visits == 0
+    assert child.wins == 0
+
+
+@pytest.mark.parametrize('mode', ['root', 'leaf'])
+def test_parallel_monte_carlo_bot_in_process(mode):
+    game_1 = UltimateTicTacToe(3, True, True)
+    global_board_1 = game_1.global_board()
+    bot = ParallelMonteCarloBot(
+        game_1, workers=1, mode=mode, iterations=50, seed=0)
+    assert not bot('x')
+    assert bot.playouts == 50
+    assert sum(bot.root_visits.values()) == 50
+    assert len(global_board_1.moves()) == 1
+    assert global_board_1.zobrist_hash() == global_board_1.compute_hash()
+    assert bot._pool is None
+
+
+@pytest.mark.parametrize('mode', ['root', 'leaf'])
+def test_parallel_monte_carlo_bot_workers(mode):
+    random.seed(0)
+    game_1 = UltimateTicTacToe(2, False, False)
+    with ParallelMonteCarloBot(game_1, workers=2, mode=mode, iterations=40,
+                               seed=0, leaf_batch=4) as bot:
+        assert game_1.play(bot, game_1.random_bot, verbose=False)
+        assert bot.playouts == 40
+        assert bot.playouts_per_second() > 0
+    assert bot._pool is None
+
+
+def test_parallel_monte_carlo_bot_keeps_own_pool():
+    game_1 = UltimateTicTacToe(2, False, False)
+    bot = ParallelMonteCarloBot(game_1, workers=2, iterations=10, seed=0)
+    bot('x')
+    pool = bot._pool
+    assert pool is not None
+    bot('o')
+    assert bot._pool is pool
+    bot.close()
+    assert bot._pool is None
+
+    # pool of a bot which isn't closed is terminated with the bot
+    bot('x')
+    del bot
+
+
+@pytest.mark.parametrize('mode', ['root', 'leaf'])
+def test_parallel_monte_carlo_bot_time_limit(mode):
+    game_1 = UltimateTicTacToe(3, False, False)
+    with Pool(2) as pool:
+        bot = ParallelMonteCarloBot(
+            game_1, workers=2, mode=mode, time_ms=50, seed=0, pool=pool)
+        bot('x')
+        assert bot.playouts > 0
+        assert bot.search_time < 1
+        assert bot._pool is pool
+        bot.close()
+
+        # given pool isn't closed by the bot
+        assert pool.apply(sum, ([1, 2],)) == 3
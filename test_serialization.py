@@ -0,0 +1,54 @@
+import pytest
+
+from bitboard import BitGlobalBoard
+from serialization import encode_states, iter_boards, decode_states
+from ultimate_tic_tac_toe import GlobalBoard, state_size
+
+
+def test_encode_states(game_boards):
+    boards = game_boards(3, False, False)
+    data = encode_states(boards)
+    assert len(data) == len(boards) * state_size(3)
+    assert data[:state_size(3)] == boards[0].to_bytes()
+
+
+def test_iter_boards(game_boards):
+    boards = game_boards(3, True, True)
+    assert list(iter_boards(encode_states(boards), 3)) == boards
+    for board in iter_boards(encode_states(boards), 3, BitGlobalBoard):
+        assert isinstance(board, BitGlobalBoard)
+    with pytest.raises(ValueError):
+        list(iter_boards(encode_states(boards) + b'\0', 3))
+
+
+@pytest.mark.parametrize('size', [2, 3, 4])
+def test_decode_states(size, game_boards):
+    np = pytest.importorskip('numpy')
+    boards = game_boards(size, True, True, seed=size)
+    states = decode_states(encode_states(boards), size)
+    assert len(states.spots) == len(boards)
+
+    codes = {'': 0, 'x': 1, 'o': 2, None: 0}
+    for index, board in enumerate(boards):
+        assert states.lock_after_win[index]
+        assert states.choice_after_win[index]
+        assert states.previous_spot[index] == (board._previous_spot_idx or 0)
+        assert states.previous_board[index] == (board._previous_board_idx or 0)
+        assert states.board_choice[index] == 0
+        assert states.last_won[index] == codes[board._last_won or None]
+        for board_index, local_board in enumerate(board._local_boards):
+            assert np.array_equal(
+                states.spots[index, board_index],
+                [codes[spot] for spot in local_board._spots])
+            assert states.local_wins[index, board_index] == \
+                codes[local_board.win()]
+            assert states.local_full[index, board_index] == local_board._full
+
+
+def test_decode_states_errors(game_boards):
+    pytest.importorskip('numpy')
+    data = encode_states(game_boards(2, False, False))
+    with pytest.raises(ValueError):
+        decode_states(data[:-1], 2)
+    with pytest.raises(ValueError):
+        decode_states(data + GlobalBoard(3, False, False).to_bytes(), 2)
@@ -0,0 +1,134 @@
+import asyncio
+import time
+
+import pytest
+
+from server import (
+    GameClient,
+    GameServer,
+    LatencyStats,
+    ProtocolError,
+    load_test
+)
+
+
+def run_with_server(coroutine_function, **server_arguments):
+    """Runs coroutine_function(server, client) with a started server"""
+    async def run():
+        server = GameServer(**server_arguments)
+        await server.start()
+        client = await GameClient.connect('127.0.0.1', server.port())
+        try:
+            return await coroutine_function(server, client)
+        finally:
+            await client.close()
+            await server.close()
+    return asyncio.run(run())
+
+
+def test_latency_stats():
+    stats = LatencyStats(max_samples=100)
+    assert stats.percentile(99) == 0.0
+    for latency in range(1, 201):
+        stats.record(latency / 1000)
+    assert stats.moves == 200
+    assert stats.percentile(0) == 0.101
+    assert stats.percentile(100) == 0.2
+    assert stats.percentile(50) == pytest.approx(0.15, abs=0.002)
+
+
+def test_load_test():
+    async def run():
+        server = GameServer()
+        await server.start()
+        try:
+            results = await load_test('127.0.0.1', server.port(), 5, 3)
+        finally:
+            await server.close()
+        return server, results
+
+    server, results = asyncio.run(run())
+    assert len(results) == 15
+    assert set(results) <= {'x', 'o', 'draw'}
+    assert server.games == 15
+    assert server.latencies.moves > 15
+    assert server.connections == 0
+
+
+@pytest.mark.parametrize('sign', ['x', 'o'])
+def test_client_mirrors_server(sign):
+    async def play(server, client):
+        await client.new_game(3, True, True, sign)
+        while not client.result:
+            await client.random_move()
+            state, = await client.request('STATE')
+            assert state == 'STATE ' + client.global_board.to_bytes().hex()
+        return client.result
+
+    assert run_with_server(play) in ('x', 'o', 'draw')
+
+
+def test_protocol_errors():
+    async def errors(client, lines):
+        messages = []
+        for line in lines:
+            with pytest.raises(ProtocolError) as error:
+                await client.request(line)
+            messages.append(str(error.value))
+        return messages
+
+    async def run(server, client):
+        messages = await errors(client, [
+            'MOVE 1', 'FOO', 'NEW 3 0 0 z', 'NEW 3 0 0 x nobot', 'NEW 99'])
+        await client.new_game(3)
+        messages += await errors(client, [
+            'MOVE 1 2', 'MOVE a', 'CHOOSE 10', 'MOVE 5'])
+        assert await client.request('CHOOSE 5') == ['OK']
+        messages += await errors(client, ['CHOOSE 4'])
+        return messages
+
+    assert run_with_server(run) == [
+        'No game, start one with NEW',
+        "Unknown command 'FOO'",
+        'Sign must be x or o',
+        "Unknown bot 'nobot'",
+        'Size must be between 2 and 5',
+        'Wrong number of arguments of MOVE',
+        "Index must be a number, not 'a'",
+        'Invalid board index',
+        'Attmept to make move without board chosen',
+        'Player not permitted to choose the board',
+    ]
+
+
+def test_bot_does_not_block_other_connections():
+    def slow_bot(game):
+        def bot(sign):
+            time.sleep(0.5)
+            return game.random_bot(sign)
+        return bot
+
+    async def run(server, client):
+        other = await GameClient.connect('127.0.0.1', server.port())
+        try:
+            # bot starts the game and thinks in the executor
+            slow_game = asyncio.create_task(
+                client.new_game(sign='o', bot='slow'))
+            await asyncio.sleep(0.1)
+            start = time.perf_counter()
+            await other.request('STATS')
+            elapsed = time.perf_counter() - start
+            await slow_game
+        finally:
+            await other.close()
+        return elapsed
+
+    assert run_with_server(run, bots={'slow': slow_bot}) < 0.2
+
+
+def test_idle_timeout():
+    async def run(server, client):
+        await asyncio.sleep(0.3)
+        return await client._reader.read()
+
+    assert run_with_server(run, idle_timeout=0.1) == b''
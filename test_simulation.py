@@ -0,0 +1,67 @@
+from ultimate_tic_tac_toe import UltimateTicTacToe
+from mcts import MonteCarloBot
+from simulation import (
+    SimulationResult,
+    make_bot,
+    play_batch,
+    simulate
+)
+from functools import partial
+import random
+import pytest
+
+
+def test_simulation_result():
+    result = SimulationResult(6, 2, 2, 2.0)
+    assert result.games() == 10
+    assert result.games_per_second() == 5.0
+    assert SimulationResult(0, 0, 0, 0.0).games_per_second() == 0.0
+
+
+def test_make_bot():
+    game_1 = UltimateTicTacToe(3, False, False)
+    assert make_bot(game_1, 'random_bot') == game_1.random_bot
+    bot = make_bot(game_1, partial(MonteCarloBot, iterations=10))
+    assert isinstance(bot, MonteCarloBot)
+    assert bot._game is game_1
+
+    # seed is passed only to factories without one
+    bot = make_bot(game_1, partial(MonteCarloBot, iterations=10), 5)
+    assert bot._random.random() == random.Random(5).random()
+    bot = make_bot(game_1, partial(MonteCarloBot, seed=1), 5)
+    assert bot._random.random() == random.Random(1).random()
+
+
+def test_play_batch():
+    batch = (10, 0, 3, False, False, 'always_winning_bot', 'random_bot')
+    assert play_batch(batch) == (10, 0, 0)
+
+    # the same seed gives the same results
+    batch = (10, 1, 3, True, True, 'random_bot', 'random_bot')
+    assert sum(play_batch(batch)) == 10
+    assert play_batch(batch) == play_batch(batch)
+
+
+def test_simulate():
+    result = simulate(25, size=2, workers=1, batch_size=10)
+    assert result.games() == 25
+    assert result.games_per_second() > 0
+
+    # results don't depend on the number of workers
+    assert simulate(25, size=2, workers=2, batch_size=10)[:3] == result[:3]
+
+    assert simulate(0, workers=1).games() == 0
+    with pytest.raises(ValueError):
+        simulate(-1)
+    with pytest.raises(ValueError):
+        simulate(10, batch_size=0)
+
+
+def test_simulate_search_bot():
+    bot = partial(MonteCarloBot, iterations=5)
+    result = simulate(4, bot, 'random_bot', size=2, workers=2, batch_size=2)
+    assert result.games() == 4
+
+    # search bots get seeds of their games
+    assert simulate(4, bot, bot, size=3, workers=1, batch_size=2)[:3] == \
+        simulate(4, bot, bot, size=3, workers=2, batch_size=2)[:3]
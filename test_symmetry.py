@@ -0,0 +1,151 @@
+import random
+from itertools import cycle
+
+import pytest
+
+from alphabeta import AlphaBetaBot
+from bitboard import BitGlobalBoard
+from symmetry import (
+    INVERSE_SYMMETRIES,
+    SYMMETRIES_COUNT,
+    canonical_form,
+    canonical_hash,
+    symmetry_tables,
+    transform_board,
+    transform_index,
+    transform_move
+)
+from ultimate_tic_tac_toe import (
+    GlobalBoard,
+    UltimateTicTacToe,
+    decode_move,
+    encode_move
+)
+
+
+def random_position(size, lock_after_win, choice_after_win, moves_count,
+                    seed, board_class=GlobalBoard):
+    rng = random.Random(seed)
+    global_board = board_class(size, lock_after_win, choice_after_win)
+    for _, sign in zip(range(moves_count), cycle('xo')):
+        if global_board.play(rng.choice(global_board.legal_moves()), sign):
+            break
+    return global_board
+
+
+def test_symmetry_tables():
+    indexes = symmetry_tables(3).indexes
+    assert len(indexes) == SYMMETRIES_COUNT
+    assert indexes[0] == tuple(range(9))
+    assert indexes[1] == (2, 5, 8, 1, 4, 7, 0, 3, 6)
+    assert indexes[4] == (2, 1, 0, 5, 4, 3, 8, 7, 6)
+    assert indexes[6] == (0, 3, 6, 1, 4, 7, 2, 5, 8)
+
+    # all images are different
+    assert len(set(indexes)) == SYMMETRIES_COUNT
+    assert len(set(symmetry_tables(2).indexes)) == SYMMETRIES_COUNT
+    for permutation in indexes:
+        assert sorted(permutation) == list(range(9))
+
+
+@pytest.mark.parametrize('size', [2, 3, 4])
+def test_inverse_symmetries(size):
+    for symmetry, inverse in enumerate(INVERSE_SYMMETRIES):
+        for move in range(size ** 4):
+            assert transform_move(transform_move(move, symmetry, size),
+                                  inverse, size) == move
+
+
+def test_transform_move():
+    # center of the corner board goes to the center of another corner
+    move = encode_move(1, 5, 3)
+    assert decode_move(transform_move(move, 1, 3), 3) == (3, 5)
+    assert decode_move(transform_move(encode_move(1, 2, 3), 1, 3), 3) == \
+        (3, 6)
+    assert transform_index(None, 1, 3) is None
+    assert transform_index(4, 2, 3) == 6
+
+
+def test_transform_board():
+    global_board = GlobalBoard(3, False, False)
+    global_board.choose_board(1)
+    global_board.make_move('x', 2)
+    global_board.make_move('o', 3)
+
+    transformed = transform_board(global_board, 1)
+    assert transformed.local_board(3).spot(6) == 'x'
+    assert transformed.local_board(6).spot(9) == 'o'
+    assert transformed._previous_spot_idx == 9
+    assert transformed._previous_board_idx == 6
+    assert transformed.current_board() == 9
+    assert transformed.moves() == []
+    assert transformed.zobrist_hash() == transformed.compute_hash()
+    assert transform_board(global_board, 0) == global_board
+
+    # board choice in progress is remapped
+    global_board = GlobalBoard(3, False, False)
+    global_board.choose_board(2)
+    assert transform_board(global_board, 1)._board_choice == 6
+
+
+@pytest.mark.parametrize('board_class', [GlobalBoard, BitGlobalBoard])
+@pytest.mark.parametrize('lock_after_win', [False, True])
+def test_transform_board_keeps_game(board_class, lock_after_win):
+    for seed in range(5):
+        global_board = random_position(
+            3, lock_after_win, False, 30, seed, board_class)
+        for symmetry in range(SYMMETRIES_COUNT):
+            transformed = transform_board(global_board, symmetry)
+            assert type(transformed) is board_class
+            assert sorted(transformed.legal_moves()) == sorted(
+                transform_move(move, symmetry, 3)
+                for move in global_board.legal_moves())
+            assert transformed.global_win_check() == \
+                global_board.global_win_check()
+            assert transform_board(
+                transformed, INVERSE_SYMMETRIES[symmetry]) == global_board
+
+
+@pytest.mark.parametrize('size', [2, 3, 4])
+def test_canonical_hash(size):
+    for seed in range(5):
+        global_board = random_position(size, False, True, 2 * size ** 2, seed)
+        position_hash, symmetry = canonical_hash(global_board)
+        assert position_hash == \
+            transform_board(global_board, symmetry).zobrist_hash()
+        for other_symmetry in range(SYMMETRIES_COUNT):
+            transformed = transform_board(global_board, other_symmetry)
+            assert transformed.zobrist_hash() >= position_hash
+            assert canonical_hash(transformed)[0] == position_hash
+
+
+def test_canonical_form():
+    global_board = random_position(3, False, False, 20, 1)
+    canonical, symmetry = canonical_form(global_board)
+    assert canonical == transform_board(global_board, symmetry)
+    for other_symmetry in range(SYMMETRIES_COUNT):
+        assert canonical_form(
+            transform_board(global_board, other_symmetry))[0] == canonical
+
+    # different positions stay different
+    assert canonical_hash(GlobalBoard(3, False, False))[0] != \
+        canonical_hash(global_board)[0]
+
+
+def test_alpha_beta_bot_symmetric():
+    game = UltimateTicTacToe(3, False, False)
+    global_board = game.global_board()
+    global_board.choose_board(5)
+    global_board.make_move('x', 5)
+    bot = AlphaBetaBot(game, time_ms=None, max_depth=3, symmetric=True)
+    assert bot.search(global_board, 'o') in global_board.legal_moves()
+    assert global_board.moves() == [(5, 5)]
+
+    # symmetric positions share entries
+    global_board.play(encode_move(5, 1, 3), 'o')
+    key, symmetry = bot.table_key(global_board)
+    assert bot.table_key(transform_board(global_board, 1))[0] == key
+    entry = bot._table.lookup(key)
+    assert entry is not None
+    assert transform_move(entry.move, INVERSE_SYMMETRIES[symmetry], 3) in \
+        global_board.legal_moves()
@@ -0,0 +1,121 @@
+from math import inf
+
+import pytest
+
+from tournament import (
+    PairingResult,
+    Tournament,
+    elo_difference,
+    expected_score,
+    sprt_bounds,
+    sprt_llr,
+    update_ratings
+)
+
+
+def test_expected_score():
+    assert expected_score(0) == 0.5
+    assert expected_score(400) == pytest.approx(10 / 11)
+    assert expected_score(-400) == pytest.approx(1 / 11)
+    for difference in [-300, -50, 0, 120]:
+        assert elo_difference(expected_score(difference)) == \
+            pytest.approx(difference)
+    assert elo_difference(0) == -inf
+    assert elo_difference(1) == inf
+
+
+def test_pairing_result():
+    result = PairingResult('a', 'b', 6, 2, 2, 0.0, None)
+    assert result.games() == 10
+    assert result.score() == 0.7
+    assert result.elo_difference() == pytest.approx(elo_difference(0.7))
+    assert PairingResult('a', 'b', 0, 0, 0, 0.0, None).score() == 0.5
+
+
+def test_sprt():
+    lower, upper = sprt_bounds(0.05, 0.05)
+    assert lower == pytest.approx(-2.944, abs=0.001)
+    assert upper == -lower
+
+    assert sprt_llr(0, 0, 0, 0, 50) == 0.0
+    assert sprt_llr(60, 20, 20, 0, 50) > upper
+    assert sprt_llr(20, 20, 60, 0, 50) < lower
+    assert lower < sprt_llr(27, 50, 23, 0, 50) < upper
+
+    # one-sided results are conclusive
+    assert sprt_llr(20, 0, 0, 0, 50) > upper
+    assert sprt_llr(0, 0, 20, 0, 50) < lower
+
+
+def test_update_ratings():
+    ratings = {'a': 1500.0, 'b': 1500.0}
+    update_ratings(ratings, 'a', 'b', 3, 1, 0)
+    assert ratings['a'] == 1500 + 16 * 1.5
+    assert ratings['a'] + ratings['b'] == 3000
+
+    ratings = {'a': 1500.0, 'b': 1500.0}
+    update_ratings(ratings, 'a', 'b', 2, 0, 2)
+    assert ratings == {'a': 1500.0, 'b': 1500.0}
+
+
+def test_tournament_errors():
+    with pytest.raises(ValueError):
+        Tournament({'a': 'random_bot'})
+    bots = {'a': 'random_bot', 'b': 'random_bot'}
+    with pytest.raises(ValueError):
+        Tournament(bots, batch_size=0)
+    with pytest.raises(ValueError):
+        Tournament(bots, elo0=10, elo1=10)
+
+
+def test_pairing_batches():
+    tournament = Tournament(
+        {'random_bot': 'random_bot', 'always_winning_bot':
+         'always_winning_bot', 'other': 'random_bot'},
+        max_games=50, batch_size=20)
+    batches = list(tournament.pairing_batches('random_bot', 'other'))
+    assert [batch[0] for batch, _ in batches] == [20, 20, 10]
+    assert [bot_1_x for _, bot_1_x in batches] == [True, False, True]
+
+    # always_winning_bot plays only 'x'
+    batches = list(tournament.pairing_batches(
+        'random_bot', 'always_winning_bot'))
+    assert [bot_1_x for _, bot_1_x in batches] == [False, False, False]
+    batch, _ = batches[0]
+    assert batch[-2:] == ('always_winning_bot', 'random_bot')
+
+
+def test_tournament_early_stop():
+    tournament = Tournament(
+        {'random': 'random_bot', 'winning': 'always_winning_bot'},
+        max_games=1000, batch_size=10, colors={'winning': 'x'})
+    result, = tournament.run(workers=1)
+    assert result.decision == 'H0'
+    assert result.games() < 1000
+    assert result.losses == result.games()
+    assert tournament.standings()[0][0] == 'winning'
+
+
+def test_tournament_unplayable():
+    # always_winning_bot only plays boards of size 3
+    tournament = Tournament(
+        {'random_bot': 'random_bot', 'always_winning_bot':
+         'always_winning_bot'}, size=2)
+    result, = tournament.run(workers=1)
+    assert result.decision == 'unplayable'
+    assert result.games() == 0
+
+    tournament = Tournament(
+        {'a': 'always_winning_bot', 'b': 'always_winning_bot'},
+        colors={'a': 'x', 'b': 'x'})
+    result, = tournament.run(workers=1)
+    assert result.decision == 'unplayable'
+
+
+def test_tournament_workers():
+    bots = {'a': 'random_bot', 'b': 'random_bot', 'c': 'random_bot'}
+    serial = Tournament(bots, size=2, max_games=40, batch_size=10)
+    parallel = Tournament(bots, size=2, max_games=40, batch_size=10)
+    assert len(serial.run(workers=1)) == 3
+    assert parallel.run(workers=2) == serial.results
+    assert parallel.ratings == serial.ratings
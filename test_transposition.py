@@ -0,0 +1,62 @@
+from transposition import (
+    TranspositionTable,
+    EXACT,
+    LOWER_BOUND
+)
+import pytest
+
+
+def test_transposition_table_constructor():
+    table_1 = TranspositionTable(8)
+    assert table_1.capacity() == 8
+    assert len(table_1) == 0
+
+    with pytest.raises(ValueError):
+        TranspositionTable(0)
+
+
+def test_transposition_table_store_lookup():
+    table_1 = TranspositionTable(8)
+    assert table_1.lookup(3) is None
+    assert table_1.misses == 1
+
+    assert table_1.store(3, 2, 0.5, LOWER_BOUND, 7)
+    entry = table_1.lookup(3)
+    assert entry.depth == 2
+    assert entry.value == 0.5
+    assert entry.flag == LOWER_BOUND
+    assert entry.move == 7
+    assert table_1.hits == 1
+
+    # different key in the same slot
+    assert table_1.lookup(11) is None
+    assert len(table_1) == 1
+
+
+def test_transposition_table_replacement():
+    table_1 = TranspositionTable(8)
+    table_1.store(3, 4, 1.0)
+
+    # shallower entry of another position doesn't replace the deeper one
+    assert not table_1.store(11, 2, -1.0)
+    assert table_1.lookup(3).value == 1.0
+
+    # the same position is always replaced
+    assert table_1.store(3, 1, 0.0, EXACT)
+    assert table_1.lookup(3).depth == 1
+
+    # entries from the previous search are replaced
+    table_1.store(3, 4, 1.0)
+    table_1.new_search()
+    assert table_1.store(11, 2, -1.0)
+    assert table_1.lookup(3) is None
+    assert table_1.lookup(11).value == -1.0
+
+
+def test_transposition_table_clear():
+    table_1 = TranspositionTable(8)
+    table_1.store(3, 4, 1.0)
+    table_1.lookup(3)
+    table_1.clear()
+    assert len(table_1) == 0
+    assert table_1.hits == 0
@@ -6,8 +6,21 @@ from ultimate_tic_tac_toe import (
     BoardChoiceError,
     BoardLockedError,
     GameRulesError,
-    elements_equal
+    UndoError,
+    elements_equal,
+    decode_move,
+    encode_move,
+    line_indexes,
+    local_state_table,
+    pack_undo_entry,
+    unpack_undo_entry,
+    scan_winner,
+    state_size
 )
+from itertools import cycle
+from copy import deepcopy
+import pickle
+import random
 import pytest
 
 
@@ -115,6 +128,25 @@ def test_local_board_make_move():
         local_board_1.make_move(1, 'x')
 
 
+def test_local_board_make_move_unchecked():
+    local_board_1 = LocalBoard(3)
+    local_board_2 = LocalBoard(3)
+    for spot_index, sign in [(1, 'x'), (5, 'o'), (2, 'x'), (9, 'o')]:
+        assert local_board_1.make_move_unchecked(spot_index, sign) == \
+            local_board_2.make_move(spot_index, sign)
+        assert local_board_1 == local_board_2
+        assert local_board_1.state_index() == \
+            local_board_1.compute_state_index()
+    assert local_board_1.make_move_unchecked(3, 'x') == 'x'
+    assert local_board_1.spot_unchecked(3) == 'x'
+
+    local_board_1.clear_spot_unchecked(3)
+    local_board_1.set_spot_unchecked(4, 'o')
+    assert local_board_1._spots == \
+        ['x', 'x', '', 'o', 'o', '', '', '', 'o']
+    assert local_board_1.line_counts()['o'][1] == 2
+
+
 def test_local_board_elements_equal():
     list_of_equal_elements = ['x', 'x', 'x', 'x', 'x', 'x']
     list_of_different_elements = ['x', 'x', '', 'x', 'x', 'x']
@@ -158,6 +190,150 @@ def test_local_board_local_win_check():
     assert local_board_3.win() == 'x'
 
 
+def test_local_board_clear_spot():
+    local_board_1 = LocalBoard(3)
+    local_board_1.set_spot(5, 'x')
+    local_board_1.clear_spot(5)
+    assert local_board_1.spot(5) == ''
+    assert local_board_1.line_counts()['x'] == 8 * [0]
+    assert local_board_1._empty_count == 9
+
+    # clearing an empty spot
+    local_board_1.clear_spot(5)
+    assert local_board_1._empty_count == 9
+
+    with pytest.raises(IndexError):
+        local_board_1.clear_spot(10)
+
+
+def test_line_indexes():
+    assert line_indexes(3)[0] == (0, 3, 6)
+    assert line_indexes(3)[4] == (1, 4, 6, 7)
+    assert line_indexes(3)[6] == (2, 3, 7)
+    assert line_indexes(4)[5] == (1, 5, 8)
+    assert len(line_indexes(5)) == 25
+
+
+def test_local_board_line_counts():
+    local_board_1 = LocalBoard(3)
+    assert local_board_1.line_counts() == {'x': 8 * [0], 'o': 8 * [0]}
+
+    local_board_1.set_spot(5, 'x')
+    assert local_board_1.line_counts()['x'] == [0, 1, 0, 0, 1, 0, 1, 1]
+    assert local_board_1._empty_count == 8
+
+    # overwriting a spot
+    local_board_1.set_spot(5, 'o')
+    assert local_board_1.line_counts()['x'] == 8 * [0]
+    assert local_board_1.line_counts()['o'] == [0, 1, 0, 0, 1, 0, 1, 1]
+    assert local_board_1._empty_count == 8
+
+    # counts rebuilt after _spots replacement
+    local_board_1._spots = ['x', 'x', 'x', '', 'o', '', '', '', '']
+    assert local_board_1.line_counts()['x'] == [3, 0, 0, 1, 1, 1, 1, 1]
+    assert local_board_1._empty_count == 5
+
+
+def test_local_state_table():
+    table = local_state_table(2)
+    assert table is local_state_table(2)
+    assert len(table.winners) == 3 ** 4
+    for state in range(3 ** 4):
+        code, spots = state, []
+        for _ in range(4):
+            code, spot_code = divmod(code, 3)
+            spots.append(['', 'x', 'o'][spot_code])
+        assert table.winners[state] == scan_winner(spots, 2)
+        assert table.full[state] == all(spots)
+        assert table.moves[state] == tuple(
+            index + 1 for index, spot in enumerate(spots) if not spot)
+        assert table.winnable['x'][state] == ('o' not in spots[:2] or
+                                              'o' not in spots[2:] or
+                                              'o' not in spots[::2] or
+                                              'o' not in spots[1::2] or
+                                              'o' not in spots[::3] or
+                                              'o' not in spots[1:3])
+
+    # first spot 'x', fifth 'o'
+    table = local_state_table(3)
+    assert table.moves[1 + 2 * 3 ** 4] == (2, 3, 4, 6, 7, 8, 9)
+    assert deepcopy(table) is table
+
+
+def test_local_board_state_index():
+    local_board_1 = LocalBoard(3)
+    assert local_board_1.state_index() == 0
+    local_board_1.set_spot(1, 'x')
+    local_board_1.set_spot(5, 'o')
+    assert local_board_1.state_index() == 1 + 2 * 3 ** 4
+    local_board_1.set_spot(5, 'x')
+    assert local_board_1.state_index() == 1 + 3 ** 4
+    local_board_1.clear_spot(1)
+    assert local_board_1.state_index() == 3 ** 4
+
+    local_board_1._spots = ['o', '', '', '', '', '', '', '', 'x']
+    assert local_board_1.state_index() == 2 + 3 ** 8
+
+    local_board_2 = LocalBoard(4)
+    local_board_2.set_spot(16, 'o')
+    assert local_board_2.state_index() == 2 * 3 ** 15
+
+
+def test_local_board_state_table_used():
+    assert LocalBoard(3)._layout.state_table is local_state_table(3)
+    assert LocalBoard(4)._layout.state_table is None
+    local_board_1 = deepcopy(LocalBoard(3))
+    assert local_board_1._layout.state_table is local_state_table(3)
+
+
+@pytest.mark.parametrize('size', [2, 3, 4])
+def test_local_board_winnable(size):
+    local_board_1 = LocalBoard(size)
+    assert local_board_1.winnable('x') and local_board_1.winnable('o')
+
+    # opponent's signs on the left diagonal and a corner block all lines
+    for row in range(size):
+        local_board_1.set_spot(row * (size + 1) + 1, 'o')
+    local_board_1.set_spot(size, 'o')
+    assert not local_board_1.winnable('x')
+    assert local_board_1.winnable('o')
+
+
+def test_local_board_dead_and_open_for():
+    local_board_1 = LocalBoard(3)
+    local_board_1._spots = ['x', 'o', 'x', 'x', 'o', 'o', 'o', '', '']
+    assert local_board_1.open_for('o') and not local_board_1.open_for('x')
+    assert not local_board_1.dead()
+
+    local_board_1.set_spot(8, 'x')
+    assert local_board_1.dead()
+    assert not local_board_1.open_for('x')
+    assert not local_board_1.open_for('o')
+
+    # won board stays open only for the winner
+    local_board_2 = LocalBoard(3)
+    local_board_2._spots = ['o', 'o', 'o'] + 6 * ['']
+    local_board_2._win = 'o'
+    assert local_board_2.open_for('o') and not local_board_2.open_for('x')
+    assert not local_board_2.dead()
+
+
+def test_local_board_move_win_check():
+    local_board_1 = LocalBoard(3)
+    local_board_1._spots = ['x', 'x', 'x', '', 'o', '', '', '', '']
+    assert local_board_1.move_win_check(5, 'o') is None
+    assert local_board_1.move_win_check(2, 'x') == 'x'
+    assert local_board_1.win() == 'x'
+
+    # already won
+    assert local_board_1.move_win_check(2, 'x') is None
+
+    local_board_2 = LocalBoard(4)
+    for spot_index in [4, 7, 10, 13]:
+        local_board_2.set_spot(spot_index, 'o')
+    assert local_board_2.move_win_check(13, 'o') == 'o'
+
+
 def test_local_board_full_check():
     local_board_1 = LocalBoard(3)
     local_board_1._spots = ['x', '', '', '', '', '', '', 'o', '']
@@ -183,6 +359,26 @@ def test_local_board_row_str():
         local_board_1.row_str(4, '|')
 
 
+def test_local_board_row_strs():
+    local_board_1 = LocalBoard(3)
+    local_board_1.set_spot(1, 'x')
+    rows = local_board_1.row_strs(':')
+    assert rows == (' x :   :   ', '   :   :   ', '   :   :   ')
+    assert local_board_1.row_strs(':') is rows
+
+    # cache invalidated by the board change
+    local_board_1.make_move(5, 'o')
+    assert local_board_1.row_strs(':')[1] == '   : o :   '
+    local_board_1.clear_spot(5)
+    assert local_board_1.row_strs(':')[1] == '   :   :   '
+    local_board_1._spots = ['o'] + 8 * ['']
+    assert local_board_1.row_strs(':')[0] == ' o :   :   '
+    assert local_board_1.row_strs('|')[0] == ' o |   |   '
+
+    # rows are shared by boards with the same spots
+    assert LocalBoard(3).row_strs(':') is LocalBoard(3).row_strs(':')
+
+
 def test_local_board_eq():
     local_board_1 = LocalBoard(3)
     local_board_2 = LocalBoard(3)
@@ -292,6 +488,16 @@ def test_global_board_separator_row():
         '|---:---:---:---|---:---:---:---|---:---:---:---|---:---:---:---|'
 
 
+def test_global_board_cached_separator_row():
+    global_board_1 = GlobalBoard(3, False, False)
+    assert global_board_1.cached_separator_row(1) == \
+        global_board_1.separator_row(1)
+
+    # rows are shared between boards
+    assert global_board_1.cached_separator_row() is \
+        GlobalBoard(3, True, True).cached_separator_row()
+
+
 def test_global_board_row_of_spots():
     global_board_1 = GlobalBoard(4, False, False)
     spots = ['x', '', '', '', '', 'x', '', '', '', '', 'x', '', '', '', '', 'x']
@@ -320,6 +526,57 @@ def test_global_board_row_of_wins():
     assert global_board_1.row_of_wins(3) == ':x:o:o:x:'
 
 
+def reference_str(global_board):
+    """GlobalBoard.__str__ built from separator_row and row_of_spots"""
+    if global_board._board_choice is None:
+        highlight = global_board.current_board()
+    else:
+        highlight = global_board._board_choice
+    highlight_row, highlight_clmn = global_board.row_clmn_split(highlight)
+
+    size = global_board._SIZE
+    final_str = ''
+    for row in range(size + 1):
+        if highlight and global_board.compare(row, highlight_row + 0.5):
+            final_str += global_board.separator_row(highlight_clmn) + '\n'
+        else:
+            final_str += global_board.separator_row() + '\n'
+        if row == size:
+            break
+        for local_row in range(size):
+            if highlight and row == highlight_row:
+                final_str += global_board.row_of_spots(
+                    size * row + local_row, highlight_clmn) + '\n'
+            else:
+                final_str += global_board.row_of_spots(
+                    size * row + local_row) + '\n'
+    return final_str + global_board.map_of_wins()
+
+
+def test_global_board_map_of_wins():
+    global_board_1 = GlobalBoard(2, False, False)
+    global_board_1.local_board(2)._win = 'o'
+    assert global_board_1.map_of_wins() == '_____\n: :o:\n: : :\n^^^^^'
+
+
+@pytest.mark.parametrize('size', [2, 3, 4])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_global_board_str(size, choice_after_win):
+    game_1 = UltimateTicTacToe(size, True, choice_after_win)
+    global_board_1 = game_1.global_board()
+    random.seed(size)
+    for sign in cycle('xo'):
+        assert str(global_board_1) == reference_str(global_board_1)
+        if global_board_1.current_board() is None:
+            global_board_1.choose_board(
+                random.choice(global_board_1.possible_boards()))
+            assert str(global_board_1) == reference_str(global_board_1)
+            global_board_1.cancel_board_choice()
+        if game_1.random_bot(sign):
+            break
+    assert str(global_board_1) == reference_str(global_board_1)
+
+
 def test_global_board_possible_boards():
     global_board_1 = GlobalBoard(4, True, False)
     global_board_1._local_boards[0]._win = 'x'
@@ -446,6 +703,476 @@ def test_global_board_global_win_check():
     assert global_board_2.global_win_check() is None
 
 
+def test_global_board_move_win_check():
+    global_board_1 = GlobalBoard(3, False, False)
+    assert global_board_1.move_win_check(1) is None
+
+    # win diagonally right
+    for board_index in [3, 5]:
+        global_board_1.local_board(board_index)._win = 'o'
+        global_board_1._last_won = 'o'
+        assert global_board_1.move_win_check(board_index) is None
+    global_board_1.local_board(7)._win = 'o'
+    global_board_1._last_won = 'o'
+    assert global_board_1.move_win_check(7) == 'o'
+
+    # draw after the last open board is closed
+    global_board_2 = GlobalBoard(2, True, False)
+    for board_index in [1, 2, 3]:
+        global_board_2.local_board(board_index)._full = True
+    assert global_board_2.move_win_check(3) is None
+    global_board_2.local_board(4)._win = 'x'
+    global_board_2._last_won = 'x'
+    assert global_board_2.move_win_check(4) == 'draw'
+
+
+@pytest.mark.parametrize('size', [2, 3, 4, 5])
+@pytest.mark.parametrize('lock_after_win', [False, True])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_global_board_make_move_matches_global_win_check(
+        size, lock_after_win, choice_after_win):
+    game_1 = UltimateTicTacToe(size, lock_after_win, choice_after_win)
+    global_board_1 = game_1.global_board()
+    random.seed(size)
+    for sign in cycle('xo'):
+        result = game_1.random_bot(sign)
+        assert result == global_board_1.global_win_check()
+        for board in global_board_1._local_boards:
+            assert board._full == all(board._spots)
+        if result:
+            break
+
+
+def test_global_board_unmake_move():
+    global_board_1 = GlobalBoard(3, False, False)
+    with pytest.raises(UndoError):
+        global_board_1.unmake_move()
+
+    global_board_1.choose_board(3)
+    global_board_1.make_move('x', 5)
+    assert global_board_1.unmake_move() == (3, 5)
+    assert global_board_1.local_board(3)._spots == 9 * ['']
+    assert global_board_1._board_choice == 3
+    assert global_board_1._previous_spot_idx is None
+    assert global_board_1._previous_board_idx is None
+
+    global_board_1.cancel_board_choice()
+    assert global_board_1 == GlobalBoard(3, False, False)
+
+
+@pytest.mark.parametrize('size', [2, 3, 4])
+@pytest.mark.parametrize('lock_after_win', [False, True])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_global_board_unmake_move_restores_states(
+        size, lock_after_win, choice_after_win):
+    game_1 = UltimateTicTacToe(size, lock_after_win, choice_after_win)
+    global_board_1 = game_1.global_board()
+    random.seed(size)
+    states = []
+    for sign in cycle('xo'):
+        states.append(deepcopy(global_board_1))
+        if game_1.random_bot(sign):
+            break
+
+    for state in reversed(states):
+        global_board_1.unmake_move()
+        global_board_1.cancel_board_choice()
+        state.cancel_board_choice()
+        assert global_board_1 == state
+        assert global_board_1.zobrist_hash() == state.zobrist_hash()
+        assert global_board_1._win_counts == state._win_counts
+        for board, state_board in zip(
+                global_board_1._local_boards, state._local_boards):
+            assert board.line_counts() == state_board.line_counts()
+            assert board._empty_count == state_board._empty_count
+    assert not global_board_1._history
+
+
+@pytest.mark.parametrize('early_draw', [False, True])
+def test_global_board_dead_position(early_draw):
+    global_board_1 = GlobalBoard(3, False, False, early_draw)
+    assert global_board_1.winnable_lines('x') == list(range(8))
+    assert not global_board_1.dead_position()
+    assert global_board_1.dead_boards() == []
+
+    for board_index, sign in zip(range(1, 9), 'xoxxooox'):
+        global_board_1.local_board(board_index)._win = sign
+    global_board_1.rebuild_state()
+    assert global_board_1.winnable_lines('x') == []
+    assert global_board_1.winnable_lines('o') == []
+    assert global_board_1.dead_position()
+
+    # undecided board 9 can be won by neither player
+    global_board_1.local_board(9)._spots = \
+        ['x', 'o', 'x', 'x', 'o', 'o', 'o', 'x', '']
+    assert global_board_1.dead_boards() == [9]
+    assert global_board_1.global_win_check() == \
+        ('draw' if early_draw else None)
+
+
+def test_global_board_early_draw_rule_flag():
+    global_board_1 = GlobalBoard(3, False, False, True)
+    global_board_2 = GlobalBoard(3, False, False)
+    assert global_board_1 != global_board_2
+    assert hash(global_board_1) != hash(global_board_2)
+    assert global_board_1.zobrist_hash() == global_board_1.compute_hash()
+
+
+@pytest.mark.parametrize('size', [2, 3, 4])
+@pytest.mark.parametrize('lock_after_win', [False, True])
+def test_global_board_early_draw(size, lock_after_win):
+    rng = random.Random(size)
+    for _ in range(5):
+        global_board_1 = GlobalBoard(size, lock_after_win, False, True)
+        global_board_2 = GlobalBoard(size, lock_after_win, False)
+        for sign in cycle('xo'):
+            move = rng.choice(global_board_1.legal_moves())
+            result = global_board_1.play(move, sign)
+            result_2 = global_board_2.play(move, sign)
+            for player in 'xo':
+                assert global_board_1.closed_counts(player) == \
+                    global_board_2.closed_counts(player)
+            assert global_board_1.global_win_check() == result
+            if result:
+                break
+            assert result_2 is None
+
+        assert result == global_board_2.global_win_check() or \
+            result == 'draw' and global_board_2.dead_position()
+
+        # tracked counts are kept up to date by unmake_move()
+        copy = GlobalBoard.from_bytes(global_board_1.to_bytes())
+        assert copy._EARLY_DRAW
+        assert copy._closed_counts == global_board_1._closed_counts
+        while global_board_1.moves():
+            global_board_1.unmake_move()
+            global_board_2.unmake_move()
+            for player in 'xo':
+                assert global_board_1.closed_counts(player) == \
+                    global_board_2.closed_counts(player)
+        assert global_board_1._closed_counts == \
+            GlobalBoard(size, lock_after_win, False, True)._closed_counts
+
+
+def test_global_board_zobrist_hash():
+    global_board_1 = GlobalBoard(3, False, False)
+    assert global_board_1.zobrist_hash() == global_board_1.compute_hash()
+    assert hash(global_board_1) == hash(GlobalBoard(3, False, False))
+    assert hash(global_board_1) != hash(GlobalBoard(3, True, False))
+    assert hash(global_board_1) != hash(GlobalBoard(3, False, True))
+
+    # board choice
+    global_board_1.choose_board(1)
+    assert global_board_1.zobrist_hash() == global_board_1.compute_hash()
+    assert hash(global_board_1) != hash(GlobalBoard(3, False, False))
+    global_board_1.cancel_board_choice()
+    assert hash(global_board_1) == hash(GlobalBoard(3, False, False))
+
+    # the same position reached with different move orders
+    global_board_2 = GlobalBoard(3, False, False)
+    global_board_2.choose_board(1)
+    for spot_index, sign in [(2, 'x'), (1, 'o'), (5, 'x'), (1, 'o')]:
+        global_board_2.make_move(sign, spot_index)
+    global_board_3 = GlobalBoard(3, False, False)
+    global_board_3.choose_board(1)
+    for spot_index, sign in [(5, 'x'), (1, 'o'), (2, 'x'), (1, 'o')]:
+        global_board_3.make_move(sign, spot_index)
+    global_board_2._previous_board_idx = 2
+    assert global_board_2 == global_board_3
+    assert {global_board_2: 1}[global_board_3] == 1
+
+
+@pytest.mark.parametrize('lock_after_win', [False, True])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_global_board_zobrist_hash_matches_compute_hash(
+        lock_after_win, choice_after_win):
+    game_1 = UltimateTicTacToe(3, lock_after_win, choice_after_win)
+    global_board_1 = game_1.global_board()
+    random.seed(1)
+    hashes = []
+    for sign in cycle('xo'):
+        hashes.append(global_board_1.zobrist_hash())
+        result = game_1.random_bot(sign)
+        assert global_board_1.zobrist_hash() == \
+            global_board_1.compute_hash()
+        if result:
+            break
+
+    assert len(set(hashes)) == len(hashes)
+
+
+def test_boards_without_instance_dict():
+    global_board_1 = GlobalBoard(3, False, False)
+    assert not hasattr(global_board_1, '__dict__')
+    assert not hasattr(global_board_1.local_board(1), '__dict__')
+    with pytest.raises(AttributeError):
+        global_board_1.unknown_attribute = 1
+
+    # display constants are shared
+    assert GlobalBoard.HOR_SEP_2 == global_board_1.HOR_SEP_2 == '-'
+    assert 'HL' not in GlobalBoard.__slots__
+
+
+def test_boards_copy_and_pickle():
+    game_1 = UltimateTicTacToe(3, True, False)
+    random.seed(3)
+    for sign in 'xoxoxo':
+        game_1.random_bot(sign)
+    global_board_1 = game_1.global_board()
+    for global_board_2 in (deepcopy(global_board_1),
+                           pickle.loads(pickle.dumps(global_board_1))):
+        assert global_board_2 == global_board_1
+        assert global_board_2.moves() == global_board_1.moves()
+        assert global_board_2.zobrist_hash() == global_board_1.zobrist_hash()
+        assert str(global_board_2) == str(global_board_1)
+
+
+def test_global_board_memory_footprint():
+    global_board_1 = GlobalBoard(3, False, False)
+    footprint = global_board_1.memory_footprint()
+    assert footprint['total'] == sum(
+        size for name, size in footprint.items() if name != 'total')
+    assert footprint['_local_boards'] > 9 * 100
+    assert footprint['_stats'] == 0
+
+    # history grows with moves
+    history_size = footprint['_history']
+    global_board_1.choose_board(1)
+    global_board_1.make_move('x', 5)
+    assert global_board_1.memory_footprint()['_history'] > history_size
+
+    game_1 = UltimateTicTacToe(3, False, False)
+    game_footprint = game_1.memory_footprint()
+    assert game_footprint['game'] > 0
+    assert game_footprint['total'] == \
+        game_1.global_board().memory_footprint()['total'] + \
+        game_footprint['game']
+
+
+def test_move_encoding():
+    assert encode_move(1, 1, 3) == 0
+    assert encode_move(2, 3, 3) == 11
+    assert encode_move(9, 9, 3) == 80
+    for move in range(16):
+        assert encode_move(*decode_move(move, 2), 2) == move
+
+
+@pytest.mark.parametrize('size', [2, 3, 45])
+def test_undo_entry_packing(size):
+    cells = size ** 2
+    entries = [
+        (1, 1, None, None, None, False, None, False),
+        (cells, cells, cells, cells, cells, 'o', 'x', True),
+        (2, cells, 1, cells, None, None, 'o', False),
+        (cells, 1, None, 2, 1, 'x', None, True)
+    ]
+    for entry in entries:
+        packed = pack_undo_entry(size, *entry)
+        assert 0 <= packed < 2 ** 64
+        assert unpack_undo_entry(size, packed) == entry
+
+
+def test_global_board_legal_moves():
+    global_board_1 = GlobalBoard(2, False, False)
+    assert global_board_1.legal_moves() == list(range(16))
+
+    # forced board
+    global_board_1.play(encode_move(1, 3, 2), 'x')
+    assert global_board_1.legal_moves() == [8, 9, 10, 11]
+
+    # chosen board
+    global_board_1.unmake_move()
+    assert global_board_1.legal_moves() == [0, 1, 2, 3]
+    global_board_1.cancel_board_choice()
+    assert global_board_1.legal_moves() == list(range(16))
+
+    # locked and full boards
+    global_board_2 = GlobalBoard(2, True, False)
+    global_board_2.local_board(1)._win = 'x'
+    global_board_2.local_board(4)._full = True
+    assert global_board_2.legal_moves() == [4, 5, 6, 7, 8, 9, 10, 11]
+    global_board_2._previous_spot_idx = 1
+    assert global_board_2.legal_moves() == [4, 5, 6, 7, 8, 9, 10, 11]
+    global_board_2._previous_spot_idx = 2
+    assert global_board_2.legal_moves() == [4, 5, 6, 7]
+
+
+def test_global_board_play():
+    global_board_1 = GlobalBoard(3, False, False)
+    global_board_2 = GlobalBoard(3, False, False)
+    assert global_board_1.play(encode_move(5, 2, 3), 'x') is None
+    global_board_2.choose_board(5)
+    global_board_2.make_move('x', 2)
+    assert global_board_1 == global_board_2
+    assert global_board_1.zobrist_hash() == global_board_2.zobrist_hash()
+
+    with pytest.raises(BoardChoiceError):
+        global_board_1.play(encode_move(3, 1, 3), 'o')
+    with pytest.raises(IndexError):
+        global_board_1.play(81, 'o')
+    with pytest.raises(IndexError):
+        global_board_1.play(-1, 'o')
+    global_board_1.play(encode_move(2, 5, 3), 'o')
+    with pytest.raises(SpotOccupiedError):
+        global_board_1.play(encode_move(5, 2, 3), 'x')
+
+    # board already chosen
+    global_board_3 = GlobalBoard(3, False, False)
+    global_board_3.choose_board(4)
+    with pytest.raises(BoardChoiceError):
+        global_board_3.play(encode_move(5, 1, 3), 'x')
+    global_board_3.play(encode_move(4, 1, 3), 'x')
+    assert global_board_3.moves() == [(4, 1)]
+
+
+def test_global_board_illegal_play_leaves_board_unchanged():
+    global_board_1 = GlobalBoard(3, False, False)
+    with pytest.raises(ValueError):
+        global_board_1.play(encode_move(5, 1, 3), 'z')
+    assert global_board_1 == GlobalBoard(3, False, False)
+    assert global_board_1.zobrist_hash() == global_board_1.compute_hash()
+
+    # free choice after the move sending to a full board
+    global_board_1.choose_board(1)
+    global_board_1.make_move('x', 5)
+    global_board_1.local_board(5)._spots = 4 * ['x', 'o'] + ['x']
+    global_board_1.local_board(5)._full = True
+    global_board_1.rebuild_state()
+    state = deepcopy(global_board_1)
+    with pytest.raises(SpotOccupiedError):
+        global_board_1.play(encode_move(1, 5, 3), 'o')
+    assert global_board_1 == state
+    assert global_board_1.zobrist_hash() == state.zobrist_hash()
+    global_board_1.play(encode_move(2, 1, 3), 'o')
+    assert global_board_1.local_board(2).spot(1) == 'o'
+
+
+@pytest.mark.parametrize('lock_after_win', [False, True])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_global_board_legal_moves_match_two_phase_api(
+        lock_after_win, choice_after_win):
+    random.seed(7)
+    game_1 = UltimateTicTacToe(3, lock_after_win, choice_after_win)
+    global_board_1 = game_1.global_board()
+    for sign in cycle('xo'):
+        board_index = global_board_1.current_board()
+        boards = [board_index] if board_index else \
+            global_board_1.possible_boards()
+        assert global_board_1.legal_moves() == [
+            encode_move(board, spot, 3) for board in boards
+            for spot in global_board_1.local_board(board).possible_moves(
+                lock_after_win)]
+        if global_board_1.play(
+                random.choice(global_board_1.legal_moves()), sign):
+            break
+
+
+@pytest.mark.parametrize('lock_after_win', [False, True])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_global_board_play_unchecked_matches_play(
+        lock_after_win, choice_after_win):
+    rng = random.Random(3)
+    global_board_1 = GlobalBoard(3, lock_after_win, choice_after_win)
+    global_board_2 = GlobalBoard(3, lock_after_win, choice_after_win)
+    states = []
+    for sign in cycle('xo'):
+        states.append(deepcopy(global_board_1))
+        move = rng.choice(global_board_1.legal_moves())
+        result = global_board_1.play_unchecked(move, sign)
+        assert global_board_2.play(move, sign) == result
+        assert global_board_1 == global_board_2
+        assert global_board_1.zobrist_hash() == \
+            global_board_2.zobrist_hash() == global_board_1.compute_hash()
+        assert global_board_1.moves() == global_board_2.moves()
+        if result:
+            break
+
+    for state in reversed(states):
+        global_board_1.unmake_move()
+        assert global_board_1 == state
+        assert global_board_1.zobrist_hash() == state.zobrist_hash()
+
+
+def test_global_board_make_move_validates():
+    global_board_1 = GlobalBoard(3, False, False)
+    with pytest.raises(BoardChoiceError):
+        global_board_1.make_move('x', 1)
+    global_board_1.choose_board(5)
+    global_board_1.make_move('x', 1)
+    global_board_1.make_move('o', 5)
+    with pytest.raises(SpotOccupiedError):
+        global_board_1.make_move('x', 1)
+    with pytest.raises(ValueError):
+        global_board_1.make_move('z', 2)
+    with pytest.raises(IndexError):
+        global_board_1.make_move('x', 10)
+    assert global_board_1.moves() == [(5, 1), (1, 5)]
+    assert global_board_1.current_board() == 5
+
+
+def test_global_board_moves():
+    global_board_1 = GlobalBoard(3, False, False)
+    assert global_board_1.moves() == []
+    global_board_1.choose_board(5)
+    global_board_1.make_move('x', 2)
+    global_board_1.make_move('o', 9)
+    assert global_board_1.moves() == [(5, 2), (2, 9)]
+    global_board_1.unmake_move()
+    assert global_board_1.moves() == [(5, 2)]
+
+
+def test_state_size():
+    assert state_size(2) == 5 + 4 + 2
+    assert state_size(3) == 5 + 21 + 5
+
+
+def test_global_board_to_bytes():
+    global_board_1 = GlobalBoard(2, True, False)
+    assert global_board_1.to_bytes() == bytes([2, 1] + 9 * [0])
+
+    global_board_1.choose_board(3)
+    global_board_1.make_move('o', 2)
+    assert global_board_1.to_bytes() == \
+        bytes([2, 1 | 1 << 2, 2, 3, 0, 0, 0, 8, 0, 0, 0])
+
+    with pytest.raises(ValueError):
+        GlobalBoard(16, False, False).to_bytes()
+
+
+def test_global_board_from_bytes():
+    global_board_1 = GlobalBoard(3, False, True)
+    assert GlobalBoard.from_bytes(global_board_1.to_bytes()) == global_board_1
+
+    with pytest.raises(ValueError):
+        GlobalBoard.from_bytes(global_board_1.to_bytes()[:-1])
+    with pytest.raises(ValueError):
+        GlobalBoard.from_bytes(b'')
+
+
+@pytest.mark.parametrize('size', [2, 3, 4])
+@pytest.mark.parametrize('lock_after_win', [False, True])
+@pytest.mark.parametrize('choice_after_win', [False, True])
+def test_global_board_bytes_round_trip(
+        size, lock_after_win, choice_after_win):
+    game_1 = UltimateTicTacToe(size, lock_after_win, choice_after_win)
+    global_board_1 = game_1.global_board()
+    random.seed(size)
+    for sign in cycle('xo'):
+        data = global_board_1.to_bytes()
+        assert len(data) == state_size(size)
+        decoded = GlobalBoard.from_bytes(data)
+        assert decoded == global_board_1
+        assert decoded.zobrist_hash() == global_board_1.zobrist_hash()
+        assert decoded.win_counts() == global_board_1.win_counts()
+        if game_1.random_bot(sign):
+            break
+
+    # decoded board can continue the game
+    global_board_2 = GlobalBoard.from_bytes(global_board_1.to_bytes())
+    assert global_board_2.global_win_check() == \
+        global_board_1.global_win_check()
+
+
 def test_global_board_if_first_turn():
     global_board_1 = GlobalBoard(3, False, False)
     assert global_board_1.if_first_turn()
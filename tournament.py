@@ -0,0 +1,296 @@
+import os
+from argparse import ArgumentParser
+from collections import namedtuple
+from functools import partial
+from itertools import combinations
+from math import log, log10
+from multiprocessing import Pool
+
+from alphabeta import AlphaBetaBot
+from mcts import MonteCarloBot
+from simulation import play_batch
+from ultimate_tic_tac_toe import GameRulesError
+
+
+INITIAL_RATING = 1500
+K_FACTOR = 16
+
+# colors bots are able to play, other bots play both
+COLORS = {'always_winning_bot': 'x'}
+
+# bots available from the command line besides UltimateTicTacToe methods
+SEARCH_BOTS = {
+    'mcts': partial(MonteCarloBot, iterations=200),
+    'alphabeta': partial(AlphaBetaBot, time_ms=100),
+}
+
+
+class PairingResult(namedtuple('PairingResult', [
+        'bot_1', 'bot_2', 'wins', 'draws', 'losses', 'llr', 'decision'])):
+    """
+    Outcomes of games of a pairing from bot_1's perspective, log-likelihood
+    ratio of SPRT and its decision: 'H1' if bot_1 is stronger by at least
+    elo1, 'H0' if it is not stronger by more than elo0, None if the test
+    was inconclusive, 'unplayable' if the rules don't allow the bots to play
+    """
+
+    def games(self):
+        return self.wins + self.draws + self.losses
+
+    def score(self):
+        if not self.games():
+            return 0.5
+        return (self.wins + self.draws / 2) / self.games()
+
+    def elo_difference(self):
+        return elo_difference(self.score())
+
+
+def expected_score(elo_difference):
+    """Returns expected score of the player rated elo_difference higher"""
+    return 1 / (1 + 10 ** (-elo_difference / 400))
+
+
+def elo_difference(score):
+    """Returns Elo difference corresponding to the score"""
+    if score <= 0:
+        return float('-inf')
+    if score >= 1:
+        return float('inf')
+    return -400 * log10(1 / score - 1)
+
+
+def sprt_llr(wins, draws, losses, elo0, elo1):
+    """
+    Returns log-likelihood ratio of hypotheses H1: Elo difference is elo1
+    and H0: it is elo0, with normal approximation of the score distribution.
+    Half a game is added to every outcome when estimating the variance,
+    so one-sided results don't give zero variance
+    """
+    games = wins + draws + losses
+    if not games:
+        return 0.0
+    score = (wins + draws / 2) / games
+
+    regularized = (wins + 0.5, draws + 0.5, losses + 0.5)
+    total = sum(regularized)
+    variance = sum(count / total * (value - score) ** 2
+                   for count, value in zip(regularized, (1, 0.5, 0)))
+
+    score_0, score_1 = expected_score(elo0), expected_score(elo1)
+    return (score_1 - score_0) * (2 * score - score_0 - score_1) / \
+        (2 * variance / games)
+
+
+def sprt_bounds(alpha, beta):
+    """Returns LLR bounds of accepting H0 and H1"""
+    return log(beta / (1 - alpha)), log((1 - beta) / alpha)
+
+
+def update_ratings(ratings, bot_1, bot_2, wins, draws, losses):
+    """Updates Elo ratings with results of games played together"""
+    games = wins + draws + losses
+    expected = expected_score(ratings[bot_1] - ratings[bot_2])
+    change = K_FACTOR * (wins + draws / 2 - games * expected)
+    ratings[bot_1] += change
+    ratings[bot_2] -= change
+
+
+def play_tournament_batch(batch):
+    """
+    Plays a batch of games like play_batch(). Returns None if the rules
+    don't allow the bots to play
+    """
+    try:
+        return play_batch(batch)
+    except GameRulesError:
+        return None
+
+
+class Tournament:
+    """
+    Class Tournament. Round-robin tournament between bots. Colors alternate
+    between batches of games. Pairing is stopped when SPRT is conclusive
+    or after max_games games.
+    :param  bots:       Bots by name: UltimateTicTacToe method names
+        or picklable factories, see simulation.make_bot()
+    :type   bots:       dict
+    :param  colors:     Colors ('x', 'o' or 'xo') allowed for bots by name
+    :type   colors:     dict
+    :param  ratings:    Running Elo ratings of bots
+    :type   ratings:    dict of floats
+    :param  results:    Results of finished pairings
+    :type   results:    list of PairingResult
+    """
+
+    def __init__(self, bots, size=3, lock_after_win=False,
+                 choice_after_win=False, max_games=1000, batch_size=20,
+                 elo0=0, elo1=50, alpha=0.05, beta=0.05, colors=None,
+                 seed=0):
+        if len(bots) < 2:
+            raise ValueError("Tournament needs at least 2 bots")
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+        if elo0 >= elo1:
+            raise ValueError("elo0 must be lower than elo1")
+
+        self.bots = bots
+        self.colors = COLORS if colors is None else colors
+        self.ratings = {name: float(INITIAL_RATING) for name in bots}
+        self.results = []
+        self._rules = (size, lock_after_win, choice_after_win)
+        self._max_games = max_games
+        self._batch_size = batch_size
+        self._elo0 = elo0
+        self._elo1 = elo1
+        self._bounds = sprt_bounds(alpha, beta)
+        self._seed = seed
+
+    def bot_colors(self, name):
+        return self.colors.get(name, 'xo')
+
+    def pairing_batches(self, bot_1, bot_2):
+        """
+        Yields (batch, bot_1 plays 'x') for play_batch() with colors
+        alternating where the bots allow it
+        """
+        colors_1, colors_2 = self.bot_colors(bot_1), self.bot_colors(bot_2)
+        orders = [order for order, allowed in (
+            (True, 'x' in colors_1 and 'o' in colors_2),
+            (False, 'o' in colors_1 and 'x' in colors_2)) if allowed]
+        if not orders:
+            return
+
+        first_game = batch_number = 0
+        while first_game < self._max_games:
+            games = min(self._batch_size, self._max_games - first_game)
+            bot_1_x = orders[batch_number % len(orders)]
+            bot_x, bot_o = (bot_1, bot_2) if bot_1_x else (bot_2, bot_1)
+            yield (games, self._seed + batch_number, *self._rules,
+                   self.bots[bot_x], self.bots[bot_o]), bot_1_x
+            first_game += games
+            batch_number += 1
+
+    def decision(self, llr):
+        lower, upper = self._bounds
+        if llr <= lower:
+            return 'H0'
+        if llr >= upper:
+            return 'H1'
+        return None
+
+    def play_pairing(self, bot_1, bot_2, run_batch):
+        """
+        Plays games of the pairing. run_batch(batches) yields results
+        of the batches in order and must stop when closed
+        """
+        wins = draws = losses = 0
+        llr, decision = 0.0, None
+        batches = list(self.pairing_batches(bot_1, bot_2))
+        if not batches:
+            decision = 'unplayable'
+
+        results = run_batch(batch for batch, _ in batches)
+        for (_, bot_1_x), result in zip(batches, results):
+            if result is None:
+                decision = 'unplayable'
+                break
+            x_wins, o_wins, batch_draws = result
+            batch_wins, batch_losses = (x_wins, o_wins) if bot_1_x \
+                else (o_wins, x_wins)
+            update_ratings(self.ratings, bot_1, bot_2,
+                           batch_wins, batch_draws, batch_losses)
+            wins += batch_wins
+            draws += batch_draws
+            losses += batch_losses
+
+            llr = sprt_llr(wins, draws, losses, self._elo0, self._elo1)
+            decision = self.decision(llr)
+            if decision:
+                break
+        results.close()
+
+        pairing_result = PairingResult(
+            bot_1, bot_2, wins, draws, losses, llr, decision)
+        self.results.append(pairing_result)
+        return pairing_result
+
+    def run(self, workers=None):
+        """
+        Plays all pairings. Batches are played in worker processes,
+        at most 2 per worker are queued ahead of SPRT decisions.
+        Returns list of PairingResult
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        pairings = list(combinations(self.bots, 2))
+
+        if workers == 1:
+            def run_serially(batches):
+                for batch in batches:
+                    yield play_tournament_batch(batch)
+
+            for bot_1, bot_2 in pairings:
+                self.play_pairing(bot_1, bot_2, run_serially)
+            return self.results
+
+        with Pool(workers) as pool:
+            def run_batches(batches):
+                # results are read in order, later batches run meanwhile
+                pending = []
+                try:
+                    for batch in batches:
+                        pending.append(pool.apply_async(
+                            play_tournament_batch, (batch,)))
+                        if len(pending) >= 2 * workers:
+                            yield pending.pop(0).get()
+                    while pending:
+                        yield pending.pop(0).get()
+                finally:
+                    # results of batches after a decision are not used
+                    pending.clear()
+
+            for bot_1, bot_2 in pairings:
+                self.play_pairing(bot_1, bot_2, run_batches)
+        return self.results
+
+    def standings(self):
+        """Returns (name, rating) pairs sorted from the best bot"""
+        return sorted(self.ratings.items(), key=lambda item: -item[1])
+
+
+def resolve_bot(name):
+    return SEARCH_BOTS.get(name, name)
+
+
+def main():
+    parser = ArgumentParser(description='Round-robin tournament of bots')
+    parser.add_argument('bots', nargs='+',
+                        help='UltimateTicTacToe bot methods or '
+                        f'{", ".join(SEARCH_BOTS)}')
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--lock-after-win', action='store_true')
+    parser.add_argument('--choice-after-win', action='store_true')
+    parser.add_argument('--max-games', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=20)
+    parser.add_argument('--elo0', type=float, default=0)
+    parser.add_argument('--elo1', type=float, default=50)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    tournament = Tournament(
+        {name: resolve_bot(name) for name in args.bots}, args.size,
+        args.lock_after_win, args.choice_after_win, args.max_games,
+        args.batch_size, args.elo0, args.elo1, seed=args.seed)
+    for result in tournament.run(args.workers):
+        print(f'{result.bot_1} vs {result.bot_2}: +{result.wins} '
+              f'={result.draws} -{result.losses} '
+              f'elo {result.elo_difference():+.0f} '
+              f'llr {result.llr:.2f} {result.decision or "inconclusive"}')
+    for name, rating in tournament.standings():
+        print(f'{name:<25} {rating:>7.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+
+# kinds of stored values
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+TableEntry = namedtuple(
+    'TableEntry', ['key', 'depth', 'value', 'flag', 'move', 'generation'])
+
+
+class TranspositionTable:
+    """
+    Class TranspositionTable. Fixed size table of search results
+    indexed with GlobalBoard.zobrist_hash(). Every key maps to one slot.
+    An occupied slot is replaced by an entry of the same position,
+    of at least the same depth or when the old entry comes
+    from an earlier search (see new_search()).
+    :param  _entries:       Slots of the table
+    :type   _entries:       list of TableEntry/None
+    :param  _generation:    Number of the current search
+    :type   _generation:    int
+    """
+
+    def __init__(self, capacity=2 ** 16):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        self._entries = capacity * [None]
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def capacity(self):
+        return len(self._entries)
+
+    def new_search(self):
+        """Marks all stored entries as replaceable"""
+        self._generation += 1
+
+    def lookup(self, key):
+        """Returns TableEntry stored for the key or None"""
+        entry = self._entries[key % len(self._entries)]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, value, flag=EXACT, move=None):
+        """Stores the entry unless the slot holds a more valuable one.
+        Returns True if the entry was stored"""
+        index = key % len(self._entries)
+        old_entry = self._entries[index]
+        if old_entry is not None and old_entry.key != key and \
+                old_entry.depth > depth and \
+                old_entry.generation == self._generation:
+            return False
+
+        self._entries[index] = TableEntry(
+            key, depth, value, flag, move, self._generation)
+        return True
+
+    def clear(self):
+        self._entries = len(self._entries) * [None]
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return sum(entry is not None for entry in self._entries)
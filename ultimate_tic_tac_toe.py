@@ -1,6 +1,12 @@
 import random
+import sys
+from array import array
 from typing import Callable, Optional
 from itertools import cycle
+from functools import lru_cache
+from math import isqrt
+from collections import namedtuple
+from time import perf_counter
 
 
 class BoardLockedError(Exception):
@@ -28,41 +34,449 @@ class GameRulesError(Exception):
         super().__init__(message)
 
 
+class UndoError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
 def elements_equal(elements_list: list):
     return elements_list.count(elements_list[0]) == len(elements_list)
 
 
+@lru_cache(maxsize=None)
+def line_indexes(size):
+    """
+    For each 0-based spot index returns indexes of the lines passing
+    through it. Lines are numbered: rows from 0, columns from size,
+    left diagonal 2 * size and right diagonal 2 * size + 1
+    """
+    lines = []
+    for index in range(size ** 2):
+        row, clmn = index // size, index % size
+        spot_lines = [row, size + clmn]
+        if row == clmn:
+            spot_lines.append(2 * size)
+        if row + clmn == size - 1:
+            spot_lines.append(2 * size + 1)
+        lines.append(tuple(spot_lines))
+    return tuple(lines)
+
+
+ZobristKeys = namedtuple(
+    'ZobristKeys',
+    ['spots', 'previous_spot', 'board_choice', 'lock_after_win',
+     'choice_after_win', 'last_won', 'early_draw']
+)
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size):
+    """
+    Returns random 64-bit keys used for hashing global boards of given size.
+    Spot keys are indexed with sign and (board - 1) * size ** 2 + spot - 1,
+    previous spot and board choice keys with index (0 stands for None,
+    the key of no board choice is 0)
+    """
+    rng = random.Random(size)
+    spots_count = size ** 4
+
+    def keys(count): return [rng.getrandbits(64) for _ in range(count)]
+
+    return ZobristKeys(
+        spots={'x': keys(spots_count), 'o': keys(spots_count)},
+        previous_spot=keys(size ** 2 + 1),
+        board_choice=[0] + keys(size ** 2),
+        lock_after_win=rng.getrandbits(64),
+        choice_after_win=rng.getrandbits(64),
+        last_won=rng.getrandbits(64),
+        early_draw=rng.getrandbits(64)
+    )
+
+
+def scan_winner(spots, size):
+    """
+    Returns sign having a full line on the board with given spots,
+    None if there is no such sign. Lines are checked in the order
+    of LocalBoard.local_win_check() and the last full line wins
+    """
+    winner = None
+    for i in range(size):
+        # horizonally
+        hor_line = spots[(i * size):((i + 1) * size)]
+        if hor_line[0] and elements_equal(hor_line):
+            winner = hor_line[0]
+
+        # vertically
+        ver_line = spots[i::size]
+        if ver_line[0] and elements_equal(ver_line):
+            winner = ver_line[0]
+
+    # diagonally left (\)
+    diagonal_left = spots[::(size + 1)]
+    if diagonal_left[0] and elements_equal(diagonal_left):
+        winner = diagonal_left[0]
+
+    # diagonally right (/)
+    diagonal_right = spots[(size - 1):(size ** 2 - 1):(size - 1)]
+    if diagonal_right[0] and elements_equal(diagonal_right):
+        winner = diagonal_right[0]
+
+    return winner
+
+
+class LocalStateTable(namedtuple(
+        'LocalStateTable', ['size', 'winners', 'full', 'moves', 'winnable'])):
+    """
+    Table of all local board states of given size, see local_state_table().
+    Shared by all boards of the size, so copies and pickles refer to it
+    """
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return local_state_table, (self.size,)
+
+
+# local boards up to this size use precomputed LocalStateTable
+LOCAL_TABLE_MAX_SIZE = 3
+
+
+@lru_cache(maxsize=None)
+def local_state_table(size):
+    """
+    Returns LocalStateTable of all 3 ** (size ** 2) spot configurations
+    of a local board, indexed with state index: sum of SPOT_CODES of spots
+    multiplied by 3 ** (spot index - 1). For every state it holds winner
+    (as in scan_winner()), fullness, tuple of 1-based empty spot indexes
+    and, for each sign, if it has a line without the opponent's sign.
+    Built at the first call
+    """
+    spots_count = size ** 2
+    masks_count = 1 << spots_count
+    full_mask = masks_count - 1
+
+    # line masks in the order of lines checked by scan_winner()
+    lines = []
+    for i in range(size):
+        lines.append(sum(1 << (i * size + j) for j in range(size)))
+        lines.append(sum(1 << (j * size + i) for j in range(size)))
+    lines.append(sum(1 << (i * (size + 1)) for i in range(size)))
+    lines.append(sum(1 << ((i + 1) * (size - 1)) for i in range(size)))
+
+    # for every mask of one sign's spots: number of the last full line
+    # (0 if none) and if any line has no spot of the mask
+    last_line, open_line = [], []
+    for mask in range(masks_count):
+        last_line.append(max(
+            (number for number, line in enumerate(lines, 1)
+             if mask & line == line), default=0))
+        open_line.append(any(not mask & line for line in lines))
+    empty_spots = [
+        tuple(spot + 1 for spot in range(spots_count) if mask >> spot & 1)
+        for mask in range(masks_count)]
+
+    # masks of the state are the masks of the state without the first spot
+    # shifted by one spot
+    states_count = 3 ** spots_count
+    x_masks, o_masks = [0] * states_count, [0] * states_count
+    for state in range(1, states_count):
+        rest, code = divmod(state, 3)
+        x_masks[state] = x_masks[rest] << 1 | (code == 1)
+        o_masks[state] = o_masks[rest] << 1 | (code == 2)
+
+    winners, full, moves = [], [], []
+    winnable = {'x': [], 'o': []}
+    for x_mask, o_mask in zip(x_masks, o_masks):
+        x_line, o_line = last_line[x_mask], last_line[o_mask]
+        winners.append('x' if x_line > o_line else 'o' if o_line else None)
+        empty_mask = full_mask & ~(x_mask | o_mask)
+        full.append(not empty_mask)
+        moves.append(empty_spots[empty_mask])
+        winnable['x'].append(open_line[o_mask])
+        winnable['o'].append(open_line[x_mask])
+    return LocalStateTable(
+        size, tuple(winners), tuple(full), tuple(moves),
+        {sign: tuple(values) for sign, values in winnable.items()})
+
+
+def encode_move(board_index, spot_index, size):
+    """
+    Returns move on the spot of the local board encoded as a single int:
+    (board index - 1) * size ** 2 + spot index - 1
+    """
+    return (board_index - 1) * size ** 2 + spot_index - 1
+
+
+def decode_move(move, size):
+    """Returns (board index, spot index) of the move from encode_move()"""
+    board_number, spot_number = divmod(move, size ** 2)
+    return board_number + 1, spot_number + 1
+
+
+# codes of values in serialized states
+SPOT_CODES = {'': 0, 'x': 1, 'o': 2}
+SIGNS_BY_CODE = ['', 'x', 'o']
+WIN_CODES = {None: 0, 'x': 1, 'o': 2}
+LAST_WON_VALUES = [False, None, 'x', 'o']
+WIN_VALUES = [None, 'x', 'o']
+LAST_WON_CODES = {value: code for code, value in enumerate(LAST_WON_VALUES)}
+STATE_HEADER_SIZE = 5
+MAX_SERIALIZED_SIZE = 15
+
+
+@lru_cache(maxsize=None)
+def undo_field_bits(size):
+    """Returns number of bits of a 1-based index in packed undo entries"""
+    return (size ** 2).bit_length()
+
+
+def pack_undo_entry(size, board_index, spot_index, previous_spot_idx,
+                    previous_board_idx, board_choice, last_won, local_win,
+                    local_full):
+    """
+    Returns undo entry of GlobalBoard packed into a single int: codes
+    of local board full flag, local board win and last won followed
+    by indexes of board choice, the previous move and the move
+    (0 for None). Entries of boards up to size 45 fit in 64 bits
+    """
+    bits = undo_field_bits(size)
+    return ((((board_index << bits | spot_index) << bits |
+              (previous_board_idx or 0)) << bits |
+             (previous_spot_idx or 0)) << bits | (board_choice or 0)) << 5 | \
+        LAST_WON_CODES[last_won] << 3 | WIN_CODES[local_win] << 1 | \
+        local_full
+
+
+def unpack_undo_entry(size, entry):
+    """
+    Returns (board index, spot index, previous spot index, previous board
+    index, board choice, last won, local win, local full) of an entry
+    from pack_undo_entry()
+    """
+    bits = undo_field_bits(size)
+    mask = (1 << bits) - 1
+    indexes = entry >> 5
+    return (
+        indexes >> 4 * bits, indexes >> 3 * bits & mask,
+        (indexes >> bits & mask) or None, (indexes >> 2 * bits & mask) or None,
+        (indexes & mask) or None, LAST_WON_VALUES[entry >> 3 & 3],
+        WIN_VALUES[entry >> 1 & 3], entry & 1 == 1)
+
+
+def state_size(size):
+    """
+    Returns number of bytes of a serialized GlobalBoard of given size:
+    header, 2 bits per spot and 4 bits of win and full flags per board
+    """
+    return STATE_HEADER_SIZE + (size ** 4 + 3) // 4 + (size ** 2 + 1) // 2
+
+
+class LocalLayout(namedtuple(
+        'LocalLayout', ['size', 'lines', 'powers', 'state_table'])):
+    """
+    Values shared by all local boards of given size, see local_layout().
+    Copies and pickles refer to it like to LocalStateTable
+    """
+
+    __slots__ = ()
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return local_layout, (self.size, self.state_table is not None)
+
+
+@lru_cache(maxsize=None)
+def local_layout(size, use_state_table):
+    """
+    Returns LocalLayout of local boards of given size: the size,
+    line_indexes(), powers of 3 of spots in the state index and, if
+    use_state_table and size is up to LOCAL_TABLE_MAX_SIZE,
+    local_state_table() (None otherwise)
+    """
+    if size <= 0:
+        raise ValueError("Size must be positive.")
+    state_table = None
+    if use_state_table and size <= LOCAL_TABLE_MAX_SIZE:
+        state_table = local_state_table(size)
+    return LocalLayout(
+        size, line_indexes(size),
+        tuple(3 ** index for index in range(size ** 2)), state_table)
+
+
+@lru_cache(maxsize=1024)
+def cached_row_strs(spots, sep):
+    """Returns row strings of LocalBoard.row_strs() for a tuple of spots"""
+    size = isqrt(len(spots))
+    return tuple(' ' + f' {sep} '.join(
+        f'{spot:1}' for spot in spots[(row * size):((row + 1) * size)]) + ' '
+        for row in range(size))
+
+
 class LocalBoard():
     """
     Class LocalBoard. Enables playing on it as a normal tic-tac-toe:
-    :param  _spots: 9 spots available to put "o" or "x" sign in
+    :param  _spots: 9 spots available to put "o" or "x" sign in.
+        Assigning a new list resets _line_counts
     :type   _spots: list of strings
     :param  _win:   Indicates if any player has already won this board
     :type   _win:   None/boolean
     :param  _full:  Indicates if the board is full
     :type   _full:  boolean
+    :param  _line_counts:   Number of signs of each player in every line,
+        built at the first use (None before)
+    :type   _line_counts:   dict of lists of ints/None
+    :param  _empty_count:   Number of empty spots
+    :type   _empty_count:   int
+    :param  _state_index:   Index of the spots in LocalStateTable,
+        valid like _line_counts if the table is used
+    :type   _state_index:   int
+    :param  _layout:    Size and lookups shared by boards of the size
+    :type   _layout:    LocalLayout
     """
 
+    __slots__ = (
+        '_spot_list', '_win', '_full', '_line_counts', '_empty_count',
+        '_state_index', '_layout'
+    )
+
+    # if boards up to LOCAL_TABLE_MAX_SIZE use local_state_table()
+    _USE_STATE_TABLE = True
+
     def __init__(self, size):
+        self._layout = local_layout(size, self._USE_STATE_TABLE)
         self._spots: list = size ** 2 * ['']
         self._win = None
         self._full = False
+        self._empty_count = None
+        self._state_index = None
 
-        if size <= 0:
-            raise ValueError("Size must be positive.")
-        self._SIZE = size
+    @property
+    def _SIZE(self):
+        return self._layout.size
+
+    @property
+    def _spots(self):
+        return self._spot_list
+
+    @_spots.setter
+    def _spots(self, spots):
+        self._spot_list = spots
+        self._line_counts = None
 
     def spot(self, spot_index):
-        if not (1 <= spot_index <= self._SIZE ** 2):
+        if not (1 <= spot_index <= self._layout.size ** 2):
             raise IndexError("Wrong spot index")
-        return self._spots[spot_index - 1]
+        return self.spot_unchecked(spot_index)
+
+    def spot_unchecked(self, spot_index):
+        """spot() without index validation, for trusted callers"""
+        return self._spot_list[spot_index - 1]
 
     def set_spot(self, spot_index, spot_value):
-        if not (1 <= spot_index <= self._SIZE ** 2):
+        if not (1 <= spot_index <= self._layout.size ** 2):
             raise IndexError("Wrong spot index")
         if 'x' != spot_value != 'o':
             raise ValueError("Wrong spot value")
-        self._spots[spot_index - 1] = spot_value
+        self.set_spot_unchecked(spot_index, spot_value)
+
+    def set_spot_unchecked(self, spot_index, spot_value):
+        """set_spot() without validation, for trusted callers"""
+        line_counts = self.line_counts()
+        layout = self._layout
+        lines = layout.lines[spot_index - 1]
+        previous_value = self._spot_list[spot_index - 1]
+        if previous_value:
+            for line in lines:
+                line_counts[previous_value][line] -= 1
+        else:
+            self._empty_count -= 1
+        for line in lines:
+            line_counts[spot_value][line] += 1
+        if layout.state_table is not None:
+            self._state_index += (SPOT_CODES[spot_value] -
+                                  SPOT_CODES[previous_value]) * \
+                layout.powers[spot_index - 1]
+
+        self._spot_list[spot_index - 1] = spot_value
+
+    def clear_spot(self, spot_index):
+        if not (1 <= spot_index <= self._layout.size ** 2):
+            raise IndexError("Wrong spot index")
+        self.clear_spot_unchecked(spot_index)
+
+    def clear_spot_unchecked(self, spot_index):
+        """clear_spot() without validation, for trusted callers"""
+        line_counts = self.line_counts()
+        layout = self._layout
+        previous_value = self._spot_list[spot_index - 1]
+        if previous_value:
+            for line in layout.lines[spot_index - 1]:
+                line_counts[previous_value][line] -= 1
+            self._empty_count += 1
+            if layout.state_table is not None:
+                self._state_index -= \
+                    SPOT_CODES[previous_value] * layout.powers[spot_index - 1]
+
+        self._spot_list[spot_index - 1] = ''
+
+    def line_counts(self):
+        """
+        Returns number of signs of each player in every line.
+        Counts are rebuilt only if _spots list has been replaced
+        """
+        if self._line_counts is None:
+            size = self._layout.size
+            spots = self._spots
+            line_counts = {'x': [0] * (2 * size + 2), 'o': [0] * (2 * size + 2)}
+            for spot, lines in zip(spots, self._layout.lines):
+                if spot:
+                    for line in lines:
+                        line_counts[spot][line] += 1
+            self._line_counts = line_counts
+            self._empty_count = spots.count('')
+            if self._layout.state_table is not None:
+                self._state_index = self.compute_state_index()
+        return self._line_counts
+
+    def compute_state_index(self):
+        return sum(SPOT_CODES[spot] * 3 ** index
+                   for index, spot in enumerate(self._spots))
+
+    def state_index(self):
+        """
+        Returns index of the spots in local_state_table().
+        Kept up to date only by boards using the table
+        """
+        if self._layout.state_table is None:
+            return self.compute_state_index()
+        self.line_counts()
+        return self._state_index
+
+    def winnable(self, sign):
+        """Checks if sign has a line without any of the opponent's signs"""
+        state_table = self._layout.state_table
+        if state_table is not None:
+            return state_table.winnable[sign][self.state_index()]
+        opponent_counts = self.line_counts()['o' if sign == 'x' else 'x']
+        return not all(opponent_counts)
+
+    def dead(self):
+        """Checks if the board is undecided and neither player can win it"""
+        return not self._win and not self.winnable('x') and \
+            not self.winnable('o')
+
+    def open_for(self, sign):
+        """Checks if the board is won by sign or sign can still win it"""
+        return self._win == sign or not self._win and self.winnable(sign)
 
     def win(self):
         return self._win
@@ -73,9 +487,12 @@ class LocalBoard():
     def possible_moves(self, lock_after_win):
         if self._win and lock_after_win or self._full:
             return []
+        state_table = self._layout.state_table
+        if state_table is not None:
+            return list(state_table.moves[self.state_index()])
 
         empty_spots = []
-        for index, spot in enumerate(self._spots):
+        for index, spot in enumerate(self._spot_list):
             if not spot:
                 empty_spots.append(index + 1)
 
@@ -83,17 +500,38 @@ class LocalBoard():
 
     def make_move(self, spot_index, sign):
         """Allows making move on local board. Returns local_win_check()"""
-        if not 1 <= spot_index <= self._SIZE ** 2:
+        if not 1 <= spot_index <= self._layout.size ** 2:
             raise IndexError("Wrong spot index")
         if 'x' != sign != 'o':
             raise ValueError("Wrong spot sign")
-        if self.spot(spot_index):
+        if self.spot_unchecked(spot_index):
             raise SpotOccupiedError(spot_index)
+        return self.make_move_unchecked(spot_index, sign)
 
-        self.set_spot(spot_index, spot_value=sign)
+    def make_move_unchecked(self, spot_index, sign):
+        """
+        make_move() for trusted callers, like bots making moves returned
+        by possible_moves(). The spot must be a valid empty one
+        """
+        self.set_spot_unchecked(spot_index, sign)
 
-        self.full_check()
-        return self.local_win_check()
+        self._full = not self._empty_count
+        return self.move_win_check(spot_index, sign)
+
+    def move_win_check(self, spot_index, sign):
+        """Checks for a win only in lines passing through the given spot
+        and sets _win attribute if needed. Same as local_win_check()
+        provided that sign was the last one put on the spot"""
+        if self._win:
+            return None
+
+        line_counts = self.line_counts()[sign]
+        size = self._layout.size
+        for line in self._layout.lines[spot_index - 1]:
+            if line_counts[line] == size:
+                self._win = sign
+                break
+        return self.win()
 
     def local_win_check(self):
         """Checks for a win and sets _win attribute if needed.
@@ -102,39 +540,25 @@ class LocalBoard():
         if self._win:
             return None
 
-        size = self._SIZE
-        for i in range(size):
-            # horizonally
-            hor_line = [
-                spot for spot in self._spots[(i * size):((i + 1) * size)]]
-            if hor_line[0] and elements_equal(hor_line):
-                self._win = hor_line[0]
-
-            # vertically
-            ver_line = [spot for spot in self._spots[i::size]]
-            if ver_line[0] and elements_equal(ver_line):
-                self._win = ver_line[0]
-
-        # diagonally left (\)
-        diagonal_left = [spot for spot in self._spots[::(size + 1)]]
-        if diagonal_left[0] and elements_equal(diagonal_left):
-            self._win = diagonal_left[0]
-
-        # diagonally right (/)
-        diagonal_right = [
-            spot for spot in self._spots[(size - 1):(size ** 2 - 1):(size - 1)]
-        ]
-        if diagonal_right[0] and elements_equal(diagonal_right):
-            self._win = diagonal_right[0]
-
+        state_table = self._layout.state_table
+        if state_table is not None:
+            winner = state_table.winners[self.state_index()]
+        else:
+            winner = scan_winner(self._spots, self._layout.size)
+        if winner:
+            self._win = winner
         return self.win()
 
     def full_check(self):
-        self._full = all(self._spots)
+        state_table = self._layout.state_table
+        if state_table is not None:
+            self._full = state_table.full[self.state_index()]
+        else:
+            self._full = all(self._spots)
         return self._full
 
     def row_str(self, row, sep, highlight=None):
-        size = self._SIZE
+        size = self._layout.size
         if not 0 <= row < size:
             raise IndexError("Wrong row index")
 
@@ -149,9 +573,17 @@ class LocalBoard():
 
         return ' ' + f' {sep} '.join(formated_spots) + ' '
 
+    def row_strs(self, sep):
+        """
+        Returns tuple of row_str() of all rows without highlight.
+        Shared by boards with the same spots, see cached_row_strs()
+        """
+        return cached_row_strs(tuple(self._spots), sep)
+
     def __eq__(self, other):
         return self._spots == other._spots and self._win == other._win and \
-            self._full == other._full and self._SIZE == other._SIZE
+            self._full == other._full and \
+            self._layout.size == other._layout.size
 
 
 class GlobalBoard:
@@ -167,26 +599,61 @@ class GlobalBoard:
     :type   _previous_spot_idx:     int/None
     :param  _previous_spot_idx:     Local board index on which last move was made
     :type   _previous_spot_idx:     int/None
+    :param  _history:   Undo stack with one entry per move: the move
+        and the state overwritten by it, see pack_undo_entry()
+    :type   _history:   array of ints
+    :param  _hash:  Zobrist hash of the position, updated with every move
+    :type   _hash:  int
+    :param  _EARLY_DRAW:    Constant indicating if the game ends
+        with a draw as soon as neither player can win, see dead_position().
+        Boards open for each player are tracked then
+    :type   _EARLY_DRAW:    boolean
     """
 
-    def __init__(self, size, lock_after_win, choice_after_win):
+    __slots__ = (
+        '_local_boards', '_LOCK_AFTER_WIN', '_CHOICE_AFTER_WIN',
+        '_previous_spot_idx', '_previous_board_idx', '_board_choice',
+        '_last_won', '_SIZE', '_win_counts', '_history', '_hash',
+        '_stats', '_EARLY_DRAW', '_open_boards', '_closed_counts'
+    )
+
+    # class used to create local boards, overridden by other backends
+    _LOCAL_BOARD_CLASS = LocalBoard
+
+    # strings used for displaying
+    # HOR_SEP = '-'
+    HOR_SEP_2 = '-'
+    VER_SEP = ':'
+    VER_SEP_2 = '|'
+    HL = '#'
+
+    def __init__(self, size, lock_after_win, choice_after_win,
+                 early_draw=False):
+        # GameStats counting calls, see enable_stats()
+        self._stats = None
         self._local_boards = []
         for _ in range(size ** 2):
-            self._local_boards.append(LocalBoard(size))
+            self._local_boards.append(self._LOCAL_BOARD_CLASS(size))
         self._LOCK_AFTER_WIN = lock_after_win
         self._CHOICE_AFTER_WIN = choice_after_win
+        self._EARLY_DRAW = early_draw
         self._previous_spot_idx = None
         self._previous_board_idx = None
         self._board_choice = None
         self._last_won = False
         self._SIZE = size
-
-        # strings used for displaying
-        # HOR_SEP = '-'
-        self.HOR_SEP_2 = '-'
-        self.VER_SEP = ':'
-        self.VER_SEP_2 = '|'
-        self.HL = '#'
+        # number of local boards won by each player in every global line
+        self._win_counts = {
+            'x': [0] * (2 * size + 2), 'o': [0] * (2 * size + 2)}
+        self._history = array('Q')
+        self._hash = self.compute_hash()
+        # local boards open for each player (see LocalBoard.open_for())
+        # and number of boards closed for each player in every global line,
+        # tracked only with _EARLY_DRAW
+        self._open_boards = None
+        self._closed_counts = None
+        if self._EARLY_DRAW:
+            self.rebuild_open_boards()
 
     def local_board(self, local_board_index) -> LocalBoard:
         if not (1 <= local_board_index <= self._SIZE ** 2):
@@ -321,23 +788,22 @@ class GlobalBoard:
     def map_of_wins(self):
         size = self._SIZE
         def separator(sep): return (2 * size + 1) * sep
-        final_str = ''
 
-        # separator
-        final_str += separator('_') + '\n'
-
-        # rows of wins
-        for i in range(size):
-            final_str += self.row_of_wins(i)
-            final_str += '\n'
+        # separator, rows of wins and separator
+        lines = [separator('_')]
+        lines.extend(self.row_of_wins(i) for i in range(size))
+        lines.append(separator('^'))
+        return '\n'.join(lines)
 
-        # separator
-        final_str += separator('^')
-        return final_str
+    def cached_separator_row(self, highlight=None):
+        """Returns separator_row(), computed once for every highlight"""
+        return cached_separator_row(type(self), self._SIZE, highlight)
 
     def __str__(self) -> str:
         """
         Prints global board and highlits one of the local boards if needed.
+        Rows of local boards come from their caches
+        and the whole string is joined once.
         """
         if self._board_choice is None:
             highlight = self.current_board()
@@ -346,40 +812,59 @@ class GlobalBoard:
 
         highlight_row, highlight_clmn = self.row_clmn_split(highlight)
 
+        # local board and its row with the last move
+        last_board = last_row = None
+        if self._previous_spot_idx is not None and \
+                self._previous_board_idx is not None:
+            last_board = self._previous_board_idx - 1
+            last_row, last_clmn = self.row_clmn_split(self._previous_spot_idx)
+
         size = self._SIZE
-        final_str = ''
+        parts = []
         # {size} rows of local boards
         for row in range(size + 1):
             # Thick horizontal line
             if highlight and \
                     self.compare(row, highlight_row + 0.5):
-                final_str += self.separator_row(highlight_clmn)
+                parts.append(self.cached_separator_row(highlight_clmn))
             else:
-                final_str += self.separator_row()
-            final_str += '\n'
+                parts.append(self.cached_separator_row())
+            parts.append('\n')
 
             if row == size:
                 break
 
+            # local boards borders
+            borders = (size + 1) * [self.VER_SEP_2]
+            if highlight and row == highlight_row:
+                borders[highlight_clmn] = self.HL
+                borders[highlight_clmn + 1] = self.HL
+
+            boards = self._local_boards[row * size:(row + 1) * size]
+            boards_rows = [board.row_strs(self.VER_SEP) for board in boards]
             for local_row in range(size):
-                if highlight and \
-                        row == highlight_row:
-                    final_str += self.row_of_spots(
-                        size * row + local_row, highlight_clmn)
-                else:
-                    final_str += self.row_of_spots(
-                        size * row + local_row)
-                final_str += '\n'
+                for clmn in range(size):
+                    parts.append(borders[clmn])
+                    if row * size + clmn == last_board and \
+                            local_row == last_row:
+                        parts.append(boards[clmn].row_str(
+                            local_row, self.VER_SEP, last_clmn))
+                    else:
+                        parts.append(boards_rows[clmn][local_row])
+                parts.append(borders[size])
+                parts.append('\n')
 
         # map of wins
-        final_str += self.map_of_wins()
-        return final_str
+        parts.append(self.map_of_wins())
+        return ''.join(parts)
 
     def possible_boards(self):
         """
         Returns a list of local boards indexes
         on which making a move is still possible
         """
+        if self._stats is not None:
+            self._stats.count('possible_boards')
         boards_indexes = []
         for index, board in enumerate(self._local_boards):
             if board.if_move_possible(self._LOCK_AFTER_WIN):
@@ -401,6 +886,66 @@ class GlobalBoard:
             raise BoardLockedError(board_index)
 
         self._board_choice = board_index
+        self._hash ^= zobrist_keys(self._SIZE).board_choice[board_index]
+
+    def legal_moves(self):
+        """
+        Returns moves possible in the current position encoded with
+        encode_move(). Covers forced boards, chosen board and free choice
+        """
+        if self._stats is not None:
+            self._stats.count('legal_moves')
+        spots_count = self._SIZE ** 2
+        board_index = self._board_choice or self.current_board()
+        boards_indexes = [board_index] if board_index is not None \
+            else self.possible_boards()
+
+        moves = []
+        for board_index in boards_indexes:
+            if self._stats is not None:
+                self._stats.count('possible_moves')
+            offset = (board_index - 1) * spots_count - 1
+            moves.extend(offset + spot_index for spot_index in
+                         self._local_boards[board_index - 1].possible_moves(
+                             self._LOCK_AFTER_WIN))
+        return moves
+
+    def play(self, move, sign):
+        """
+        Makes move encoded with encode_move(), choosing its board first
+        if the player has a free choice. Returns result of make_move()
+        """
+        spots_count = self._SIZE ** 2
+        if not 0 <= move < spots_count ** 2:
+            raise IndexError("Invalid move")
+        board_index = move // spots_count + 1
+
+        if self._board_choice is None:
+            current_board = self.current_board()
+            if current_board is None:
+                self.choose_board(board_index)
+                try:
+                    return self.make_move(sign, move % spots_count + 1)
+                except Exception:
+                    # illegal move leaves the board unchanged
+                    self.cancel_board_choice()
+                    raise
+            elif board_index != current_board:
+                raise BoardChoiceError(
+                    'Player not permitted to choose the board')
+        elif board_index != self._board_choice:
+            raise BoardChoiceError('Board already chosen')
+        return self.make_move(sign, move % spots_count + 1)
+
+    def play_unchecked(self, move, sign):
+        """
+        play() for trusted callers. The move must be one of legal_moves().
+        A free board choice is not recorded, revert the move with
+        unmake_move() like a move made with play()
+        """
+        spots_count = self._SIZE ** 2
+        return self.make_move_unchecked(
+            sign, move // spots_count + 1, move % spots_count + 1)
 
     def save_last_move(self, spot_index, board_index):
         self._previous_spot_idx = spot_index
@@ -412,25 +957,286 @@ class GlobalBoard:
         if not 1 <= spot_index <= self._SIZE ** 2:
             raise IndexError("Invalid spot index")
 
-        if self.current_board() is None and self._board_choice is None:
-            raise BoardChoiceError('Attmept to make move without board chosen')
-
         # set board_choice
         board_index = self.current_board()
         if board_index is None:
             board_index = self._board_choice
+        if board_index is None:
+            raise BoardChoiceError('Attmept to make move without board chosen')
+
+        if self._local_boards[board_index - 1].spot_unchecked(spot_index):
+            raise SpotOccupiedError(spot_index)
+        return self.make_move_unchecked(sign, board_index, spot_index)
+
+    def make_move_unchecked(self, sign, board_index, spot_index):
+        """
+        make_move() for trusted callers, like bots and simulators making
+        moves returned by legal_moves(). Nothing is validated: the board
+        must be the current, the chosen or, with free choice, an open one
+        and the spot must be empty. Returns global win status
+        """
+        if self._stats is not None:
+            self._stats.count('make_move')
+            self._stats.count('local_move_win_check')
 
         # make actual move
-        previous_board: LocalBoard = self.local_board(board_index)
-        self._last_won = previous_board.make_move(spot_index, sign)
+        size = self._SIZE
+        move = (board_index - 1) * size ** 2 + spot_index - 1
+        previous_board: LocalBoard = self._local_boards[board_index - 1]
+        undo_entry = pack_undo_entry(
+            size, board_index, spot_index,
+            self._previous_spot_idx, self._previous_board_idx,
+            self._board_choice, self._last_won,
+            previous_board._win, previous_board._full)
+        last_won = self._last_won
+        self._last_won = previous_board.make_move_unchecked(spot_index, sign)
+        self._history.append(undo_entry)
+
+        # update hash
+        keys = zobrist_keys(size)
+        self._hash ^= \
+            keys.spots[sign][move] ^ \
+            keys.previous_spot[self._previous_spot_idx or 0] ^ \
+            keys.previous_spot[spot_index]
+        if self._board_choice:
+            self._hash ^= keys.board_choice[self._board_choice]
+        if bool(last_won) != bool(self._last_won):
+            self._hash ^= keys.last_won
 
         self.save_last_move(spot_index, board_index)
         self._board_choice = None
-        return self.global_win_check()
+        result = self.move_win_check(board_index)
+
+        # only a board closed by the move can close the last global line,
+        # a sign never closes a board for its own player
+        if self._EARLY_DRAW and self.update_open_board(
+                board_index, ('o' if sign == 'x' else 'x',)) and \
+                result is None and self.dead_position():
+            return 'draw'
+        return result
+
+    def unmake_move(self):
+        """
+        Reverts the last move, including the board choice made before it.
+        Returns (board index, spot index) of the reverted move
+        """
+        if not self._history:
+            raise UndoError('No move to undo')
+
+        size = self._SIZE
+        board_index, spot_index, previous_spot_idx, previous_board_idx, \
+            board_choice, last_won, local_win, local_full = \
+            unpack_undo_entry(size, self._history.pop())
+
+        # the move has won the local board
+        if self._last_won:
+            line_counts = self._win_counts[self._last_won]
+            for line in line_indexes(self._SIZE)[board_index - 1]:
+                line_counts[line] -= 1
+
+        board: LocalBoard = self._local_boards[board_index - 1]
+        sign = board.spot_unchecked(spot_index)
+        board.clear_spot_unchecked(spot_index)
+        board._win = local_win
+        board._full = local_full
+
+        # xor in make_move_unchecked() is its own inverse
+        keys = zobrist_keys(size)
+        self._hash ^= \
+            keys.spots[sign][(board_index - 1) * size ** 2 +
+                             spot_index - 1] ^ \
+            keys.previous_spot[previous_spot_idx or 0] ^ \
+            keys.previous_spot[spot_index]
+        if board_choice:
+            self._hash ^= keys.board_choice[board_choice]
+        if bool(last_won) != bool(self._last_won):
+            self._hash ^= keys.last_won
+
+        self.save_last_move(previous_spot_idx, previous_board_idx)
+        self._board_choice = board_choice
+        self._last_won = last_won
+        if self._EARLY_DRAW:
+            self.update_open_board(
+                board_index, ('o' if sign == 'x' else 'x',))
+        return board_index, spot_index
+
+    def moves(self):
+        """
+        Returns (board index, spot index) of every move made so far.
+        Signs alternate starting with 'x'
+        """
+        size = self._SIZE
+        bits = undo_field_bits(size)
+        shift, mask = 3 * bits + 5, (1 << bits) - 1
+        return [(entry >> shift + bits, entry >> shift & mask)
+                for entry in self._history]
+
+    def rebuild_open_boards(self):
+        """Recomputes boards open for each player tracked with _EARLY_DRAW"""
+        size = self._SIZE
+        self._open_boards = {'x': [True] * size ** 2, 'o': [True] * size ** 2}
+        self._closed_counts = {
+            'x': [0] * (2 * size + 2), 'o': [0] * (2 * size + 2)}
+        for board_index in range(1, size ** 2 + 1):
+            self.update_open_board(board_index)
+
+    def update_open_board(self, board_index, signs=('x', 'o')):
+        """
+        Updates tracked openness of the local board for the players after
+        it has changed. Returns True if the board was opened or closed
+        """
+        board = self._local_boards[board_index - 1]
+        changed = False
+        for sign in signs:
+            is_open = board.open_for(sign)
+            if is_open != self._open_boards[sign][board_index - 1]:
+                self._open_boards[sign][board_index - 1] = is_open
+                closed_counts = self._closed_counts[sign]
+                for line in line_indexes(self._SIZE)[board_index - 1]:
+                    closed_counts[line] += -1 if is_open else 1
+                changed = True
+        return changed
+
+    def closed_counts(self, sign):
+        """
+        Returns number of local boards closed for sign (neither won
+        by it nor winnable) in every global line, numbered like
+        in line_indexes()
+        """
+        if self._closed_counts is not None:
+            return self._closed_counts[sign]
+        size = self._SIZE
+        closed_counts = [0] * (2 * size + 2)
+        for board, lines in zip(self._local_boards, line_indexes(size)):
+            if not board.open_for(sign):
+                for line in lines:
+                    closed_counts[line] += 1
+        return closed_counts
+
+    def winnable_lines(self, sign):
+        """
+        Returns numbers of global lines in which every local board
+        is won by sign or can still be won by it
+        """
+        return [line for line, count in enumerate(self.closed_counts(sign))
+                if not count]
+
+    def winnable(self, sign):
+        """Checks if sign can still win the game"""
+        return not all(self.closed_counts(sign))
+
+    def dead_position(self):
+        """
+        Checks if neither player can win any more, so the game
+        is going to end with a draw
+        """
+        return not self.winnable('x') and not self.winnable('o')
+
+    def dead_boards(self):
+        """
+        Returns indexes of undecided local boards which neither player
+        can win. Moves on them only decide where the opponent plays
+        """
+        return [index + 1 for index, board in enumerate(self._local_boards)
+                if board.dead()]
+
+    def win_counts(self):
+        """
+        Returns number of local boards won by each player in every line
+        of the global board, numbered like in line_indexes()
+        """
+        return self._win_counts
+
+    def cancel_board_choice(self):
+        """Cancels board choice made with choose_board()"""
+        if self._board_choice:
+            self._hash ^= zobrist_keys(self._SIZE).board_choice[
+                self._board_choice]
+        self._board_choice = None
+
+    def compute_hash(self):
+        """
+        Computes Zobrist hash of the position from scratch. It covers spots,
+        previous spot, board choice, last move win and the rule flags
+        """
+        keys = zobrist_keys(self._SIZE)
+        position_hash = keys.previous_spot[self._previous_spot_idx or 0]
+        if self._board_choice:
+            position_hash ^= keys.board_choice[self._board_choice]
+        for board_number, board in enumerate(self._local_boards):
+            for spot_number, spot in enumerate(board._spots):
+                if spot:
+                    position_hash ^= keys.spots[spot][
+                        board_number * self._SIZE ** 2 + spot_number]
+        if self._LOCK_AFTER_WIN:
+            position_hash ^= keys.lock_after_win
+        if self._CHOICE_AFTER_WIN:
+            position_hash ^= keys.choice_after_win
+        if self._EARLY_DRAW:
+            position_hash ^= keys.early_draw
+        if self._last_won:
+            position_hash ^= keys.last_won
+        return position_hash
+
+    def zobrist_hash(self):
+        """Returns Zobrist hash of the position"""
+        return self._hash
+
+    def enable_stats(self, stats):
+        """
+        Starts counting calls of engine methods of the board in given
+        GameStats. Calls of local boards methods are counted by the board
+        making them, local boards don't keep the stats
+        """
+        self._stats = stats
+
+    def disable_stats(self):
+        self.enable_stats(None)
+
+    def memory_footprint(self):
+        """
+        Returns bytes used by the board: by each attribute (local boards
+        with their contents), by the object itself and in total.
+        Objects shared between games are not counted, see object_size()
+        """
+        seen = {id(self)}
+        footprint = {'self': sys.getsizeof(self)}
+        for name, value in slot_values(self):
+            footprint[name] = object_size(value, seen)
+        footprint['total'] = sum(footprint.values())
+        return footprint
+
+    def move_win_check(self, board_index):
+        """Checks for win in global board after a move on given local board.
+        Only lines passing through that board are checked.
+        Returns a sign of the winnin player, draw or None"""
+        if self._stats is not None:
+            self._stats.count('move_win_check')
+        if self._last_won:
+            line_counts = self._win_counts[self._last_won]
+            lines = line_indexes(self._SIZE)[board_index - 1]
+            for line in lines:
+                line_counts[line] += 1
+            for line in lines:
+                if line_counts[line] == self._SIZE:
+                    return self._last_won
+
+        # board of the last move is still playable
+        if self.local_board(board_index).if_move_possible(
+                self._LOCK_AFTER_WIN):
+            return None
+
+        if self.possible_boards():
+            return None
+
+        # no win and no boards possible to make move
+        return 'draw'
 
     def global_win_check(self):
         """Checks for win in global board.
         Returns a sign of the winnin player, draw or None"""
+        if self._stats is not None:
+            self._stats.count('global_win_check')
         size = self._SIZE
         for i in range(size):
             # horizonally
@@ -464,6 +1270,9 @@ class GlobalBoard:
         if diagonal_right[0] and elements_equal(diagonal_right):
             return diagonal_right[0]
 
+        if self._EARLY_DRAW and self.dead_position():
+            return 'draw'
+
         if self.possible_boards():
             return None
 
@@ -473,26 +1282,196 @@ class GlobalBoard:
     def if_first_turn(self):
         return self._previous_spot_idx is None
 
+    def rebuild_state(self):
+        """
+        Recomputes state derived from local boards and last move
+        (win counts and hash), e.g. after setting them directly
+        """
+        size = self._SIZE
+        self._win_counts = {
+            'x': [0] * (2 * size + 2), 'o': [0] * (2 * size + 2)}
+        for board, lines in zip(self._local_boards, line_indexes(size)):
+            if board.win() in self._win_counts:
+                for line in lines:
+                    self._win_counts[board.win()][line] += 1
+        self._hash = self.compute_hash()
+        if self._EARLY_DRAW:
+            self.rebuild_open_boards()
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the position into state_size() bytes: size, rule flags
+        and last move win, previous spot, previous board, board choice
+        (0 stands for None), spots (2 bits each) and local boards wins
+        and full flags (4 bits each). History of moves is not saved.
+        """
+        size = self._SIZE
+        if size > MAX_SERIALIZED_SIZE:
+            raise ValueError("Board too big to serialize")
+
+        flags = self._LOCK_AFTER_WIN | self._CHOICE_AFTER_WIN << 1 | \
+            LAST_WON_VALUES.index(self._last_won) << 2 | \
+            self._EARLY_DRAW << 4
+        header = bytes([
+            size, flags, self._previous_spot_idx or 0,
+            self._previous_board_idx or 0, self._board_choice or 0
+        ])
+
+        spots = bytearray((size ** 4 + 3) // 4)
+        boards = bytearray((size ** 2 + 1) // 2)
+        spots_count = size ** 2
+        for board_number, board in enumerate(self._local_boards):
+            for spot_number, spot in enumerate(board._spots, board_number *
+                                               spots_count):
+                if spot:
+                    spots[spot_number >> 2] |= \
+                        SPOT_CODES[spot] << 2 * (spot_number & 3)
+            boards[board_number >> 1] |= \
+                (WIN_CODES[board.win()] | board._full << 2) << \
+                4 * (board_number & 1)
+
+        return header + bytes(spots) + bytes(boards)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """Creates board from bytes returned by to_bytes()"""
+        if not data or len(data) != state_size(data[0]):
+            raise ValueError("Wrong length of serialized board")
+
+        size, flags, previous_spot, previous_board, board_choice = \
+            data[:STATE_HEADER_SIZE]
+        global_board = cls(
+            size, bool(flags & 1), bool(flags & 2), bool(flags & 16))
+        global_board._last_won = LAST_WON_VALUES[flags >> 2 & 3]
+        global_board._previous_spot_idx = previous_spot or None
+        global_board._previous_board_idx = previous_board or None
+        global_board._board_choice = board_choice or None
+
+        spots_end = STATE_HEADER_SIZE + (size ** 4 + 3) // 4
+        # every byte holds 4 spots
+        spots = [
+            SIGNS_BY_CODE[byte >> shift & 3]
+            for byte in data[STATE_HEADER_SIZE:spots_end]
+            for shift in (0, 2, 4, 6)
+        ]
+        spots_count = size ** 2
+        for board_number, board in enumerate(global_board._local_boards):
+            board._spots = spots[board_number * spots_count:
+                                 (board_number + 1) * spots_count]
+            board_flags = data[spots_end + (board_number >> 1)] >> \
+                4 * (board_number & 1)
+            board._win = SIGNS_BY_CODE[board_flags & 3] or None
+            board._full = bool(board_flags & 4)
+
+        global_board.rebuild_state()
+        return global_board
+
     def __eq__(self, other) -> bool:
         return self._local_boards == other._local_boards and            \
             self._LOCK_AFTER_WIN == other._LOCK_AFTER_WIN and           \
             self._CHOICE_AFTER_WIN == other._CHOICE_AFTER_WIN and       \
+            self._EARLY_DRAW == other._EARLY_DRAW and                   \
             self._previous_spot_idx == other._previous_spot_idx and     \
             self._previous_board_idx == other._previous_board_idx and   \
             self._board_choice == other._board_choice and               \
             self._last_won == other._last_won and                       \
             self._SIZE == other._SIZE
 
+    def __hash__(self) -> int:
+        return self._hash
+
+
+@lru_cache(maxsize=None)
+def cached_separator_row(board_class, size, highlight):
+    """
+    Returns separator_row() of boards of the class and size built from
+    separators of the class, shared by all boards as it doesn't depend
+    on their state
+    """
+    board_sep = (size - 1) * (3 * board_class.HOR_SEP_2 +
+                              board_class.VER_SEP) + 3 * board_class.HOR_SEP_2
+    sep_str = ''
+    for clmn in range(size + 1):
+        # vertical sign, highlighted on both sides of the highlighted board
+        if highlight is not None and clmn - 1 <= highlight <= clmn:
+            sep_str += board_class.HL
+        else:
+            sep_str += board_class.VER_SEP_2
+
+        if clmn == size:
+            break
+
+        # sequence of horizontal signs
+        if clmn == highlight:
+            sep_str += (4 * size - 1) * board_class.HL
+        else:
+            sep_str += board_sep
+    return sep_str
+
+
+def slot_values(obj):
+    """Yields (name, value) of all set slots of the object"""
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get('__slots__', ()):
+            try:
+                # descriptor of the slot, properties of subclasses
+                # with the same name are skipped
+                yield name, cls.__dict__[name].__get__(obj, cls)
+            except AttributeError:
+                pass
+
+
+def object_size(obj, seen):
+    """
+    Returns bytes used by the object and objects it refers to, skipping
+    objects with ids in seen and objects shared between games: strings,
+    None, booleans, small ints, classes, LocalStateTable, LocalLayout
+    and GameStats
+    """
+    if id(obj) in seen or obj is None or isinstance(
+            obj, (str, bool, type, LocalStateTable, LocalLayout)) or \
+            isinstance(obj, int) and -5 <= obj <= 256:
+        return 0
+    if not isinstance(obj, (int, float, list, tuple, dict, set, array,
+                            LocalBoard, GlobalBoard)):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        children = [*obj.keys(), *obj.values()]
+    elif isinstance(obj, (list, tuple, set)):
+        children = obj
+    elif isinstance(obj, (LocalBoard, GlobalBoard)):
+        children = [value for _, value in slot_values(obj)]
+    else:
+        children = []
+    return size + sum(object_size(child, seen) for child in children)
+
 
 class UltimateTicTacToe:
-    def __init__(self, size, lock_after_win, choice_after_win):
+    def __init__(self, size, lock_after_win, choice_after_win,
+                 board_class=GlobalBoard, early_draw=False):
         if size <= 1:
             raise ValueError("Size must equal at lest 2")
-        self._board = GlobalBoard(size, lock_after_win, choice_after_win)
+        self._board = board_class(
+            size, lock_after_win, choice_after_win, early_draw)
 
     def global_board(self):
         return self._board
 
+    def memory_footprint(self):
+        """
+        Returns GlobalBoard.memory_footprint() with bytes of the game object
+        and its attributes other than the board added as 'game'
+        """
+        footprint = self._board.memory_footprint()
+        seen = {id(self._board)}
+        footprint['game'] = sys.getsizeof(self) + \
+            object_size(self.__dict__, seen)
+        footprint['total'] += footprint['game']
+        return footprint
+
     def get_input(self):
         """
         Constantly takes input from user
@@ -566,8 +1545,9 @@ class UltimateTicTacToe:
             self.global_board()._LOCK_AFTER_WIN)
         spot_choice = random.choice(possible_spots)
 
-        # making actual move
-        return self.global_board().make_move(sign, spot_choice)
+        # making actual move, the spot comes from possible_moves()
+        return self.global_board().make_move_unchecked(
+            sign, board_choice, spot_choice)
 
     def always_winning_bot(self, sign):
         global_board = self.global_board()
@@ -623,33 +1603,40 @@ class UltimateTicTacToe:
                 sign, mirror_board(self.sacrificed_board))
 
     def play(self, player_1: Callable[[str], Optional[str]],
-             player_2: Callable[[str], int]):
+             player_2: Callable[[str], int], verbose=True, stats=None,
+             recorder=None):
+        """
+        Plays the game until the result. If GameStats is given,
+        moves of players and calls of engine methods are recorded in it.
+        Finished game is written to recorder (GameRecordWriter) if given
+        """
+        if stats is not None:
+            self.global_board().enable_stats(stats)
 
         players = [(player_1, 'x'), (player_2, 'o')]
         for player_method, sign in cycle(players):
-            result = player_method(sign)
+            if stats is None:
+                result = player_method(sign)
+            else:
+                start = perf_counter()
+                result = player_method(sign)
+                stats.record_move(player_method, sign, perf_counter() - start)
+                stats.maybe_dump()
             # print(self.global_board())
             if result:
-                print(self.global_board())
-                if result == 'draw':
-                    print("Draw.")
-                else:
-                    print(f'{result} won.')
+                if recorder is not None:
+                    recorder.write_game(self.global_board(), result)
+                if verbose:
+                    print(self.global_board())
+                    if result == 'draw':
+                        print("Draw.")
+                    else:
+                        print(f'{result} won.')
                 return result
 
 
 def main():
-    # x_wins = 0
-    # o_wins = 0
-    # for i in range(100):
-    #     game = UltimateTicTacToe(3, False, False)
-    #     result = game.play(game.always_winning_bot, game.random_bot)
-    #     if result == 'x':
-    #         x_wins += 1
-    #     if result == 'o':
-    #         o_wins += 1
-    # print(x_wins, o_wins, 100 - x_wins - o_wins)
-
+    # bots are compared with simulation.py
     game = UltimateTicTacToe(3, False, False)
     game.play(game.always_winning_bot, game.player)
 